@@ -1,10 +1,38 @@
 import logging
-from typing import Dict, Any, List
+import re
+from collections import Counter
+from typing import Dict, Any, List, Set
 from datetime import datetime
 import io
 
 logger = logging.getLogger(__name__)
 
+# Sections that contribute to the ATS score, in scoring order
+SCORED_SECTIONS = [
+    "contact_info", "summary", "experience", "education", "skills",
+    "projects", "certifications", "target_job_description"
+]
+
+# Flat score for sections whose presence is all that counts
+SECTION_WEIGHTS = {
+    "summary": 10.0,
+    "education": 15.0,
+    "projects": 5.0,
+    "certifications": 5.0,
+    "target_job_description": 5.0
+}
+
+# Sections searched for target job keywords
+KEYWORD_SECTIONS = ["summary", "experience", "education", "skills", "projects", "certifications"]
+
+_TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+
+_STOPWORDS = frozenset("""
+    a an and are as at be been but by can for from has have in is it its of on or our that the their
+    this to was we were will with you your who what which while within years year work working able
+    must should would including include other all any more such per new
+""".split())
+
 class ResumeBuilderAgent:
     """Agent for building ATS-optimized resumes"""
     
@@ -52,12 +80,12 @@ class ResumeBuilderAgent:
             pdf_content.write(b"Placeholder for PDF content")
             result["pdf_content"] = pdf_content.getvalue()
             
-            # Calculate ATS score
-            result["ats_score"] = self._calculate_ats_score(resume_data)
-            
-            # Calculate target job match if job description provided
-            if resume_data.get("target_job_description"):
-                result["target_job_match"] = self._calculate_job_match(resume_data)
+            # Calculate ATS score and target job match, keeping the intermediate
+            # state so later edits can be rescored incrementally
+            scoring_state = self.build_scoring_state(resume_data)
+            result["ats_score"] = scoring_state["ats_score"]
+            result["target_job_match"] = scoring_state["target_job_match"]
+            result["scoring_state"] = scoring_state
             
             return result
             
@@ -682,63 +710,151 @@ class ResumeBuilderAgent:
         
         return text
     
-    def _calculate_ats_score(self, resume_data: Dict[str, Any]) -> float:
-        """Calculate ATS compatibility score"""
-        # In a real implementation, this would use more sophisticated analysis
-        # For this example, we'll use a simple scoring system
+    def build_scoring_state(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compute the intermediate scoring state for a resume
+        
+        The state keeps per-section scores and per-section keyword hits so that
+        a later edit only needs to rescore the sections it touches.
+        
+        Args:
+            resume_data: The resume builder request data
+            
+        Returns:
+            Dict[str, Any]: The scoring state
+        """
+        target_keywords = self._extract_target_keywords(resume_data.get("target_job_description") or "")
         
-        score = 0.0
-        max_score = 100.0
+        state = {
+            "resume_data": dict(resume_data),
+            "target_keywords": target_keywords,
+            "section_scores": {},
+            "keyword_hits": {},
+            "keyword_counts": Counter(),
+            "ats_score": 0.0,
+            "target_job_match": None
+        }
         
-        # Check for essential sections
-        if resume_data.get("contact_info", {}).get("name"):
-            score += 5.0
+        for section in SCORED_SECTIONS:
+            self._score_section_into_state(state, section)
         
-        if resume_data.get("contact_info", {}).get("email"):
-            score += 5.0
+        self._update_state_totals(state)
         
-        if resume_data.get("contact_info", {}).get("phone"):
-            score += 5.0
+        return state
+    
+    def rescore(self, state: Dict[str, Any], patch: Dict[str, Any]) -> List[str]:
+        """
+        Apply a section-level patch to a scoring state in place
         
-        if resume_data.get("summary"):
-            score += 10.0
+        Only the patched sections are rescored; totals are updated from the
+        cached per-section values. Changing the target job description
+        invalidates every keyword hit, so that case rescores all sections.
         
-        if resume_data.get("experience"):
-            score += 20.0
+        Args:
+            state: A state produced by build_scoring_state
+            patch: New values keyed by resume section field name
+            
+        Returns:
+            List[str]: The sections whose scores were recomputed
+        """
+        state["resume_data"].update(patch)
+        
+        if "target_job_description" in patch:
+            state["target_keywords"] = self._extract_target_keywords(patch["target_job_description"] or "")
+            state["keyword_hits"] = {}
+            state["keyword_counts"] = Counter()
+            changed_sections = list(SCORED_SECTIONS)
+        else:
+            changed_sections = [section for section in SCORED_SECTIONS if section in patch]
+        
+        for section in changed_sections:
+            self._score_section_into_state(state, section)
+        
+        self._update_state_totals(state)
+        
+        return changed_sections
+    
+    def _score_section_into_state(self, state: Dict[str, Any], section: str):
+        """Recompute one section's score and keyword hits inside a scoring state"""
+        value = state["resume_data"].get(section)
+        
+        state["section_scores"][section] = self._calculate_section_score(section, value)
+        
+        # Replace this section's contribution to the keyword counts
+        old_hits = state["keyword_hits"].get(section, set())
+        new_hits = self._find_keyword_hits(value, state["target_keywords"]) if section in KEYWORD_SECTIONS else set()
+        state["keyword_counts"].subtract(old_hits)
+        state["keyword_counts"].update(new_hits)
+        state["keyword_hits"][section] = new_hits
+    
+    def _update_state_totals(self, state: Dict[str, Any]):
+        """Recompute totals from the cached per-section values"""
+        state["ats_score"] = min(sum(state["section_scores"].values()), 100.0)
+        
+        if state["resume_data"].get("target_job_description"):
+            state["target_job_match"] = self._keyword_coverage(state["keyword_counts"], state["target_keywords"])
+        else:
+            state["target_job_match"] = None
+    
+    def _calculate_section_score(self, section: str, value: Any) -> float:
+        """Calculate the ATS score contribution of a single section"""
+        if not value:
+            return 0.0
+        
+        if section == "contact_info":
+            score = 0.0
+            for field in ("name", "email", "phone"):
+                if value.get(field):
+                    score += 5.0
+            return score
+        
+        if section == "experience":
+            score = 20.0
             
             # Check for detailed experience
-            experience = resume_data.get("experience", [])
-            for exp in experience:
+            for exp in value:
                 if exp.get("description") and (isinstance(exp["description"], list) and len(exp["description"]) >= 3):
                     score += 5.0
                     break
+            return score
         
-        if resume_data.get("education"):
-            score += 15.0
-        
-        if resume_data.get("skills"):
-            score += 15.0
+        if section == "skills":
+            score = 15.0
             
             # Check for detailed skills
-            if len(resume_data.get("skills", [])) >= 5:
+            if len(value) >= 5:
                 score += 5.0
+            return score
         
-        if resume_data.get("projects"):
-            score += 5.0
-        
-        if resume_data.get("certifications"):
-            score += 5.0
-        
-        # Check for target job description
-        if resume_data.get("target_job_description"):
-            score += 5.0
+        return SECTION_WEIGHTS.get(section, 0.0)
+    
+    def _extract_target_keywords(self, job_description: str, limit: int = 20) -> List[str]:
+        """Extract the most frequent meaningful terms from the target job description"""
+        tokens = [token for token in _TOKEN_PATTERN.findall(job_description.lower()) if token not in _STOPWORDS and len(token) > 2]
+        return [token for token, _ in Counter(tokens).most_common(limit)]
+    
+    def _find_keyword_hits(self, value: Any, keywords: List[str]) -> Set[str]:
+        """Return the target keywords that appear in a section value"""
+        if not value or not keywords:
+            return set()
         
-        return min(score, max_score)
+        tokens = set(_TOKEN_PATTERN.findall(self._flatten_text(value).lower()))
+        return {keyword for keyword in keywords if keyword in tokens}
     
-    def _calculate_job_match(self, resume_data: Dict[str, Any]) -> float:
-        """Calculate match percentage with target job"""
-        # In a real implementation, this would use NLP to compare resume to job description
-        # For this example, we'll use a placeholder
+    def _keyword_coverage(self, keyword_counts: Counter, keywords: List[str]) -> float:
+        """Percentage of target keywords hit by at least one section"""
+        if not keywords:
+            return 0.0
         
-        # Placeholder for demonstration purposes
-        return 75.0
+        matched = sum(1 for keyword in keywords if keyword_counts.get(keyword, 0) > 0)
+        return matched / len(keywords) * 100
+    
+    def _flatten_text(self, value: Any) -> str:
+        """Flatten a nested section value into plain text"""
+        if isinstance(value, dict):
+            return " ".join(self._flatten_text(item) for item in value.values())
+        if isinstance(value, (list, tuple, set)):
+            return " ".join(self._flatten_text(item) for item in value)
+        if value is None:
+            return ""
+        return str(value)
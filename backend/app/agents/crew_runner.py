@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from crewai import Crew
+
+logger = logging.getLogger(__name__)
+
+class CrewTimeoutError(TimeoutError):
+    """Raised when a crew does not finish within its timeout"""
+
+class CrewRunner:
+    """
+    Runs blocking crew.kickoff() calls on a bounded thread pool
+    
+    The event loop only awaits the result, so a slow LLM round trip no longer
+    stalls other requests. Each provider has its own concurrency limit; a slot
+    is held until the worker thread actually finishes, so crews that time out
+    (threads cannot be interrupted) still count against the limit. A crew
+    whose caller times out or is cancelled before a worker picks it up is
+    dropped without running.
+    """
+    
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        provider_concurrency: Optional[int] = None
+    ):
+        self.max_workers = max_workers or settings.LLM_MAX_WORKERS
+        self.timeout = timeout or settings.LLM_CREW_TIMEOUT
+        self.provider_concurrency = provider_concurrency or settings.LLM_PROVIDER_CONCURRENCY
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crew")
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, int] = {}
+    
+    async def run(self, crew: "Crew", provider: str, timeout: Optional[float] = None) -> Any:
+        """
+        Run a crew without blocking the event loop
+        
+        Args:
+            crew: The crew to kick off
+            provider: The LLM provider the crew calls, for its concurrency limit
+            timeout: Seconds to wait for the result (defaults to LLM_CREW_TIMEOUT)
+        
+        Returns:
+            Any: The crew's kickoff() result
+        
+        Raises:
+            CrewTimeoutError: If the crew does not finish in time
+        """
+        return await self.call(crew.kickoff, provider, timeout)
+    
+    async def call(self, fn: Callable[[], Any], provider: str, timeout: Optional[float] = None) -> Any:
+        """
+        Run a blocking LLM call (a crew kickoff or a single task) on the pool
+        
+        Args:
+            fn: The blocking callable
+            provider: The LLM provider it calls, for its concurrency limit
+            timeout: Seconds to wait for the result (defaults to LLM_CREW_TIMEOUT)
+        
+        Returns:
+            Any: The callable's result
+        
+        Raises:
+            CrewTimeoutError: If the call does not finish in time
+        """
+        timeout = timeout or self.timeout
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore(provider)
+        deadline = loop.time() + timeout
+        
+        # Wait for a provider slot within the same deadline as the call itself
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise CrewTimeoutError(f"No {provider} capacity within {timeout}s")
+        self._in_flight[provider] = self._in_flight.get(provider, 0) + 1
+        
+        try:
+            future = self._executor.submit(fn)
+        except Exception:
+            self._release(provider)
+            raise
+        
+        # Free the slot when the thread finishes (or the queued call is cancelled)
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release, provider))
+        
+        # The call only gets what is left of the deadline after waiting for a slot
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            logger.error(f"LLM call for provider {provider} timed out after {timeout}s")
+            raise CrewTimeoutError(f"LLM call for provider {provider} timed out after {timeout}s")
+        finally:
+            # Drop the call if no worker has started it yet
+            future.cancel()
+    
+    def in_flight(self, provider: str) -> int:
+        """Number of crews currently holding a slot for a provider"""
+        return self._in_flight.get(provider, 0)
+    
+    def shutdown(self):
+        """Stop accepting crews and cancel the ones still queued"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _release(self, provider: str):
+        self._in_flight[provider] -= 1
+        self._semaphores[provider].release()
+    
+    def _semaphore(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._semaphores:
+            self._semaphores[provider] = asyncio.Semaphore(self.provider_concurrency)
+        return self._semaphores[provider]
+
+# Shared runner for all orchestrators
+crew_runner = CrewRunner()
@@ -0,0 +1,39 @@
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.llms import LLM
+
+from app.agents.replay import ReplayResponder
+
+class FakeReplayLLM(LLM):
+    """
+    Offline LangChain LLM that replays recorded responses with simulated latency
+    
+    Used by the local-fake provider for benchmarks and load tests: the whole
+    orchestrator path (agents, task graph, worker pool, response cache and
+    output parsing) runs as in production, without network calls or cost.
+    """
+    
+    responder: Any
+    
+    @property
+    def _llm_type(self) -> str:
+        return "local-fake"
+    
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        # Part of the response cache key, so different latency setups never share entries
+        return {"latency": self.responder.latency.describe()}
+    
+    def _call(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> str:
+        return self.responder.respond(prompt)
+
+def fake_replay_llm(responder: Optional[ReplayResponder] = None) -> FakeReplayLLM:
+    """Create a replaying LLM, configured from the LOCAL_FAKE_* settings by default"""
+    return FakeReplayLLM(responder=responder or ReplayResponder.from_settings())
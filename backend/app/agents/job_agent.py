@@ -1,26 +1,116 @@
 import logging
 from typing import Dict, Any, List
 import re
-import nltk
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 
+from app.agents.nltk_resources import ensure_nltk_resources
+
 logger = logging.getLogger(__name__)
 
+# Section headers recognized at the start of a line
+SECTION_HEADERS = [
+    "About Us", "Company Overview", "About the Company",
+    "Job Description", "Position Summary", "Role Overview",
+    "Responsibilities", "Duties", "What You'll Do",
+    "Requirements", "Qualifications", "Skills",
+    "Required Skills", "Skills Required", "Technical Skills",
+    "Preferred Skills", "Nice to Have", "Bonus Skills", "Plus",
+    "Required Qualifications", "Minimum Qualifications", "Basic Qualifications",
+    "Preferred Qualifications", "Desired Qualifications",
+    "Experience", "Work Experience", "Background",
+    "Education", "Educational Requirements",
+    "Benefits", "Perks", "What We Offer",
+    "Application Process", "How to Apply",
+    "Equal Opportunity", "Equal Employment Opportunity", "EEO Statement", "Diversity and Inclusion"
+]
+
+# Headers whose sections feed each extractor, in order of preference
+RESPONSIBILITY_HEADERS = ["Responsibilities", "Duties", "What You'll Do", "Job Description"]
+REQUIRED_SKILL_HEADERS = ["Required Skills", "Skills Required", "Requirements", "Technical Skills"]
+PREFERRED_SKILL_HEADERS = ["Preferred Skills", "Nice to Have", "Bonus Skills", "Plus"]
+REQUIRED_QUALIFICATION_HEADERS = ["Required Qualifications", "Minimum Qualifications", "Basic Qualifications"]
+PREFERRED_QUALIFICATION_HEADERS = ["Preferred Qualifications", "Desired Qualifications"]
+EXPERIENCE_HEADERS = ["Experience", "Work Experience"]
+
+# Sections that say nothing about the role's requirements
+BOILERPLATE_HEADERS = [
+    "About Us", "Company Overview", "About the Company",
+    "Benefits", "Perks", "What We Offer",
+    "Application Process", "How to Apply",
+    "Equal Opportunity", "Equal Employment Opportunity", "EEO Statement", "Diversity and Inclusion"
+]
+
+def _header_key(header: str) -> str:
+    """Normalize a header for lookup (case and apostrophe style)"""
+    return header.lower().replace("\u2019", "'")
+
+_HEADER_NAMES = {_header_key(header): header for header in SECTION_HEADERS}
+
+# One alternation over all headers, longest first so "Required Skills" wins over "Skills".
+# A header must start a line (optionally as a markdown heading or bold) and be followed
+# by a colon, with optional inline content, or by the end of the line.
+_SECTION_HEADER_PATTERN = re.compile(
+    r"^[ \t]*(?:#+[ \t]*)?\**[ \t]*(?P<header>"
+    + "|".join(re.escape(header).replace("'", "['\u2019]") for header in sorted(SECTION_HEADERS, key=len, reverse=True))
+    + r")[ \t]*\**[ \t]*(?::\**[ \t]*(?P<inline>[^\n]*)|$)",
+    re.IGNORECASE | re.MULTILINE
+)
+
+_BULLET_PATTERN = re.compile(r"^[ \t]*[•\-*][ \t]*([^\n]+)", re.MULTILINE)
+
+# Skills detected anywhere in the text, in reporting order
+COMMON_SKILLS = [
+    "Python", "Java", "JavaScript", "C++", "C#", "Ruby", "PHP", "Swift",
+    "SQL", "NoSQL", "MongoDB", "MySQL", "PostgreSQL", "Oracle",
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Jenkins",
+    "React", "Angular", "Vue", "Node.js", "Django", "Flask",
+    "Machine Learning", "AI", "Data Science", "Big Data",
+    "Agile", "Scrum", "Kanban", "DevOps", "CI/CD"
+]
+_COMMON_SKILL_NAMES = {skill.lower(): skill for skill in COMMON_SKILLS}
+_COMMON_SKILL_ORDER = {skill: index for index, skill in enumerate(COMMON_SKILLS)}
+_COMMON_SKILL_PATTERN = re.compile(
+    r"(?<![\w+#.])(?:"
+    + "|".join(re.escape(skill) for skill in sorted(COMMON_SKILLS, key=len, reverse=True))
+    + r")(?![\w+#])",
+    re.IGNORECASE
+)
+
+def index_sections(text: str) -> Dict[str, str]:
+    """
+    Split a job description into sections in a single scan
+    
+    Every header occurrence is found with one compiled alternation, and each
+    section runs from its header to the next header that actually appears.
+    
+    Args:
+        text: The job description text
+        
+    Returns:
+        Dict[str, str]: Section content keyed by header, in document order
+    """
+    sections = {}
+    matches = list(_SECTION_HEADER_PATTERN.finditer(text))
+    
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        inline = (match.group("inline") or "").strip()
+        body = text[match.end():end].strip()
+        content = "\n".join(part for part in (inline, body) if part)
+    
+        # Repeated headers are merged
+        header = _HEADER_NAMES[_header_key(match.group("header"))]
+        sections[header] = f"{sections[header]}\n{content}" if sections.get(header) else content
+    
+    return sections
+
 class JobDescriptionAgent:
     """Agent for analyzing job descriptions"""
     
     def __init__(self):
-        # Download NLTK resources if needed
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
-        
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('stopwords')
+        # Download NLTK resources if needed (checked once per process)
+        ensure_nltk_resources()
     
     async def process_job_description(self, job_description: str) -> Dict[str, Any]:
         """
@@ -67,22 +157,25 @@ class JobDescriptionAgent:
             # Extract location
             result["location"] = self._extract_location(job_description)
             
+            # Index the section headers once; the extractors below slice from it
+            sections = self._index_sections(job_description)
+            
             # Extract required skills
-            result["required_skills"] = self._extract_required_skills(job_description)
+            result["required_skills"] = self._extract_required_skills(job_description, sections)
             
             # Extract preferred skills
-            result["preferred_skills"] = self._extract_preferred_skills(job_description)
+            result["preferred_skills"] = self._extract_preferred_skills(sections)
             
             # Extract responsibilities
-            result["responsibilities"] = self._extract_responsibilities(job_description)
+            result["responsibilities"] = self._extract_responsibilities(sections)
             
             # Extract qualifications
-            qualifications = self._extract_qualifications(job_description)
+            qualifications = self._extract_qualifications(sections)
             result["qualifications"]["required"] = qualifications["required"]
             result["qualifications"]["preferred"] = qualifications["preferred"]
             
             # Extract experience requirements
-            result["experience"] = self._extract_experience_requirements(job_description)
+            result["experience"] = self._extract_experience_requirements(job_description, sections)
             
             # Extract education requirements
             result["education"] = self._extract_education_requirements(job_description)
@@ -90,8 +183,8 @@ class JobDescriptionAgent:
             # Extract keywords
             result["keywords"] = self._extract_keywords(job_description)
             
-            # Extract sections
-            result["sections"] = self._extract_sections(job_description)
+            # Record the sections
+            result["sections"] = sections
             
             return result
             
@@ -151,121 +244,34 @@ class JobDescriptionAgent:
         
         return ""
     
-    def _extract_required_skills(self, text: str) -> List[str]:
+    def _extract_required_skills(self, text: str, sections: Dict[str, str]) -> List[str]:
         """Extract required skills from the job description"""
-        skills = []
-        
-        # Look for required skills section
-        skills_section_pattern = r'(?:Required Skills|Skills Required|Requirements|Technical Skills).*?\n(.*?)(?:\n\n|\n[A-Z]+|\Z)'
-        skills_section_match = re.search(skills_section_pattern, text, re.DOTALL | re.IGNORECASE)
+        skills = self._skills_from_bullets(self._first_section(sections, REQUIRED_SKILL_HEADERS))
         
-        if skills_section_match:
-            skills_text = skills_section_match.group(1)
-            
-            # Extract bullet points
-            bullet_points = re.findall(r'[•\-*]\s*([^\n]+)', skills_text)
-            for point in bullet_points:
-                # Look for skill keywords
-                skill_match = re.search(r'((?:[A-Z][a-z]+|[A-Z]+)(?:\+\+|#)?)', point)
-                if skill_match:
-                    skills.append(skill_match.group(1).strip())
-                else:
-                    # If no specific skill found, add the whole point
-                    skills.append(point.strip())
-        
-        # Look for skills mentioned in the text
-        common_skills = [
-            "Python", "Java", "JavaScript", "C\\+\\+", "C#", "Ruby", "PHP", "Swift",
-            "SQL", "NoSQL", "MongoDB", "MySQL", "PostgreSQL", "Oracle",
-            "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Jenkins",
-            "React", "Angular", "Vue", "Node.js", "Django", "Flask",
-            "Machine Learning", "AI", "Data Science", "Big Data",
-            "Agile", "Scrum", "Kanban", "DevOps", "CI/CD"
-        ]
-        
-        for skill in common_skills:
-            if re.search(r'\b' + skill + r'\b', text, re.IGNORECASE):
-                if skill not in skills:
-                    skills.append(skill)
+        # Look for skills mentioned in the text, in a single scan
+        mentioned = {_COMMON_SKILL_NAMES[match.group(0).lower()] for match in _COMMON_SKILL_PATTERN.finditer(text)}
+        for skill in sorted(mentioned, key=_COMMON_SKILL_ORDER.get):
+            if skill not in skills:
+                skills.append(skill)
         
         return skills
     
-    def _extract_preferred_skills(self, text: str) -> List[str]:
+    def _extract_preferred_skills(self, sections: Dict[str, str]) -> List[str]:
         """Extract preferred skills from the job description"""
-        skills = []
-        
-        # Look for preferred skills section
-        skills_section_pattern = r'(?:Preferred Skills|Nice to Have|Bonus Skills|Plus).*?\n(.*?)(?:\n\n|\n[A-Z]+|\Z)'
-        skills_section_match = re.search(skills_section_pattern, text, re.DOTALL | re.IGNORECASE)
-        
-        if skills_section_match:
-            skills_text = skills_section_match.group(1)
-            
-            # Extract bullet points
-            bullet_points = re.findall(r'[•\-*]\s*([^\n]+)', skills_text)
-            for point in bullet_points:
-                # Look for skill keywords
-                skill_match = re.search(r'((?:[A-Z][a-z]+|[A-Z]+)(?:\+\+|#)?)', point)
-                if skill_match:
-                    skills.append(skill_match.group(1).strip())
-                else:
-                    # If no specific skill found, add the whole point
-                    skills.append(point.strip())
-        
-        return skills
+        return self._skills_from_bullets(self._first_section(sections, PREFERRED_SKILL_HEADERS))
     
-    def _extract_responsibilities(self, text: str) -> List[str]:
+    def _extract_responsibilities(self, sections: Dict[str, str]) -> List[str]:
         """Extract responsibilities from the job description"""
-        responsibilities = []
-        
-        # Look for responsibilities section
-        resp_section_pattern = r'(?:Responsibilities|Duties|What You\'ll Do|Job Description).*?\n(.*?)(?:\n\n|\n[A-Z]+|\Z)'
-        resp_section_match = re.search(resp_section_pattern, text, re.DOTALL | re.IGNORECASE)
-        
-        if resp_section_match:
-            resp_text = resp_section_match.group(1)
-            
-            # Extract bullet points
-            bullet_points = re.findall(r'[•\-*]\s*([^\n]+)', resp_text)
-            for point in bullet_points:
-                responsibilities.append(point.strip())
-        
-        return responsibilities
+        return self._bullet_points(self._first_section(sections, RESPONSIBILITY_HEADERS))
     
-    def _extract_qualifications(self, text: str) -> Dict[str, List[str]]:
+    def _extract_qualifications(self, sections: Dict[str, str]) -> Dict[str, List[str]]:
         """Extract qualifications from the job description"""
-        qualifications = {
-            "required": [],
-            "preferred": []
+        return {
+            "required": self._bullet_points(self._first_section(sections, REQUIRED_QUALIFICATION_HEADERS)),
+            "preferred": self._bullet_points(self._first_section(sections, PREFERRED_QUALIFICATION_HEADERS))
         }
-        
-        # Look for required qualifications section
-        req_qual_pattern = r'(?:Required Qualifications|Minimum Qualifications|Basic Qualifications).*?\n(.*?)(?:\n\n|\n[A-Z]+|\Z)'
-        req_qual_match = re.search(req_qual_pattern, text, re.DOTALL | re.IGNORECASE)
-        
-        if req_qual_match:
-            req_qual_text = req_qual_match.group(1)
-            
-            # Extract bullet points
-            bullet_points = re.findall(r'[•\-*]\s*([^\n]+)', req_qual_text)
-            for point in bullet_points:
-                qualifications["required"].append(point.strip())
-        
-        # Look for preferred qualifications section
-        pref_qual_pattern = r'(?:Preferred Qualifications|Desired Qualifications).*?\n(.*?)(?:\n\n|\n[A-Z]+|\Z)'
-        pref_qual_match = re.search(pref_qual_pattern, text, re.DOTALL | re.IGNORECASE)
-        
-        if pref_qual_match:
-            pref_qual_text = pref_qual_match.group(1)
-            
-            # Extract bullet points
-            bullet_points = re.findall(r'[•\-*]\s*([^\n]+)', pref_qual_text)
-            for point in bullet_points:
-                qualifications["preferred"].append(point.strip())
-        
-        return qualifications
     
-    def _extract_experience_requirements(self, text: str) -> Dict[str, Any]:
+    def _extract_experience_requirements(self, text: str, sections: Dict[str, str]) -> Dict[str, Any]:
         """Extract experience requirements from the job description"""
         experience = {
             "years": 0,
@@ -294,11 +300,7 @@ class JobDescriptionAgent:
                 break
         
         # Extract experience description
-        exp_section_pattern = r'(?:Experience|Work Experience).*?\n(.*?)(?:\n\n|\n[A-Z]+|\Z)'
-        exp_section_match = re.search(exp_section_pattern, text, re.DOTALL | re.IGNORECASE)
-        
-        if exp_section_match:
-            experience["description"] = exp_section_match.group(1).strip()
+        experience["description"] = self._first_section(sections, EXPERIENCE_HEADERS)
         
         return experience
     
@@ -357,28 +359,30 @@ class JobDescriptionAgent:
         # Return top keywords
         return [token for token, freq in sorted_tokens[:20]]
     
-    def _extract_sections(self, text: str) -> Dict[str, str]:
-        """Extract different sections from the job description"""
-        sections = {}
-        
-        # Common section headers
-        section_headers = [
-            "About Us", "Company Overview", "About the Company",
-            "Job Description", "Position Summary", "Role Overview",
-            "Responsibilities", "Duties", "What You'll Do",
-            "Requirements", "Qualifications", "Skills",
-            "Experience", "Work Experience", "Background",
-            "Education", "Educational Requirements",
-            "Benefits", "Perks", "What We Offer",
-            "Application Process", "How to Apply"
-        ]
-        
-        # Extract each section
-        for i, header in enumerate(section_headers):
-            pattern = f"(?:{header}).*?\\n(.*?)(?:\\n\\n|\\n(?:{section_headers[i+1] if i+1 < len(section_headers) else ''})|\Z)"
-            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-            
-            if match:
-                sections[header] = match.group(1).strip()
-        
-        return sections
+    def _index_sections(self, text: str) -> Dict[str, str]:
+        """Split the job description into sections in a single scan"""
+        return index_sections(text)
+    
+    def _first_section(self, sections: Dict[str, str], headers: List[str]) -> str:
+        """Return the content of the first listed header present in the index"""
+        for header in headers:
+            if sections.get(header):
+                return sections[header]
+        return ""
+    
+    def _bullet_points(self, section_text: str) -> List[str]:
+        """Extract bullet points from a section"""
+        return [point.strip() for point in _BULLET_PATTERN.findall(section_text)]
+    
+    def _skills_from_bullets(self, section_text: str) -> List[str]:
+        """Extract one skill per bullet point of a skills section"""
+        skills = []
+        for point in self._bullet_points(section_text):
+            # Look for skill keywords
+            skill_match = re.search(r'((?:[A-Z][a-z]+|[A-Z]+)(?:\+\+|#)?)', point)
+            if skill_match:
+                skills.append(skill_match.group(1).strip())
+            else:
+                # If no specific skill found, add the whole point
+                skills.append(point)
+        return skills
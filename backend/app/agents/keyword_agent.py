@@ -1,27 +1,20 @@
 import logging
 from typing import Dict, Any, List
 import re
-import nltk
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 from collections import Counter
 
+from app.agents.nltk_resources import ensure_nltk_resources
+
 logger = logging.getLogger(__name__)
 
 class KeywordAnalystAgent:
     """Agent for analyzing keywords in resumes and job descriptions"""
     
     def __init__(self):
-        # Download NLTK resources if needed
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
-        
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('stopwords')
+        # Download NLTK resources if needed (checked once per process)
+        ensure_nltk_resources()
     
     async def analyze_resume_keywords(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
         """
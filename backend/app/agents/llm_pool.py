@@ -0,0 +1,155 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class LLMPool:
+    """
+    Keyed pool of long-lived LLM clients
+    
+    Entries are keyed by (provider, model, temperature, API key fingerprint),
+    so every request with the same settings reuses one client, keeping its
+    HTTP connection pool warm. Entries idle longer than the timeout are
+    evicted on the next access, and the least recently used entry is evicted
+    when the pool is full. Clients are built outside the pool lock, under a
+    per-key lock, so concurrent first requests for a key build one client
+    without blocking lookups of other keys.
+    """
+    
+    def __init__(self, idle_timeout: Optional[float] = None, max_size: Optional[int] = None):
+        self.idle_timeout = idle_timeout or settings.LLM_POOL_IDLE_TIMEOUT
+        self.max_size = max_size or settings.LLM_POOL_MAX_SIZE
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._creating: Dict[Hashable, threading.Lock] = {}
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+    
+    def get(self, key: Hashable, create: Callable[[], Any]) -> Any:
+        """
+        Return the pooled value for key, creating it on first use
+        
+        Args:
+            key: The settings tuple identifying the client
+            create: Builds the client; only called when the key is not pooled
+        
+        Returns:
+            Any: The pooled client
+        """
+        with self._lock:
+            self._evict_idle(time.monotonic())
+            value = self._reuse(key)
+            if value is not None:
+                return value
+            key_lock = self._creating.setdefault(key, threading.Lock())
+        
+        with key_lock:
+            # Another request may have built the client while this one waited
+            with self._lock:
+                value = self._reuse(key)
+                if value is not None:
+                    return value
+            
+            try:
+                value = create()
+            except Exception:
+                with self._lock:
+                    self._creating.pop(key, None)
+                raise
+            
+            with self._lock:
+                self.created += 1
+                self._creating.pop(key, None)
+                self._store(key, value)
+                logger.info(f"Created pooled LLM client ({len(self._entries)} pooled)")
+            return value
+    
+    def evict_idle(self) -> int:
+        """Drop entries idle longer than the timeout; returns how many were removed"""
+        with self._lock:
+            return self._evict_idle(time.monotonic())
+    
+    def clear(self) -> None:
+        """Drop every pooled client"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size and reuse counters"""
+        total = self.created + self.reused
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "created": self.created,
+            "reused": self.reused,
+            "evicted": self.evicted,
+            "reuse_rate": (self.reused / total) if total else 0.0
+        }
+    
+    def _reuse(self, key: Hashable) -> Optional[Any]:
+        # Called with the lock held
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self.reused += 1
+        self._store(key, entry[0])
+        return entry[0]
+    
+    def _store(self, key: Hashable, value: Any) -> None:
+        # Called with the lock held; marks the entry as most recently used
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evicted += 1
+    
+    def _evict_idle(self, now: float) -> int:
+        # Entries are kept in last-used order, so idle ones are at the front
+        removed = 0
+        while self._entries:
+            key, (_, last_used) = next(iter(self._entries.items()))
+            if now - last_used <= self.idle_timeout:
+                break
+            del self._entries[key]
+            removed += 1
+        self.evicted += removed
+        return removed
+
+# Shared by every orchestrator and pipeline in the process
+llm_pool = LLMPool()
+
+def pooled_llm(
+    provider: str,
+    model: str,
+    temperature: float,
+    api_key: Optional[str] = None,
+    pool: Optional[LLMPool] = None
+) -> Any:
+    """
+    Return the shared LLM client for a settings combination, with its response cache
+    
+    Args:
+        provider: The LLM provider
+        model: The model name
+        temperature: The sampling temperature
+        api_key: A user's API key, defaulting to the provider's environment variable
+        pool: The pool to use (defaults to the shared pool)
+    
+    Returns:
+        Any: The pooled LangChain LLM or chat model
+    """
+    # Imported here: LangChain loads only when a client is first needed
+    from app.agents.llm_providers import create_llm, key_fingerprint
+    from app.services.llm_cache import with_llm_cache
+    
+    key = (provider, model, temperature, key_fingerprint(provider, api_key))
+    return (pool or llm_pool).get(
+        key,
+        lambda: with_llm_cache(create_llm(provider, model, temperature, api_key), provider, model, temperature)
+    )
@@ -0,0 +1,171 @@
+import os
+import hashlib
+import logging
+import importlib.util
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from langchain.llms.base import LLM
+    from langchain.chat_models.base import BaseChatModel
+
+    LanguageModel = Union[LLM, BaseChatModel]
+
+logger = logging.getLogger(__name__)
+
+# Provider name -> (factory, module the integration needs). Integrations are
+# imported by their factory, so LangChain only loads when an LLM is created.
+_PROVIDERS: Dict[str, Tuple[Callable[[str, float, Optional[str]], "LanguageModel"], Optional[str]]] = {}
+
+# Alternative provider names accepted in LLM_PROVIDER
+_ALIASES = {
+    "development": "mock",
+    "google": "gemini",
+}
+
+# Environment variable holding each provider's API key
+API_KEY_VARIABLES = {
+    "openai": "OPENAI_API_KEY",
+    "groq": "GROQ_API_KEY",
+    "gemini": "GOOGLE_API_KEY",
+}
+
+# Install hints logged when an integration package is missing
+_INSTALL_HINTS = {
+    "langchain_openai": "pip install langchain-openai",
+    "langchain_groq": "pip install langchain-groq",
+    "langchain_google_genai": "pip install langchain-google-genai",
+}
+
+
+def register_provider(name: str, requires: Optional[str] = None):
+    """
+    Register an LLM factory under a provider name
+
+    Args:
+        name: The provider name used in LLM_PROVIDER
+        requires: Top-level module the integration imports, checked without importing it
+    """
+    def decorator(factory: Callable[[str, float, Optional[str]], "LanguageModel"]):
+        _PROVIDERS[name] = (factory, requires)
+        return factory
+    return decorator
+
+
+def is_available(provider: str) -> bool:
+    """Whether a provider is registered and its integration package is installed"""
+    name = _ALIASES.get(provider, provider)
+    if name not in _PROVIDERS:
+        return False
+    requires = _PROVIDERS[name][1]
+    return requires is None or importlib.util.find_spec(requires) is not None
+
+
+def available_providers() -> Dict[str, bool]:
+    """Registered providers and whether each can be used in this environment"""
+    return {name: is_available(name) for name in _PROVIDERS}
+
+
+def key_fingerprint(provider: str, api_key: Optional[str] = None) -> str:
+    """Short hash of the API key a provider would use, so pooled clients never cross keys"""
+    name = _ALIASES.get(provider, provider)
+    key = api_key or os.getenv(API_KEY_VARIABLES.get(name, ""), "")
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16] if key else ""
+
+
+def create_llm(provider: str, model: str, temperature: float, api_key: Optional[str] = None) -> "LanguageModel":
+    """
+    Create the language model for a provider, importing its integration on demand
+
+    Unknown providers, missing integration packages and missing API keys fall
+    back to a fake LLM so development setups keep working.
+
+    Args:
+        provider: The provider name (openai, groq, gemini, mock, local-fake)
+        model: The model name
+        temperature: The sampling temperature
+        api_key: A user's API key, overriding the provider's environment variable
+
+    Returns:
+        LanguageModel: A LangChain LLM or chat model
+    """
+    name = _ALIASES.get(provider, provider)
+    if name not in _PROVIDERS:
+        logger.warning(f"Unsupported LLM provider: {provider}. Using a mock LLM.")
+        return fake_llm(f"Unsupported LLM provider: {provider}")
+
+    factory, requires = _PROVIDERS[name]
+    if not is_available(name):
+        logger.warning(
+            f"{name} integration not available. Install with '{_INSTALL_HINTS.get(requires, requires)}'. "
+            "Falling back to mock LLM."
+        )
+        return fake_llm(f"{name} integration not available.")
+
+    return factory(model, temperature, api_key)
+
+
+def fake_llm(response: str) -> "LanguageModel":
+    """A LangChain fake LLM that always returns the given response"""
+    from langchain.llms.fake import FakeListLLM
+    return FakeListLLM(responses=[response])
+
+
+def _api_key(variable: str, placeholder: str, override: Optional[str] = None) -> Optional[str]:
+    """Read an API key, treating the .env.example placeholder as unset"""
+    api_key = override or os.getenv(variable)
+    if not api_key or api_key == placeholder:
+        return None
+    return api_key
+
+
+@register_provider("mock")
+def _create_mock(model: str, temperature: float, api_key: Optional[str] = None) -> "LanguageModel":
+    return fake_llm("This is a development mode response.")
+
+
+@register_provider("local-fake", requires="langchain_core")
+def _create_local_fake(model: str, temperature: float, api_key: Optional[str] = None) -> "LanguageModel":
+    # Replays recorded responses offline, for benchmarks and load tests
+    from app.agents.fake_llm import fake_replay_llm
+
+    return fake_replay_llm()
+
+
+@register_provider("openai", requires="langchain_openai")
+def _create_openai(model: str, temperature: float, api_key: Optional[str] = None) -> "LanguageModel":
+    api_key = _api_key(API_KEY_VARIABLES["openai"], "your_openai_api_key_here", api_key)
+    if api_key is None:
+        logger.warning("No OpenAI API key provided. Using a mock LLM for development.")
+        return fake_llm("This is a development mode response.")
+
+    from langchain_openai import OpenAI, ChatOpenAI
+
+    if "gpt-4" in model or "gpt-3.5" in model:
+        return ChatOpenAI(openai_api_key=api_key, model_name=model, temperature=temperature)
+    return OpenAI(openai_api_key=api_key, model_name=model, temperature=temperature)
+
+
+@register_provider("groq", requires="langchain_groq")
+def _create_groq(model: str, temperature: float, api_key: Optional[str] = None) -> "LanguageModel":
+    api_key = _api_key(API_KEY_VARIABLES["groq"], "your_groq_api_key_here", api_key)
+    if api_key is None:
+        logger.warning("No Groq API key provided. Using a mock LLM for development.")
+        return fake_llm("This is a development mode response.")
+
+    from langchain_groq import ChatGroq
+
+    # Default to llama2-70b-4096 if no model specified
+    return ChatGroq(groq_api_key=api_key, model_name=model or "llama2-70b-4096", temperature=temperature)
+
+
+@register_provider("gemini", requires="langchain_google_genai")
+def _create_gemini(model: str, temperature: float, api_key: Optional[str] = None) -> "LanguageModel":
+    api_key = _api_key(API_KEY_VARIABLES["gemini"], "your_google_api_key_here", api_key)
+    if api_key is None:
+        logger.warning("No Google API key provided. Using a mock LLM for development.")
+        return fake_llm("This is a development mode response.")
+
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    # Default to gemini-pro if no model specified
+    return ChatGoogleGenerativeAI(google_api_key=api_key, model=model or "gemini-pro", temperature=temperature)
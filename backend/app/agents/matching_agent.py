@@ -1,20 +1,32 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import re
 from difflib import SequenceMatcher
 
+from app.core.dates import total_experience_months
+from app.core.embeddings import HashingEmbedder, default_embedder
+from app.agents.scoring_profiles import extract_features, get_profile
+
 logger = logging.getLogger(__name__)
 
+# Cosine similarity treated as a full match; hashed n-gram vectors of closely
+# related texts rarely exceed this, so raw similarities are rescaled against it
+RELEVANCE_SATURATION = 0.5
+
 class MatchingAlgorithmAgent:
     """Agent for comparing resumes against job descriptions"""
     
-    async def compare(self, resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> Dict[str, Any]:
+    def __init__(self, embedder: HashingEmbedder = None):
+        self.embedder = embedder or default_embedder
+    
+    async def compare(self, resume_data: Dict[str, Any], job_data: Dict[str, Any], profile: Optional[str] = None) -> Dict[str, Any]:
         """
         Compare a resume against a job description
         
         Args:
             resume_data: The processed resume data
             job_data: The processed job data
+            profile: Scoring profile whose match weights produce the overall match score
             
         Returns:
             Dict[str, Any]: Comparison results
@@ -37,12 +49,16 @@ class MatchingAlgorithmAgent:
                     "field_match": False
                 },
                 "section_matches": {},
+                "format_features": {},
                 "overall_match_score": 0.0
             }
             
             # Extract parsed content from resume
             parsed_content = resume_data.get("parsed_content", {})
             
+            # Pass through format signals measured when the resume was parsed
+            result["format_features"] = parsed_content.get("format_features", {})
+            
             # Compare keywords
             result["keyword_matches"] = self._compare_keywords(parsed_content, job_data)
             
@@ -59,7 +75,7 @@ class MatchingAlgorithmAgent:
             result["section_matches"] = self._compare_sections(parsed_content, job_data)
             
             # Calculate overall match score
-            result["overall_match_score"] = self._calculate_overall_match(result)
+            result["overall_match_score"] = self._calculate_overall_match(result, profile)
             
             return result
             
@@ -210,13 +226,12 @@ class MatchingAlgorithmAgent:
         # Get resume experience
         resume_experience = parsed_content.get("experience", [])
         
-        # Calculate total years of experience
-        total_years = 0
-        for exp in resume_experience:
-            if "start_date" in exp and "end_date" in exp:
-                # In a real implementation, this would calculate the actual time difference
-                # For this example, we'll use a placeholder
-                total_years += 2  # Placeholder
+        # Calculate total years of experience, preferring the parser's precomputed value
+        total_months = parsed_content.get("total_experience_months")
+        if total_months is None:
+            total_months = total_experience_months(resume_experience)
+        total_years = total_months / 12
+        experience_match["total_years"] = round(total_years, 1)
         
         # Check years match
         experience_match["years_match"] = total_years >= required_years
@@ -328,17 +343,54 @@ class MatchingAlgorithmAgent:
             "education": 0.0
         }
         
-        # Compare summary
-        if "summary" in parsed_content and parsed_content["summary"]:
-            # In a real implementation, this would use NLP to compare relevance
-            # For this example, we'll use a placeholder
-            section_matches["summary"] = 0.6  # Placeholder
-        
-        # Compare experience
-        if "experience" in parsed_content and parsed_content["experience"]:
-            # In a real implementation, this would compare experience to job responsibilities
-            # For this example, we'll use a placeholder
-            section_matches["experience"] = 0.7  # Placeholder
+        # Resume texts, one row per summary, experience entry and education entry
+        resume_rows = []
+        if parsed_content.get("summary"):
+            resume_rows.append(("summary", parsed_content["summary"]))
+        for exp in parsed_content.get("experience", []):
+            resume_rows.append(("experience", self._join_text(exp.get("position"), exp.get("description"))))
+        for edu in parsed_content.get("education", []):
+            resume_rows.append(("education", self._join_text(edu.get("degree"), edu.get("field_of_study"), edu.get("institution"), edu.get("description"))))
+        
+        # Job texts: each responsibility, the overall role and the education requirements
+        responsibilities = [r for r in job_data.get("responsibilities", []) if r]
+        role_text = self._join_text(
+            job_data.get("title"),
+            responsibilities,
+            job_data.get("required_skills"),
+            job_data.get("qualifications", {}).get("required")
+        ) or job_data.get("raw_description", "")
+        job_education = job_data.get("education", {})
+        education_text = self._join_text(job_education.get("level", "").replace("_", " "), job_education.get("fields")) or role_text
+        
+        resume_rows = [(section, text) for section, text in resume_rows if text.strip()]
+        if resume_rows and role_text.strip():
+            # Score every resume row against every job text in one batch
+            job_texts = responsibilities + [role_text, education_text]
+            similarities = self.embedder.similarity([text for _, text in resume_rows], job_texts)
+            role_column = len(responsibilities)
+            education_column = role_column + 1
+            
+            rows_by_section = {}
+            for index, (section, _) in enumerate(resume_rows):
+                rows_by_section.setdefault(section, []).append(index)
+            
+            # Compare summary to the role as a whole
+            if "summary" in rows_by_section:
+                section_matches["summary"] = self._relevance(similarities[rows_by_section["summary"], role_column].max())
+            
+            # Compare experience to job responsibilities: how well each responsibility is covered by some role
+            if "experience" in rows_by_section:
+                experience_rows = similarities[rows_by_section["experience"]]
+                if responsibilities:
+                    coverage = experience_rows[:, :role_column].max(axis=0).mean()
+                else:
+                    coverage = experience_rows[:, role_column].max()
+                section_matches["experience"] = self._relevance(coverage)
+            
+            # Compare education to education requirements
+            if "education" in rows_by_section:
+                section_matches["education"] = self._relevance(similarities[rows_by_section["education"], education_column].max())
         
         # Compare skills
         if "skills" in parsed_content and parsed_content["skills"]:
@@ -350,54 +402,22 @@ class MatchingAlgorithmAgent:
             else:
                 section_matches["skills"] = 0.5  # Placeholder
         
-        # Compare education
-        if "education" in parsed_content and parsed_content["education"]:
-            # In a real implementation, this would compare education to requirements
-            # For this example, we'll use a placeholder
-            section_matches["education"] = 0.8  # Placeholder
-        
         return section_matches
     
-    def _calculate_overall_match(self, result: Dict[str, Any]) -> float:
-        """Calculate overall match score"""
-        # Calculate keyword match percentage
-        keyword_matches = result["keyword_matches"]
-        total_keywords = len(keyword_matches)
-        matched_keywords = sum(1 for match in keyword_matches.values() if match["found"])
-        keyword_score = matched_keywords / total_keywords if total_keywords > 0 else 0
-        
-        # Calculate skill match percentage
-        skill_matches = result["skill_matches"]
-        total_skills = len(skill_matches["matched"]) + len(skill_matches["missing"])
-        matched_skills = len(skill_matches["matched"])
-        skill_score = matched_skills / total_skills if total_skills > 0 else 0
-        
-        # Get experience match score
-        experience_match = result["experience_match"]
-        experience_score = (
-            (1 if experience_match["years_match"] else 0) +
-            (1 if experience_match["level_match"] else 0) +
-            experience_match["relevance_score"]
-        ) / 3
-        
-        # Get education match score
-        education_match = result["education_match"]
-        education_score = (
-            (1 if education_match["level_match"] else 0) +
-            (1 if education_match["field_match"] else 0)
-        ) / 2
-        
-        # Get section match scores
-        section_matches = result["section_matches"]
-        section_score = sum(section_matches.values()) / len(section_matches)
-        
-        # Calculate weighted overall score
-        overall_score = (
-            keyword_score * 0.3 +
-            skill_score * 0.3 +
-            experience_score * 0.2 +
-            education_score * 0.1 +
-            section_score * 0.1
-        ) * 100
-        
-        return overall_score
+    def _relevance(self, similarity: float) -> float:
+        """Rescale a cosine similarity into a 0-1 relevance score"""
+        return float(min(max(similarity, 0.0) / RELEVANCE_SATURATION, 1.0))
+    
+    def _join_text(self, *parts: Any) -> str:
+        """Join strings and lists of strings into one text, skipping empty parts"""
+        texts = []
+        for part in parts:
+            if isinstance(part, (list, tuple)):
+                texts.extend(str(item) for item in part if item)
+            elif part:
+                texts.append(str(part))
+        return " ".join(texts)
+    
+    def _calculate_overall_match(self, result: Dict[str, Any], profile: Optional[str] = None) -> float:
+        """Calculate overall match score (0-100) with the profile's match weights"""
+        return get_profile(profile).score(extract_features(result))["match"]
@@ -0,0 +1,40 @@
+import logging
+import threading
+
+import nltk
+
+logger = logging.getLogger(__name__)
+
+# NLTK data packages used by the agents, keyed by their lookup path
+NLTK_RESOURCES = {
+    "tokenizers/punkt": "punkt",
+    "corpora/stopwords": "stopwords",
+}
+
+_checked = False
+_lock = threading.Lock()
+
+
+def ensure_nltk_resources() -> None:
+    """
+    Download missing NLTK data packages, once per process
+
+    Agents call this from their constructors; only the first call searches
+    the NLTK data path (and downloads what is missing).
+    """
+    global _checked
+    if _checked:
+        return
+
+    with _lock:
+        if _checked:
+            return
+
+        for path, package in NLTK_RESOURCES.items():
+            try:
+                nltk.data.find(path)
+            except LookupError:
+                logger.info(f"Downloading NLTK package: {package}")
+                nltk.download(package)
+
+        _checked = True
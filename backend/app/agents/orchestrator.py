@@ -1,138 +1,96 @@
 import logging
 import os
-from typing import Dict, Any, List, Optional, Union
+import functools
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Type
 from dotenv import load_dotenv
-from crewai import Crew, Agent, Task
+from pydantic import BaseModel
 
-# LangChain imports
-from langchain.llms.base import LLM
-from langchain.chat_models.base import BaseChatModel
-from langchain_openai import OpenAI, ChatOpenAI
+from app.agents.llm_providers import key_fingerprint
+from app.agents.llm_pool import pooled_llm
+from app.agents.crew_runner import CrewRunner, crew_runner
+from app.agents.task_graph import TaskGraph, TaskGraphRun
+from app.agents.output_parser import StructuredOutputParser, first_json
+from app.agents.prompt_builder import PromptBuilder
+from app.core.config import settings
+from app.schemas.responses import CrewResumeAnalysis, CrewJobAnalysis, CrewComparison, CrewResumeBuild
+from app.core.singleflight import SingleFlight, fingerprint
 
-# Import Groq integration
-try:
-    from langchain_groq import ChatGroq
-    GROQ_AVAILABLE = True
-except ImportError:
-    logger.warning("Groq integration not available. Install with 'pip install langchain-groq'")
-    GROQ_AVAILABLE = False
-
-# Import Google Gemini integration
-try:
-    from langchain_google_genai import ChatGoogleGenerativeAI
-    GEMINI_AVAILABLE = True
-except ImportError:
-    logger.warning("Google Gemini integration not available. Install with 'pip install langchain-google-genai'")
-    GEMINI_AVAILABLE = False
+# CrewAI and LangChain take seconds to import, so they load on first use
+if TYPE_CHECKING:
+    from crewai import Agent, Task
+    from app.agents.llm_providers import LanguageModel
 
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Concurrent identical crew runs share one execution
+_crew_flights = SingleFlight()
+
+def _coalesced(method):
+    """Share one crew run between concurrent identical calls to orchestrators with the same LLM"""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        key = (method.__name__, *self.pool_key, fingerprint(args, kwargs))
+        return await _crew_flights.do(key, lambda: method(self, *args, **kwargs))
+    return wrapper
+
+def _with_schema(expected_output: str, schema: Type[BaseModel]) -> str:
+    """Append JSON schema instructions to a final task's expected output"""
+    return f"{expected_output}. {StructuredOutputParser(schema).format_instructions()}"
+
 class AgentOrchestrator:
     """Orchestrator for the CrewAI multi-agent system"""
     
-    def __init__(self):
-        # Get LLM configuration from environment variables
-        provider = os.getenv("LLM_PROVIDER", "openai").lower()
-        model = os.getenv("LLM_MODEL", "gpt-4-turbo")
-        temperature = float(os.getenv("LLM_TEMPERATURE", "0.2"))
-        
-        # Initialize the language model based on the provider
-        self.llm = self._initialize_llm(provider, model, temperature)
+    def __init__(
+        self,
+        runner: Optional[CrewRunner] = None,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        api_key: Optional[str] = None,
+        llm: Optional["LanguageModel"] = None
+    ):
+        # Get LLM configuration from environment variables unless given
+        provider = (provider or os.getenv("LLM_PROVIDER", "openai")).lower()
+        model = model or os.getenv("LLM_MODEL", "gpt-4-turbo")
+        temperature = float(os.getenv("LLM_TEMPERATURE", "0.2")) if temperature is None else temperature
+        self.provider = provider
+        self.model = model
+        self.temperature = temperature
+        self.pool_key = (provider, model, temperature, key_fingerprint(provider, api_key))
         
-        logger.info(f"Initialized LLM with provider: {provider}, model: {model}")
-        
-        # Initialize agents
-        self.agents = {
-            "parser": self._create_parser_agent(),
-            "keyword": self._create_keyword_agent(),
-            "job": self._create_job_agent(),
-            "matching": self._create_matching_agent(),
-            "scoring": self._create_scoring_agent(),
-            "recommendation": self._create_recommendation_agent(),
-            "builder": self._create_builder_agent()
-        }
+        # Crews run on a shared worker pool so kickoff() never blocks the event loop
+        self.runner = runner or crew_runner
         
-    def _initialize_llm(self, provider: str, model: str, temperature: float) -> Union[LLM, BaseChatModel]:
-        """Initialize the language model based on the provider"""
-        # For development without an API key, use a mock LLM
-        if provider == "mock" or provider == "development":
-            from langchain.llms.fake import FakeListLLM
-            return FakeListLLM(responses=["This is a development mode response."])
+        # Resume and job context is compacted to the provider's token budget
+        self.prompt_builder = PromptBuilder(provider)
         
-        # OpenAI (default provider)
-        if provider == "openai":
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key or api_key == "your_openai_api_key_here":
-                logger.warning("No OpenAI API key provided. Using a mock LLM for development.")
-                from langchain.llms.fake import FakeListLLM
-                return FakeListLLM(responses=["This is a development mode response."])
-            
-            if "gpt-4" in model or "gpt-3.5" in model:
-                return ChatOpenAI(
-                    openai_api_key=api_key,
-                    model_name=model,
-                    temperature=temperature
-                )
-            else:
-                return OpenAI(
-                    openai_api_key=api_key,
-                    model_name=model,
-                    temperature=temperature
-                )
+        # Share one pooled client per (provider, model, temperature, API key) unless a client is given
+        self.llm = llm or pooled_llm(provider, model, temperature, api_key)
         
-        # Groq
-        elif provider == "groq":
-            if not GROQ_AVAILABLE:
-                logger.warning("Groq integration not available. Falling back to mock LLM.")
-                from langchain.llms.fake import FakeListLLM
-                return FakeListLLM(responses=["Groq integration not available."])
-            
-            api_key = os.getenv("GROQ_API_KEY")
-            if not api_key or api_key == "your_groq_api_key_here":
-                logger.warning("No Groq API key provided. Using a mock LLM for development.")
-                from langchain.llms.fake import FakeListLLM
-                return FakeListLLM(responses=["This is a development mode response."])
-            
-            # Default to llama2-70b-4096 if no model specified
-            groq_model = model if model else "llama2-70b-4096"
-            return ChatGroq(
-                groq_api_key=api_key,
-                model_name=groq_model,
-                temperature=temperature
-            )
-        
-        # Google Gemini
-        elif provider == "gemini" or provider == "google":
-            if not GEMINI_AVAILABLE:
-                logger.warning("Google Gemini integration not available. Falling back to mock LLM.")
-                from langchain.llms.fake import FakeListLLM
-                return FakeListLLM(responses=["Google Gemini integration not available."])
-            
-            api_key = os.getenv("GOOGLE_API_KEY")
-            if not api_key or api_key == "your_google_api_key_here":
-                logger.warning("No Google API key provided. Using a mock LLM for development.")
-                from langchain.llms.fake import FakeListLLM
-                return FakeListLLM(responses=["This is a development mode response."])
-            
-            # Default to gemini-pro if no model specified
-            gemini_model = model if model else "gemini-pro"
-            return ChatGoogleGenerativeAI(
-                google_api_key=api_key,
-                model=gemini_model,
-                temperature=temperature
-            )
+        logger.info(f"Initialized LLM with provider: {provider}, model: {model}")
         
-        # Fallback to mock LLM for unsupported providers
-        else:
-            logger.warning(f"Unsupported LLM provider: {provider}. Using a mock LLM.")
-            from langchain.llms.fake import FakeListLLM
-            return FakeListLLM(responses=[f"Unsupported LLM provider: {provider}"])
+        # Agents are built per flow: crewai keeps per-task state (executor, task, tools) on them
+        self._agent_factories = {
+            "parser": self._create_parser_agent,
+            "keyword": self._create_keyword_agent,
+            "job": self._create_job_agent,
+            "matching": self._create_matching_agent,
+            "scoring": self._create_scoring_agent,
+            "recommendation": self._create_recommendation_agent,
+            "builder": self._create_builder_agent
+        }
     
-    def _create_parser_agent(self) -> Agent:
+    def _create_agents(self, *names: str) -> Dict[str, "Agent"]:
+        """Build fresh agents for one flow"""
+        return {name: self._agent_factories[name]() for name in names}
+    
+    def _create_parser_agent(self) -> "Agent":
         """Create the resume parser agent"""
+        from crewai import Agent
+        
         return Agent(
             role="Resume Parser",
             goal="Extract and structure all relevant information from resumes",
@@ -143,8 +101,10 @@ class AgentOrchestrator:
             llm=self.llm
         )
     
-    def _create_keyword_agent(self) -> Agent:
+    def _create_keyword_agent(self) -> "Agent":
         """Create the keyword analyst agent"""
+        from crewai import Agent
+        
         return Agent(
             role="Keyword Analyst",
             goal="Identify and analyze important keywords in resumes and job descriptions",
@@ -155,8 +115,10 @@ class AgentOrchestrator:
             llm=self.llm
         )
     
-    def _create_job_agent(self) -> Agent:
+    def _create_job_agent(self) -> "Agent":
         """Create the job description agent"""
+        from crewai import Agent
+        
         return Agent(
             role="Job Description Analyst",
             goal="Analyze job descriptions to extract requirements and expectations",
@@ -167,8 +129,10 @@ class AgentOrchestrator:
             llm=self.llm
         )
     
-    def _create_matching_agent(self) -> Agent:
+    def _create_matching_agent(self) -> "Agent":
         """Create the matching algorithm agent"""
+        from crewai import Agent
+        
         return Agent(
             role="Matching Algorithm Specialist",
             goal="Compare resumes against job descriptions to identify matches and gaps",
@@ -179,8 +143,10 @@ class AgentOrchestrator:
             llm=self.llm
         )
     
-    def _create_scoring_agent(self) -> Agent:
+    def _create_scoring_agent(self) -> "Agent":
         """Create the scoring system agent"""
+        from crewai import Agent
+        
         return Agent(
             role="ATS Scoring Expert",
             goal="Calculate accurate ATS compatibility scores for resumes",
@@ -191,8 +157,10 @@ class AgentOrchestrator:
             llm=self.llm
         )
     
-    def _create_recommendation_agent(self) -> Agent:
+    def _create_recommendation_agent(self) -> "Agent":
         """Create the recommendation agent"""
+        from crewai import Agent
+        
         return Agent(
             role="Resume Optimization Consultant",
             goal="Provide actionable recommendations to improve resume ATS scores",
@@ -203,8 +171,10 @@ class AgentOrchestrator:
             llm=self.llm
         )
     
-    def _create_builder_agent(self) -> Agent:
+    def _create_builder_agent(self) -> "Agent":
         """Create the resume builder agent"""
+        from crewai import Agent
+        
         return Agent(
             role="Resume Builder",
             goal="Create professional, ATS-optimized resumes from scratch",
@@ -216,6 +186,7 @@ class AgentOrchestrator:
             llm=self.llm
         )
     
+    @_coalesced
     async def process_resume(self, resume_path: str) -> Dict[str, Any]:
         """
         Process a resume using the multi-agent system
@@ -226,38 +197,43 @@ class AgentOrchestrator:
         Returns:
             Dict[str, Any]: The processed resume data
         """
+        from crewai import Crew, Task
+        
         try:
+            agents = self._create_agents("parser", "keyword")
+            
             # Create tasks for resume processing
             parse_task = Task(
                 description=f"Parse the resume at {resume_path} and extract all relevant information",
-                agent=self.agents["parser"],
+                agent=agents["parser"],
                 expected_output="Structured JSON representation of the resume content"
             )
             
             keyword_task = Task(
                 description="Analyze the parsed resume to identify and categorize keywords",
-                agent=self.agents["keyword"],
-                expected_output="List of keywords categorized by type and importance",
+                agent=agents["keyword"],
+                expected_output=_with_schema("Resume content and keywords categorized by type and importance", CrewResumeAnalysis),
                 context=[parse_task]
             )
             
             # Create the crew
             crew = Crew(
-                agents=[self.agents["parser"], self.agents["keyword"]],
+                agents=[agents["parser"], agents["keyword"]],
                 tasks=[parse_task, keyword_task],
                 verbose=True
             )
             
-            # Run the crew
-            result = crew.kickoff()
+            # Run the crew off the event loop
+            result = await self.runner.run(crew, self.provider)
             
-            # Process and return the result
-            return self._process_crew_result(result)
+            # Validate the result against its schema
+            return await self._process_crew_result(result, CrewResumeAnalysis)
             
         except Exception as e:
             logger.error(f"Error in agent orchestration: {str(e)}")
             raise
     
+    @_coalesced
     async def process_job_description(self, job_description: str) -> Dict[str, Any]:
         """
         Process a job description using the multi-agent system
@@ -268,163 +244,240 @@ class AgentOrchestrator:
         Returns:
             Dict[str, Any]: The processed job data
         """
+        from crewai import Crew, Task
+        
         try:
+            agents = self._create_agents("job", "keyword")
+            
+            # Keep the relevant job sections within the token budget
+            job_context = self.prompt_builder.job_context(job_description)
+            
             # Create tasks for job description processing
             job_task = Task(
-                description=f"Analyze the job description and extract requirements and expectations",
-                agent=self.agents["job"],
+                description=f"Analyze the job description and extract requirements and expectations\n\n{job_context['text']}",
+                agent=agents["job"],
                 expected_output="Structured representation of job requirements and expectations"
             )
             
             keyword_task = Task(
                 description="Identify and categorize important keywords in the job description",
-                agent=self.agents["keyword"],
-                expected_output="List of keywords categorized by importance",
+                agent=agents["keyword"],
+                expected_output=_with_schema("Job requirements and keywords categorized by importance", CrewJobAnalysis),
                 context=[job_task]
             )
             
             # Create the crew
             crew = Crew(
-                agents=[self.agents["job"], self.agents["keyword"]],
+                agents=[agents["job"], agents["keyword"]],
                 tasks=[job_task, keyword_task],
                 verbose=True
             )
             
-            # Run the crew
-            result = crew.kickoff()
+            # Run the crew off the event loop
+            result = await self.runner.run(crew, self.provider)
             
-            # Process and return the result
-            return self._process_crew_result(result)
+            # Validate the result against its schema
+            return await self._process_crew_result(result, CrewJobAnalysis)
             
         except Exception as e:
             logger.error(f"Error in agent orchestration: {str(e)}")
             raise
     
+    @_coalesced
     async def compare_resume_to_job(self, resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Compare a resume to a job description
         
+        Resume keyword analysis and job requirement analysis are independent,
+        so they run concurrently before the matching task.
+        
         Args:
             resume_data: The processed resume data
             job_data: The processed job data
             
         Returns:
-            Dict[str, Any]: The comparison results
+            Dict[str, Any]: The comparison results, with task graph timings
         """
+        from crewai import Task
+        
         try:
+            agents = self._create_agents("keyword", "job", "matching", "scoring", "recommendation")
+            
+            # Split the token budget between the resume and the job
+            budget = self.prompt_builder.budget // 2
+            resume_context = self.prompt_builder.resume_context(resume_data, budget)
+            job_context = self.prompt_builder.job_context(job_data, budget)
+            
             # Create tasks for comparison
+            resume_keyword_task = Task(
+                description=f"Identify and categorize the keywords in the resume\n\n{resume_context['text']}",
+                agent=agents["keyword"],
+                expected_output="List of resume keywords categorized by type and importance"
+            )
+            
+            job_task = Task(
+                description=f"Analyze the job description to extract requirements and expectations\n\n{job_context['text']}",
+                agent=agents["job"],
+                expected_output="Structured representation of job requirements and keywords"
+            )
+            
             matching_task = Task(
                 description="Compare the resume against the job description to identify matches and gaps",
-                agent=self.agents["matching"],
-                expected_output="Detailed comparison of resume qualifications against job requirements"
+                agent=agents["matching"],
+                expected_output="Detailed comparison of resume qualifications against job requirements",
+                context=[resume_keyword_task, job_task]
             )
             
             scoring_task = Task(
                 description="Calculate an ATS compatibility score for the resume based on the comparison",
-                agent=self.agents["scoring"],
+                agent=agents["scoring"],
                 expected_output="ATS compatibility score with detailed breakdown",
                 context=[matching_task]
             )
             
             recommendation_task = Task(
                 description="Provide recommendations to improve the resume's ATS compatibility",
-                agent=self.agents["recommendation"],
-                expected_output="List of actionable recommendations to improve the resume",
+                agent=agents["recommendation"],
+                expected_output=_with_schema("ATS score, keyword matches and gaps, and actionable recommendations", CrewComparison),
                 context=[matching_task, scoring_task]
             )
             
-            # Create the crew
-            crew = Crew(
-                agents=[self.agents["matching"], self.agents["scoring"], self.agents["recommendation"]],
-                tasks=[matching_task, scoring_task, recommendation_task],
-                verbose=True
-            )
-            
-            # Run the crew
-            result = crew.kickoff()
+            # Run independent tasks concurrently off the event loop
+            graph_run = await self._run_task_graph({
+                "resume_keywords": resume_keyword_task,
+                "job_requirements": job_task,
+                "matching": matching_task,
+                "scoring": scoring_task,
+                "recommendations": recommendation_task
+            })
             
-            # Process and return the result
-            return self._process_crew_result(result)
+            # Validate the result against its schema
+            processed = await self._process_crew_result(graph_run.result, CrewComparison)
+            return {**processed, "timings": graph_run.timings()}
             
         except Exception as e:
             logger.error(f"Error in agent orchestration: {str(e)}")
             raise
     
+    @_coalesced
     async def build_resume(self, resume_data: Dict[str, Any], job_description: str = None) -> Dict[str, Any]:
         """
         Build a new ATS-optimized resume
         
+        The target job analysis and the candidate keyword analysis are
+        independent, so they run concurrently before the builder task.
+        
         Args:
             resume_data: The resume builder data
             job_description: Optional job description to target
             
         Returns:
-            Dict[str, Any]: The generated resume
+            Dict[str, Any]: The generated resume, with task graph timings
         """
+        from crewai import Task
+        
         try:
+            agents = self._create_agents("job", "keyword", "builder", "scoring")
+            
+            # Split the token budget between the candidate and the target job
+            budget = self.prompt_builder.budget // 2 if job_description else self.prompt_builder.budget
+            resume_context = self.prompt_builder.resume_context(resume_data, budget)
+            
             # Create tasks for resume building
-            job_task = None
+            tasks = {}
             if job_description:
-                job_task = Task(
-                    description="Analyze the target job description to identify key requirements",
-                    agent=self.agents["job"],
+                job_context = self.prompt_builder.job_context(job_description, budget)
+                tasks["job_requirements"] = Task(
+                    description=f"Analyze the target job description to identify key requirements\n\n{job_context['text']}",
+                    agent=agents["job"],
                     expected_output="List of key requirements and keywords from the job description"
                 )
             
-            build_task = Task(
+            tasks["candidate_keywords"] = Task(
+                description=f"Identify the strongest keywords in the candidate's information\n\n{resume_context['text']}",
+                agent=agents["keyword"],
+                expected_output="List of candidate keywords categorized by type and importance"
+            )
+            
+            tasks["build"] = Task(
                 description="Create an ATS-optimized resume based on the provided information",
-                agent=self.agents["builder"],
+                agent=agents["builder"],
                 expected_output="Complete resume content in multiple formats",
-                context=[job_task] if job_task else []
+                context=list(tasks.values())
             )
             
-            scoring_task = Task(
+            tasks["scoring"] = Task(
                 description="Evaluate the ATS compatibility of the generated resume",
-                agent=self.agents["scoring"],
-                expected_output="ATS compatibility score with detailed breakdown",
-                context=[build_task]
-            )
-            
-            # Create the crew
-            agents = [self.agents["builder"], self.agents["scoring"]]
-            tasks = [build_task, scoring_task]
-            
-            if job_task:
-                agents.append(self.agents["job"])
-                tasks.append(job_task)
-            
-            crew = Crew(
-                agents=agents,
-                tasks=tasks,
-                verbose=True
+                agent=agents["scoring"],
+                expected_output=_with_schema("Resume sections with their ATS compatibility score and feedback", CrewResumeBuild),
+                context=[tasks["build"]]
             )
             
-            # Run the crew
-            result = crew.kickoff()
+            # Run independent tasks concurrently off the event loop
+            graph_run = await self._run_task_graph(tasks)
             
-            # Process and return the result
-            return self._process_crew_result(result)
+            # Validate the result against its schema
+            processed = await self._process_crew_result(graph_run.result, CrewResumeBuild)
+            return {**processed, "timings": graph_run.timings()}
             
         except Exception as e:
             logger.error(f"Error in agent orchestration: {str(e)}")
             raise
     
-    def _process_crew_result(self, result: str) -> Dict[str, Any]:
+    async def _run_task_graph(self, tasks: Dict[str, "Task"]) -> TaskGraphRun:
         """
-        Process the result from the crew
+        Run tasks as a dependency graph built from their contexts
         
         Args:
-            result: The raw result from the crew
+            tasks: Tasks keyed by name, in sequential crew order
             
         Returns:
-            Dict[str, Any]: The processed result
+            TaskGraphRun: Task outputs and critical-path timings
         """
-        # In a real implementation, this would parse the result from the crew
-        # and convert it to the expected format
-        # For now, we'll return a placeholder
+        graph = TaskGraph(tasks)
         
-        # Placeholder for demonstration purposes
-        return {
-            "success": True,
-            "result": result
-        }
+        async def execute(name: str, task: "Task") -> Any:
+            return await self.runner.call(task.execute, self.provider)
+        
+        graph_run = await graph.run(execute)
+        
+        timings = graph_run.timings()
+        logger.info(
+            f"Task graph finished in {timings['total_seconds']}s "
+            f"(sequential {timings['sequential_seconds']}s, critical path {' -> '.join(timings['critical_path'])})"
+        )
+        return graph_run
+    
+    async def _process_crew_result(self, result: Any, schema: Type[BaseModel]) -> Dict[str, Any]:
+        """
+        Parse the crew's final output into its schema
+        
+        Fields that fail validation are re-requested from the LLM with a
+        prompt covering only those fields, instead of rerunning the crew.
+        
+        Args:
+            result: The raw result from the crew or final task
+            schema: The model the final task was asked to produce
+            
+        Returns:
+            Dict[str, Any]: The validated result, or the partial result with the fields still invalid
+        """
+        # CrewAI returns output objects that keep the final text in .raw
+        output = getattr(result, "raw", None) or str(result)
+        parser = StructuredOutputParser(schema, max_repairs=settings.LLM_OUTPUT_REPAIR_ATTEMPTS)
+        
+        parsed, data, errors, repairs = await parser.parse(output, self._repair)
+        if parsed is None:
+            return {"success": False, "result": data, "errors": errors, "repairs": repairs, "raw": output}
+        
+        return {"success": True, "result": parsed.model_dump(), "repairs": repairs}
+    
+    async def _repair(self, prompt: str) -> Optional[Any]:
+        """Send a repair prompt, streaming the answer and stopping once its JSON object is complete"""
+        def ask() -> Optional[Any]:
+            stream = getattr(self.llm, "stream", None)
+            if stream is None:
+                return first_json([self.llm.invoke(prompt)])
+            return first_json(stream(prompt))
+        
+        return await self.runner.call(ask, self.provider)
@@ -0,0 +1,220 @@
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Generic, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Longest slice of the original output quoted in a repair prompt
+REPAIR_CONTEXT_CHARS = 4000
+
+class OutputParserError(ValueError):
+    """Raised when an LLM output cannot be decoded as JSON"""
+
+class IncrementalJSONParser:
+    """
+    Finds complete JSON objects and arrays in text fed in chunks
+    
+    Surrounding prose and markdown fences are skipped. Values are decoded as
+    soon as their closing bracket arrives, so a streamed answer can be cut
+    off without waiting for trailing tokens. Bracketed prose that is not
+    valid JSON is rescanned for values nested inside it.
+    """
+    
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+    
+    def feed(self, chunk: str) -> Optional[Any]:
+        """
+        Consume the next chunk of text
+        
+        Returns:
+            Optional[Any]: The first JSON value closed in this chunk
+        """
+        return next(self.values(chunk), None)
+    
+    def values(self, chunk: str) -> Iterator[Any]:
+        """Consume a chunk of text, yielding each top-level JSON value as it closes"""
+        for char in chunk:
+            if self._depth == 0:
+                # Outside a value: wait for an opening bracket
+                if char in "{[":
+                    self._buffer = [char]
+                    self._depth = 1
+                continue
+            
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    text = "".join(self._buffer)
+                    self._buffer = []
+                    try:
+                        value = json.loads(text)
+                    except ValueError:
+                        # Brackets in prose balanced by accident; look for values inside them
+                        yield from IncrementalJSONParser().values(text[1:])
+                        continue
+                    yield value
+
+def extract_json(text: str, schema: Optional[Type[BaseModel]] = None) -> Any:
+    """
+    Decode the JSON answer in an LLM output
+    
+    ReAct prose can quote stray arrays or example objects before the real
+    answer, so every top-level value is considered: objects win over
+    arrays, then objects that validate against the schema, then those
+    sharing the most fields with it, and the last one on a tie.
+    
+    Args:
+        text: The LLM output
+        schema: The expected output model, used to pick between objects
+    
+    Raises:
+        OutputParserError: If the text holds no complete JSON value
+    """
+    values = list(IncrementalJSONParser().values(text))
+    if not values:
+        raise OutputParserError("No JSON object found in the LLM output")
+    
+    objects = [value for value in values if isinstance(value, dict)]
+    if not objects:
+        return values[-1]
+    if schema is None:
+        return objects[-1]
+    
+    fields = set(schema.model_fields)
+    
+    def rank(item: Tuple[int, Dict[str, Any]]) -> Tuple[bool, int, int]:
+        position, value = item
+        try:
+            schema.model_validate(value)
+            valid = True
+        except ValidationError:
+            valid = False
+        return valid, len(fields & set(value)), position
+    
+    return max(enumerate(objects), key=rank)[1]
+
+def first_json(chunks: Iterable[str]) -> Optional[Dict[str, Any]]:
+    """Decode the first JSON object from streamed chunks, skipping stray arrays and stopping as soon as it is complete"""
+    parser = IncrementalJSONParser()
+    for chunk in chunks:
+        for value in parser.values(getattr(chunk, "content", chunk)):
+            if isinstance(value, dict):
+                return value
+    return None
+
+def invalid_fields(error: ValidationError) -> Dict[str, str]:
+    """Top-level field names of a validation error with their first message"""
+    fields: Dict[str, str] = {}
+    for detail in error.errors():
+        field = str(detail["loc"][0]) if detail["loc"] else "__root__"
+        fields.setdefault(field, detail["msg"])
+    return fields
+
+def field_schemas(schema: Type[BaseModel], fields: Iterable[str]) -> Dict[str, Any]:
+    """JSON schema covering only the given fields of a model, with the definitions they use"""
+    full = schema.model_json_schema()
+    properties = {field: full["properties"][field] for field in fields if field in full.get("properties", {})}
+    subset: Dict[str, Any] = {"type": "object", "properties": properties, "required": list(properties)}
+    if "$defs" in full:
+        subset["$defs"] = full["$defs"]
+    return subset
+
+def repair_prompt(schema: Type[BaseModel], output: str, errors: Dict[str, str]) -> str:
+    """
+    Prompt asking the LLM to redo only the fields that failed validation
+    
+    Args:
+        schema: The expected output model
+        output: The original LLM output
+        errors: Validation messages keyed by field
+    """
+    problems = "\n".join(f"- {field}: {message}" for field, message in errors.items())
+    return (
+        f"The analysis below was supposed to be a {schema.__name__} JSON object, but these fields are invalid:\n"
+        f"{problems}\n\n"
+        f"Return a JSON object containing only these fields, valid against this schema:\n"
+        f"{json.dumps(field_schemas(schema, errors), separators=(',', ':'))}\n\n"
+        f"Analysis:\n{output[:REPAIR_CONTEXT_CHARS]}"
+    )
+
+class StructuredOutputParser(Generic[ModelT]):
+    """
+    Parses LLM output into a Pydantic model, repairing invalid fields
+    
+    Valid fields are kept; only the fields that fail validation are sent
+    back to the LLM in a targeted repair prompt and merged into the data,
+    so a malformed field never triggers a rerun of the whole crew.
+    """
+    
+    def __init__(self, schema: Type[ModelT], max_repairs: int = 2):
+        self.schema = schema
+        self.max_repairs = max_repairs
+    
+    def format_instructions(self) -> str:
+        """Output instructions to append to a task's expected output"""
+        return (
+            "Respond with a single JSON object, valid against this JSON schema: "
+            f"{json.dumps(self.schema.model_json_schema(), separators=(',', ':'))}"
+        )
+    
+    async def parse(
+        self,
+        output: str,
+        repair: Optional[Callable[[str], Awaitable[Optional[Any]]]] = None
+    ) -> Tuple[Optional[ModelT], Dict[str, Any], Dict[str, str], int]:
+        """
+        Parse and validate an LLM output
+        
+        Args:
+            output: The raw LLM output
+            repair: Sends a repair prompt and returns the decoded JSON answer
+        
+        Returns:
+            Tuple: (model or None, the best data obtained, remaining errors by field, repair prompts sent)
+        """
+        try:
+            data = extract_json(output, self.schema)
+        except OutputParserError:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        
+        repairs = 0
+        while True:
+            try:
+                return self.schema.model_validate(data), data, {}, repairs
+            except ValidationError as e:
+                errors = invalid_fields(e)
+            
+            if repair is None or repairs >= self.max_repairs:
+                logger.warning(f"{self.schema.__name__} output still invalid after {repairs} repairs: {errors}")
+                return None, data, errors, repairs
+            
+            # Re-ask for the invalid fields only, and drop them if the answer leaves them out
+            repairs += 1
+            answer = await repair(repair_prompt(self.schema, output, errors))
+            if isinstance(answer, dict):
+                data = {**data, **{field: value for field, value in answer.items() if field in errors}}
+            for field in errors:
+                if field in data and (not isinstance(answer, dict) or field not in answer):
+                    data.pop(field)
@@ -1,14 +1,48 @@
 import os
+import asyncio
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import json
 import fitz  # PyMuPDF
 import docx
+from docx.oxml.ns import qn
 from bs4 import BeautifulSoup
 import re
 
+from app.core.dates import PRESENT_TERMS, total_experience_months
+
 logger = logging.getLogger(__name__)
 
+_MONTH_NAMES = r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)'
+
+# A year on its own, not part of a longer number such as a phone number
+_START_YEAR = r'(?<![\d/-])(?:19|20)\d{2}(?![\d/])'
+_END_YEAR = r'(?<![\d/])(?:19|20)\d{2}(?![\d/-])'
+_MONTH_DATE = _MONTH_NAMES + r'\.?\s+\d{4}|\d{1,2}/\d{4}'
+
+# Date ranges such as "Jan 2019 - Present", "March 2018 – May 2020", "01/2019 - 03/2021" or
+# "2018 - 2020", in any case; each group captures the full date string so it can be normalized later
+DATE_RANGE_PATTERN = re.compile(
+    r'(' + _MONTH_DATE + r'|' + _START_YEAR + r')\s*[-–—]\s*('
+    + _MONTH_DATE + r'|' + _END_YEAR + r'|Present|Current|Now|Today|Ongoing|To Date)',
+    re.IGNORECASE
+)
+
+# Standalone header lines mapped to the standard section they introduce
+SECTION_HEADERS = {
+    "summary": "summary", "professional summary": "summary", "career summary": "summary",
+    "profile": "summary", "objective": "summary", "career objective": "summary",
+    "experience": "experience", "work experience": "experience", "professional experience": "experience",
+    "employment": "experience", "employment history": "experience", "work history": "experience",
+    "education": "education", "academic background": "education",
+    "skills": "skills", "technical skills": "skills", "core competencies": "skills",
+    "projects": "projects", "project experience": "projects",
+    "certifications": "certifications", "certificates": "certifications",
+    "languages": "languages",
+    "interests": "interests", "hobbies": "interests",
+    "references": "references"
+}
+
 class ResumeParserAgent:
     """Agent for parsing resume documents"""
     
@@ -16,6 +50,11 @@ class ResumeParserAgent:
         """
         Parse a resume file and extract structured information
         
+        Format signals (columns, tables, images, fonts, headers) are measured
+        in the same extraction pass and stored under "format_features".
+        Extraction and parsing run in a worker thread, so PDF and DOCX
+        processing never blocks the event loop.
+        
         Args:
             file_path: Path to the resume file
             
@@ -23,69 +62,146 @@ class ResumeParserAgent:
             Dict[str, Any]: Structured resume data
         """
         try:
-            # Get file extension
-            _, ext = os.path.splitext(file_path)
-            ext = ext.lower()
-            
-            # Extract text based on file type
-            if ext == '.pdf':
-                text = self._extract_from_pdf(file_path)
-            elif ext == '.docx':
-                text = self._extract_from_docx(file_path)
-            elif ext in ['.html', '.htm']:
-                text = self._extract_from_html(file_path)
-            elif ext == '.txt':
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    text = f.read()
-            else:
-                raise ValueError(f"Unsupported file format: {ext}")
-            
-            # Parse the extracted text
-            parsed_data = self._parse_text(text)
-            
-            return parsed_data
+            return await asyncio.to_thread(self._parse_file, file_path)
             
         except Exception as e:
             logger.error(f"Error parsing resume: {str(e)}")
             raise
     
-    def _extract_from_pdf(self, file_path: str) -> str:
-        """Extract text from a PDF file"""
+    def _parse_file(self, file_path: str) -> Dict[str, Any]:
+        # Extract text and format features based on file type
+        text, format_features = self.extract_text(file_path)
+        
+        # Parse the extracted text
+        return self.parse_extracted_text(text, format_features)
+    
+    def extract_text(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Extract the plain text and format features of a resume file
+        
+        Args:
+            file_path: Path to the resume file
+            
+        Returns:
+            Tuple[str, Dict[str, Any]]: The text and its format features
+        """
+        # Get file extension
+        _, ext = os.path.splitext(file_path)
+        ext = ext.lower()
+        
+        if ext == '.pdf':
+            return self._extract_from_pdf(file_path)
+        if ext == '.docx':
+            return self._extract_from_docx(file_path)
+        if ext in ['.html', '.htm']:
+            return self._extract_from_html(file_path)
+        if ext == '.txt':
+            with open(file_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            format_features = self._new_format_features("txt")
+            format_features["has_text_layer"] = bool(text.strip())
+            self._detect_headers(text.splitlines(), format_features)
+            return text, format_features
+        
+        raise ValueError(f"Unsupported file format: {ext}")
+    
+    def parse_extracted_text(self, text: str, format_features: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Structure resume text already extracted by extract_text()
+        
+        Args:
+            text: The resume text
+            format_features: The format features measured during extraction
+            
+        Returns:
+            Dict[str, Any]: Structured resume data
+        """
+        parsed_data = self._parse_text(text)
+        parsed_data["format_features"] = format_features
+        return parsed_data
+    
+    def _extract_from_pdf(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
+        """Extract text and format features from a PDF file"""
         text = ""
+        features = self._new_format_features("pdf")
+        fonts = set()
         try:
             # Open the PDF
             doc = fitz.open(file_path)
             
-            # Extract text from each page
+            # Extract text, layout and font information from each page in one pass
             for page in doc:
-                text += page.get_text()
+                page_dict = page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)
+                page_lines = []
+                text_blocks = []
+                
+                for block in page_dict.get("blocks", []):
+                    if block.get("type") != 0:
+                        continue
+                    text_blocks.append(block["bbox"])
+                    for line in block.get("lines", []):
+                        line_text = "".join(span["text"] for span in line.get("spans", []))
+                        page_lines.append(line_text)
+                        fonts.update(span["font"] for span in line.get("spans", []) if span.get("text", "").strip())
+                
+                text += "".join(line + "\n" for line in page_lines)
+                
+                features["page_count"] += 1
+                features["image_count"] += len(page.get_images(full=False))
+                features["column_count"] = max(features["column_count"], self._count_columns(text_blocks, page.rect.width))
+                features["table_count"] += self._count_pdf_tables(page)
+                self._detect_headers(page_lines, features)
             
             # Close the document
             doc.close()
             
-            return text
+            features["has_text_layer"] = bool(text.strip())
+            features["font_count"] = len(fonts)
+            
+            return text, features
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {str(e)}")
             raise
     
-    def _extract_from_docx(self, file_path: str) -> str:
-        """Extract text from a DOCX file"""
+    def _extract_from_docx(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
+        """Extract text and format features from a DOCX file"""
         text = ""
+        features = self._new_format_features("docx")
+        fonts = set()
         try:
             # Open the DOCX
             doc = docx.Document(file_path)
             
-            # Extract text from each paragraph
+            # Extract text from each paragraph, collecting fonts and styled headings
+            lines = []
             for para in doc.paragraphs:
                 text += para.text + "\n"
+                lines.append(para.text)
+                
+                style_name = para.style.name if para.style is not None else ""
+                if style_name.startswith("Heading") or style_name == "Title":
+                    features["styled_header_count"] += 1
+                
+                if para.style is not None and para.style.font.name:
+                    fonts.add(para.style.font.name)
+                fonts.update(run.font.name for run in para.runs if run.font.name)
             
-            return text
+            features["page_count"] = 1
+            features["table_count"] = len(doc.tables)
+            features["image_count"] = len(doc.inline_shapes)
+            features["column_count"] = max([self._docx_column_count(section) for section in doc.sections] or [1])
+            features["has_text_layer"] = bool(text.strip())
+            features["font_count"] = len(fonts)
+            self._detect_headers(lines, features)
+            
+            return text, features
         except Exception as e:
             logger.error(f"Error extracting text from DOCX: {str(e)}")
             raise
     
-    def _extract_from_html(self, file_path: str) -> str:
-        """Extract text from an HTML file"""
+    def _extract_from_html(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
+        """Extract text and format features from an HTML file"""
+        features = self._new_format_features("html")
         try:
             # Read the HTML file
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -98,6 +214,11 @@ class ResumeParserAgent:
             for script in soup(["script", "style"]):
                 script.extract()
             
+            features["page_count"] = 1
+            features["table_count"] = len(soup.find_all("table"))
+            features["image_count"] = len(soup.find_all("img"))
+            features["styled_header_count"] = len(soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6"]))
+            
             # Get text
             text = soup.get_text()
             
@@ -108,11 +229,66 @@ class ResumeParserAgent:
             # Drop blank lines
             text = '\n'.join(chunk for chunk in chunks if chunk)
             
-            return text
+            features["has_text_layer"] = bool(text.strip())
+            self._detect_headers(text.splitlines(), features)
+            
+            return text, features
         except Exception as e:
             logger.error(f"Error extracting text from HTML: {str(e)}")
             raise
     
+    def _new_format_features(self, source: str) -> Dict[str, Any]:
+        """Create an empty format feature record"""
+        return {
+            "source": source,
+            "page_count": 0,
+            "column_count": 1,
+            "table_count": 0,
+            "image_count": 0,
+            "has_text_layer": False,
+            "font_count": 0,
+            "styled_header_count": 0,
+            "sections_detected": []
+        }
+    
+    def _detect_headers(self, lines: List[str], features: Dict[str, Any]):
+        """Record which standard section headers appear as standalone lines"""
+        for line in lines:
+            candidate = line.strip().rstrip(":").strip().lower()
+            if len(candidate) > 40:
+                continue
+            section = SECTION_HEADERS.get(candidate)
+            if section and section not in features["sections_detected"]:
+                features["sections_detected"].append(section)
+    
+    def _count_columns(self, blocks: List[Tuple[float, float, float, float]], page_width: float) -> int:
+        """Detect a two-column layout: text blocks side by side on both halves of the page"""
+        middle = page_width / 2
+        left = [b for b in blocks if b[2] <= middle + page_width * 0.05 and (b[2] - b[0]) < page_width * 0.55]
+        right = [b for b in blocks if b[0] >= middle - page_width * 0.05 and (b[2] - b[0]) < page_width * 0.55]
+        
+        for lb in left:
+            for rb in right:
+                # Vertically overlapping blocks on opposite halves
+                if lb[1] < rb[3] and rb[1] < lb[3]:
+                    return 2
+        return 1
+    
+    def _count_pdf_tables(self, page) -> int:
+        """Count tables on a PDF page (table detection needs PyMuPDF 1.23+)"""
+        try:
+            return len(page.find_tables().tables)
+        except Exception:
+            return 0
+    
+    def _docx_column_count(self, section) -> int:
+        """Read the column count from a DOCX section's properties"""
+        cols = section._sectPr.find(qn("w:cols"))
+        if cols is None:
+            return 1
+        num = cols.get(qn("w:num"))
+        return int(num) if num and num.isdigit() else 1
+    
     def _parse_text(self, text: str) -> Dict[str, Any]:
         """
         Parse the extracted text into structured resume data
@@ -162,6 +338,9 @@ class ResumeParserAgent:
         # Extract interests
         parsed_data["interests"] = self._extract_interests(text)
         
+        # Precompute total experience, counting overlapping roles once
+        parsed_data["total_experience_months"] = total_experience_months(parsed_data["experience"])
+        
         return parsed_data
     
     def _extract_contact_info(self, text: str) -> Dict[str, str]:
@@ -247,11 +426,11 @@ class ResumeParserAgent:
                     education_item["field_of_study"] = field_match.group(1).strip()
                 
                 # Extract dates
-                date_match = re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)\.?\s+\d{4}\s*-\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December|Present)\.?\s+\d{0,4}', entry)
+                date_match = DATE_RANGE_PATTERN.search(entry)
                 if date_match:
                     education_item["start_date"] = date_match.group(1)
                     education_item["end_date"] = date_match.group(2)
-                    if education_item["end_date"].lower() == "present":
+                    if education_item["end_date"].lower() in PRESENT_TERMS:
                         education_item["current"] = True
                 
                 if education_item:
@@ -291,11 +470,11 @@ class ResumeParserAgent:
                     experience_item["position"] = position_match.group(0).strip()
                 
                 # Extract dates
-                date_match = re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)\.?\s+\d{4}\s*-\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December|Present)\.?\s+\d{0,4}', entry)
+                date_match = DATE_RANGE_PATTERN.search(entry)
                 if date_match:
                     experience_item["start_date"] = date_match.group(1)
                     experience_item["end_date"] = date_match.group(2)
-                    if experience_item["end_date"].lower() == "present":
+                    if experience_item["end_date"].lower() in PRESENT_TERMS:
                         experience_item["current"] = True
                 
                 # Extract description
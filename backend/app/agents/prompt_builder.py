@@ -0,0 +1,238 @@
+import re
+import logging
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.agents.job_agent import (
+    BOILERPLATE_HEADERS,
+    EXPERIENCE_HEADERS,
+    PREFERRED_QUALIFICATION_HEADERS,
+    PREFERRED_SKILL_HEADERS,
+    REQUIRED_QUALIFICATION_HEADERS,
+    REQUIRED_SKILL_HEADERS,
+    RESPONSIBILITY_HEADERS,
+    _SECTION_HEADER_PATTERN,
+    index_sections
+)
+
+logger = logging.getLogger(__name__)
+
+# Job sections in the order they are kept when the budget runs out
+JOB_SECTION_PRIORITY = (
+    REQUIRED_SKILL_HEADERS
+    + REQUIRED_QUALIFICATION_HEADERS
+    + ["Qualifications", "Skills"]
+    + EXPERIENCE_HEADERS
+    + RESPONSIBILITY_HEADERS
+    + PREFERRED_SKILL_HEADERS
+    + PREFERRED_QUALIFICATION_HEADERS
+    + ["Education", "Educational Requirements", "Position Summary", "Role Overview", "Background"]
+)
+
+# Structured job fields in the order they are kept, for job data without a section index
+JOB_FIELD_PRIORITY = [
+    ("required_skills", "Required Skills"),
+    ("qualifications", "Qualifications"),
+    ("experience", "Experience"),
+    ("experience_years", "Experience Years"),
+    ("responsibilities", "Responsibilities"),
+    ("preferred_skills", "Preferred Skills"),
+    ("education", "Education"),
+    ("keywords", "Keywords"),
+]
+
+# Resume fields in the order they are kept; contact details and format data never reach the LLM
+RESUME_SECTION_PRIORITY = ["summary", "skills", "experience", "education", "certifications", "projects", "languages"]
+RESUME_EXCLUDED_FIELDS = {"contact_info", "format_features", "interests", "references", "raw_text", "hybrid"}
+
+# Boilerplate sentences that also appear outside their own section
+_BOILERPLATE_PATTERN = re.compile(
+    r"equal (?:employment )?opportunity|regardless of (?:race|color|religion|sex|age)|"
+    r"reasonable accommodation|e-verify|affirmative action",
+    re.IGNORECASE
+)
+_BULLET_PREFIX = re.compile(r"^[\s•\-*]+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Words and punctuation; BPE tokenizers average about four characters per token
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the token count of text without a provider tokenizer"""
+    return sum((len(piece) + 3) // 4 for piece in _TOKEN_PATTERN.findall(text))
+
+def token_budget(provider: str) -> int:
+    """Context token budget for a provider"""
+    return settings.LLM_PROMPT_TOKEN_BUDGETS.get(provider, settings.LLM_PROMPT_TOKEN_BUDGET)
+
+class PromptBuilder:
+    """
+    Builds compact resume and job context for crew prompts
+    
+    Documents are split into sections (the job agent's section index, or
+    the parsed resume fields), boilerplate sections and repeated lines are
+    dropped, and sections are added in priority order until the provider's
+    token budget is spent. The section that crosses the budget is cut at a
+    word boundary; lower-priority sections are left out.
+    """
+    
+    def __init__(self, provider: str, budget: Optional[int] = None):
+        self.provider = provider
+        self.budget = budget or token_budget(provider)
+    
+    def job_context(self, job: Union[str, Dict[str, Any]], budget: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Build the context for a job description
+        
+        Args:
+            job: The job description text, or job data from the job agent or an LLM crew
+            budget: Tokens available, defaulting to the provider budget
+        
+        Returns:
+            Dict[str, Any]: The context text with its token count and the sections kept, truncated and dropped
+        """
+        if isinstance(job, str):
+            sections = index_sections(job)
+            # Text before the first header holds the title and company
+            first_header = _SECTION_HEADER_PATTERN.search(job)
+            preamble = job[:first_header.start()].strip() if first_header else job
+            original = job
+        else:
+            sections = job.get("sections") or {}
+            preamble = " | ".join(str(job[key]) for key in ("title", "company", "location") if job.get(key))
+            if not sections:
+                # Crew output and imported jobs have structured fields but no section index
+                sections = {name: _render(job[field]) for field, name in JOB_FIELD_PRIORITY if job.get(field)}
+            original = "\n".join([preamble, *sections.values()])
+        
+        candidates = [("Position", preamble)] if preamble else []
+        ordered = sorted(
+            (header for header in sections if header not in BOILERPLATE_HEADERS),
+            key=lambda header: JOB_SECTION_PRIORITY.index(header) if header in JOB_SECTION_PRIORITY else len(JOB_SECTION_PRIORITY)
+        )
+        candidates.extend((header, sections[header]) for header in ordered)
+        
+        dropped = [header for header in sections if header in BOILERPLATE_HEADERS]
+        return self._fit(candidates, budget or self.budget, original, dropped)
+    
+    def resume_context(self, resume: Dict[str, Any], budget: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Build the context for parsed resume data
+        
+        Args:
+            resume: Parsed resume or resume builder data
+            budget: Tokens available, defaulting to the provider budget
+        
+        Returns:
+            Dict[str, Any]: The context text with its token count and the sections kept, truncated and dropped
+        """
+        fields = [field for field, value in resume.items() if value and field not in RESUME_EXCLUDED_FIELDS]
+        fields.sort(key=lambda field: RESUME_SECTION_PRIORITY.index(field) if field in RESUME_SECTION_PRIORITY else len(RESUME_SECTION_PRIORITY))
+        
+        candidates = [(field.replace("_", " ").title(), _render(resume[field])) for field in fields]
+        original = "\n".join(_render(value) for value in resume.values() if value)
+        return self._fit(candidates, budget or self.budget, original, [field for field in resume if field in RESUME_EXCLUDED_FIELDS])
+    
+    def _fit(
+        self,
+        candidates: List[Tuple[str, str]],
+        budget: int,
+        original: str,
+        dropped: List[str]
+    ) -> Dict[str, Any]:
+        """Add deduplicated sections in order until the budget is spent"""
+        seen = set()
+        parts: List[str] = []
+        included: List[str] = []
+        truncated: List[str] = []
+        dropped = list(dropped)
+        remaining = budget
+        
+        for name, content in candidates:
+            lines = _dedupe(content, seen)
+            if not lines:
+                continue
+            if remaining <= 0:
+                dropped.append(name)
+                continue
+            
+            # Take whole lines while they fit, then as many words of the overflowing line as fit
+            kept = []
+            overflow = False
+            cost = estimate_tokens(name) + 2
+            for line in lines:
+                line_cost = estimate_tokens(line) + 1
+                if cost + line_cost > remaining:
+                    partial = _truncate_words(line, remaining - cost - 1)
+                    if partial:
+                        kept.append(partial)
+                        cost += estimate_tokens(partial) + 1
+                    overflow = True
+                    break
+                kept.append(line)
+                cost += line_cost
+            
+            # A section too large for even its first words leaves the budget to smaller ones
+            if not kept:
+                dropped.append(name)
+                continue
+            if overflow:
+                truncated.append(name)
+                remaining = 0
+            else:
+                remaining -= cost
+            parts.append(f"{name}:\n" + "\n".join(kept))
+            included.append(name)
+        
+        text = "\n\n".join(parts)
+        tokens = estimate_tokens(text)
+        original_tokens = estimate_tokens(original)
+        logger.debug(f"Prompt context for {self.provider}: {tokens}/{budget} tokens (from {original_tokens})")
+        
+        return {
+            "text": text,
+            "tokens": tokens,
+            "budget": budget,
+            "original_tokens": original_tokens,
+            "sections": included,
+            "truncated": truncated,
+            "dropped": dropped
+        }
+
+def _dedupe(content: str, seen: set) -> List[str]:
+    """Non-empty lines of a section, without boilerplate and lines already used"""
+    lines = []
+    for line in content.splitlines():
+        line = line.strip()
+        key = _WHITESPACE_PATTERN.sub(" ", _BULLET_PREFIX.sub("", line)).lower()
+        if not key or key in seen or _BOILERPLATE_PATTERN.search(line):
+            continue
+        seen.add(key)
+        lines.append(line)
+    return lines
+
+def _truncate_words(line: str, budget: int) -> str:
+    """Leading words of a line that fit within a token budget"""
+    kept = []
+    cost = 0
+    for word in line.split():
+        cost += estimate_tokens(word)
+        if cost > budget:
+            break
+        kept.append(word)
+    return " ".join(kept)
+
+def _render(value: Any) -> str:
+    """Render a parsed resume field as compact lines"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        scalars = "; ".join(f"{key}: {item}" for key, item in value.items() if item and not isinstance(item, (list, dict)))
+        nested = [_render(item) for item in value.values() if item and isinstance(item, (list, dict))]
+        return "\n".join([scalars, *nested]) if scalars else "\n".join(nested)
+    if isinstance(value, list):
+        # Lists of short strings (skills, keywords) go on one line
+        if all(isinstance(item, str) and len(item) < 40 for item in value):
+            return ", ".join(value)
+        return "\n".join(f"- {item}" if isinstance(item, str) else _render(item) for item in value if item)
+    return str(value)
@@ -0,0 +1,195 @@
+import json
+import math
+import time
+import random
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+# ReAct framing lets CrewAI agents accept a replayed answer as final
+FINAL_ANSWER_PREFIX = "Thought: I now know the final answer\nFinal Answer: "
+
+# Answers used when no recording matches, keyed by the output schema named in the prompt
+DEFAULT_RESPONSES = {
+    "CrewResumeAnalysis": {
+        "summary": "Backend engineer with six years of Python experience.",
+        "experience": [{"company": "Acme", "position": "Software Engineer", "start_date": "2019", "end_date": "Present"}],
+        "education": [{"institution": "State University", "degree": "BSc Computer Science"}],
+        "skills": ["Python", "SQL", "Docker", "AWS"],
+        "keywords": [{"keyword": "Python", "category": "technical", "importance": 0.9}]
+    },
+    "CrewJobAnalysis": {
+        "title": "Senior Backend Engineer",
+        "company": "Acme",
+        "required_skills": ["Python", "PostgreSQL", "Docker"],
+        "preferred_skills": ["Kubernetes"],
+        "responsibilities": ["Build and operate APIs"],
+        "experience_years": 5,
+        "keywords": [{"keyword": "Python", "category": "technical", "importance": 1.0}]
+    },
+    "CrewComparison": {
+        "overall_score": 78,
+        "matched_keywords": ["Python", "Docker"],
+        "missing_keywords": ["PostgreSQL"],
+        "recommendations": []
+    },
+    "CrewResumeBuild": {
+        "sections": {"summary": "Backend engineer with six years of Python experience."},
+        "ats_score": 85,
+        "feedback": ["Quantify the impact of recent projects"]
+    },
+}
+DEFAULT_ANSWER = "Replayed analysis: the document covers Python, SQL and Docker."
+
+def _prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(" ".join(prompt.split()).encode("utf-8")).hexdigest()
+
+class LatencyModel:
+    """
+    Samples simulated LLM response times
+    
+    Distributions: fixed (always the mean), uniform (mean +/- jitter),
+    normal (standard deviation jitter, clipped at zero) and lognormal
+    (right-skewed like real API latencies, with the given mean and
+    standard deviation).
+    """
+    
+    def __init__(self, distribution: str = "lognormal", mean_ms: float = 800.0, jitter_ms: float = 200.0, seed: Optional[int] = None):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}. Use one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+        self.distribution = distribution
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    def sample(self) -> float:
+        """Draw one latency, in seconds"""
+        with self._lock:
+            if self.distribution == "fixed" or self.mean_ms <= 0:
+                ms = self.mean_ms
+            elif self.distribution == "uniform":
+                ms = self._random.uniform(self.mean_ms - self.jitter_ms, self.mean_ms + self.jitter_ms)
+            elif self.distribution == "normal":
+                ms = self._random.gauss(self.mean_ms, self.jitter_ms)
+            else:
+                sigma2 = math.log(1 + (self.jitter_ms / self.mean_ms) ** 2)
+                ms = self._random.lognormvariate(math.log(self.mean_ms) - sigma2 / 2, math.sqrt(sigma2))
+        return max(ms, 0.0) / 1000
+    
+    def describe(self) -> str:
+        return f"{self.distribution}({self.mean_ms:g}ms, {self.jitter_ms:g}ms)"
+
+class ReplayResponder:
+    """
+    Answers prompts from recorded responses after a simulated delay
+    
+    Recordings are JSON lines with a "response" and either a "prompt"
+    (matched after whitespace normalization), a "prompt_hash" (SHA-256 of
+    the normalized prompt) or a "match" substring; an optional "latency_ms"
+    overrides the latency model. Prompts without a recording get the
+    built-in answer for the output schema they ask for. The responder counts
+    calls, simulated seconds and peak concurrency so benchmarks can separate
+    orchestration overhead from model time.
+    """
+    
+    def __init__(self, recordings: Optional[List[Dict[str, Any]]] = None, latency: Optional[LatencyModel] = None):
+        self.latency = latency or LatencyModel()
+        self._by_hash: Dict[str, Dict[str, Any]] = {}
+        self._by_match: List[Dict[str, Any]] = []
+        for recording in recordings or []:
+            if "prompt" in recording:
+                self._by_hash[_prompt_hash(recording["prompt"])] = recording
+            elif "prompt_hash" in recording:
+                self._by_hash[recording["prompt_hash"]] = recording
+            else:
+                self._by_match.append(recording)
+        
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.replayed = 0
+        self.simulated_seconds = 0.0
+        self.active = 0
+        self.peak_concurrency = 0
+    
+    @classmethod
+    def from_settings(cls) -> "ReplayResponder":
+        """Build a responder from the LOCAL_FAKE_* settings"""
+        latency = LatencyModel(
+            settings.LOCAL_FAKE_LATENCY_DISTRIBUTION,
+            settings.LOCAL_FAKE_LATENCY_MS,
+            settings.LOCAL_FAKE_LATENCY_JITTER_MS,
+            settings.LOCAL_FAKE_SEED
+        )
+        recordings = cls.load(settings.LOCAL_FAKE_RESPONSES_FILE) if settings.LOCAL_FAKE_RESPONSES_FILE else []
+        return cls(recordings, latency)
+    
+    @staticmethod
+    def load(path: str) -> List[Dict[str, Any]]:
+        """Read recordings from a JSON lines file"""
+        with open(path, "r", encoding="utf-8") as f:
+            recordings = [json.loads(line) for line in f if line.strip()]
+        logger.info(f"Loaded {len(recordings)} recorded LLM responses from {path}")
+        return recordings
+    
+    def respond(self, prompt: str) -> str:
+        """
+        Block for a simulated latency and return the recorded answer
+        
+        Args:
+            prompt: The prompt sent to the model
+        
+        Returns:
+            str: The replayed response
+        """
+        recording = self._find(prompt)
+        if recording is not None and "latency_ms" in recording:
+            delay = recording["latency_ms"] / 1000
+        else:
+            delay = self.latency.sample()
+        
+        with self._lock:
+            self.calls += 1
+            self.replayed += recording is not None
+            self.simulated_seconds += delay
+            self.active += 1
+            self.peak_concurrency = max(self.peak_concurrency, self.active)
+        try:
+            time.sleep(delay)
+        finally:
+            with self._lock:
+                self.active -= 1
+        
+        if recording is not None:
+            return recording["response"]
+        return self._default_answer(prompt)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return call counters and the total simulated model time"""
+        return {
+            "calls": self.calls,
+            "replayed": self.replayed,
+            "simulated_seconds": round(self.simulated_seconds, 3),
+            "peak_concurrency": self.peak_concurrency,
+            "latency": self.latency.describe()
+        }
+    
+    def _find(self, prompt: str) -> Optional[Dict[str, Any]]:
+        recording = self._by_hash.get(_prompt_hash(prompt))
+        if recording is not None:
+            return recording
+        return next((recording for recording in self._by_match if recording["match"] in prompt), None)
+    
+    def _default_answer(self, prompt: str) -> str:
+        # Schema instructions include each model's title
+        for schema, response in DEFAULT_RESPONSES.items():
+            if f'"title":"{schema}"' in prompt or f'"title": "{schema}"' in prompt:
+                return FINAL_ANSWER_PREFIX + json.dumps(response)
+        return FINAL_ANSWER_PREFIX + DEFAULT_ANSWER
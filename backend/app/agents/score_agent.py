@@ -1,44 +1,51 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from app.agents.scoring_profiles import (
+    GROUPS,
+    CompiledProfile,
+    extract_features,
+    get_profile,
+    score_batch
+)
 
 logger = logging.getLogger(__name__)
 
 class ScoringSystemAgent:
     """Agent for calculating ATS compatibility scores for resumes"""
     
-    async def calculate_scores(self, match_results: Dict[str, Any]) -> Dict[str, Any]:
+    def __init__(self, profile: Optional[str] = None):
+        self.profile = profile
+    
+    async def calculate_scores(self, match_results: Dict[str, Any], profile: Optional[str] = None) -> Dict[str, Any]:
         """
         Calculate ATS compatibility scores based on matching results
         
         Args:
             match_results: The results from the matching algorithm
+            profile: Scoring profile name (defaults to the agent's profile)
             
         Returns:
             Dict[str, Any]: Scoring results
         """
         try:
-            # Initialize result structure
+            compiled = get_profile(profile or self.profile)
+            
+            # Score every group with one product of the profile weights and the feature vector
+            group_scores = compiled.score(extract_features(match_results))
+            
             result = {
                 "overall_score": 0.0,
-                "content_match_score": 0.0,
-                "format_compatibility_score": 0.0,
-                "section_evaluation_score": 0.0,
-                "section_scores": {},
-                "keyword_matches": match_results.get("keyword_matches", {})
+                "content_match_score": group_scores["content"],
+                "format_compatibility_score": group_scores["format"],
+                "section_evaluation_score": group_scores["sections"],
+                "section_scores": self._calculate_section_scores(match_results, compiled),
+                "keyword_matches": match_results.get("keyword_matches", {}),
+                "profile": compiled.name
             }
             
-            # Calculate content match score (40 points)
-            result["content_match_score"] = self._calculate_content_match_score(match_results)
-            
-            # Calculate format compatibility score (25 points)
-            result["format_compatibility_score"] = self._calculate_format_compatibility_score(match_results)
-            
-            # Calculate section evaluation score (35 points)
-            result["section_evaluation_score"] = self._calculate_section_evaluation_score(match_results)
-            
-            # Calculate section scores
-            result["section_scores"] = self._calculate_section_scores(match_results)
-            
             # Calculate overall score
             result["overall_score"] = (
                 result["content_match_score"] +
@@ -52,128 +59,62 @@ class ScoringSystemAgent:
             logger.error(f"Error calculating scores: {str(e)}")
             raise
     
-    def _calculate_content_match_score(self, match_results: Dict[str, Any]) -> float:
+    async def calculate_batch_scores(self, match_results_list: List[Dict[str, Any]], profiles: List[str]) -> Dict[str, List[Dict[str, float]]]:
         """
-        Calculate content match score (40 points)
-        - Keyword presence and relevance (20 points)
-        - Skills alignment (10 points)
-        - Experience relevance (10 points)
-        """
-        score = 0.0
+        Score many matching results under several profiles at once
         
-        # Keyword presence and relevance (20 points)
-        keyword_matches = match_results.get("keyword_matches", {})
-        if keyword_matches:
-            # Calculate weighted keyword score
-            total_importance = sum(match["importance"] for match in keyword_matches.values())
-            matched_importance = sum(match["importance"] for match in keyword_matches.values() if match["found"])
+        Args:
+            match_results_list: Results from the matching algorithm
+            profiles: Scoring profile names
             
-            keyword_score = (matched_importance / total_importance) if total_importance > 0 else 0
-            score += keyword_score * 20
-        
-        # Skills alignment (10 points)
-        skill_matches = match_results.get("skill_matches", {})
-        if skill_matches:
-            matched = len(skill_matches.get("matched", []))
-            total = matched + len(skill_matches.get("missing", []))
+        Returns:
+            Dict[str, List[Dict[str, float]]]: Group and overall scores per profile, in input order
+        """
+        try:
+            if not match_results_list:
+                return {name: [] for name in profiles}
             
-            skill_score = (matched / total) if total > 0 else 0
-            score += skill_score * 10
-        
-        # Experience relevance (10 points)
-        experience_match = match_results.get("experience_match", {})
-        if experience_match:
-            # Years match (3 points)
-            if experience_match.get("years_match", False):
-                score += 3
+            feature_matrix = np.stack([extract_features(match_results) for match_results in match_results_list])
+            scores = score_batch(feature_matrix, profiles)
             
-            # Level match (3 points)
-            if experience_match.get("level_match", False):
-                score += 3
+            results = {}
+            for profile_index, name in enumerate(profiles):
+                results[name] = []
+                for item_scores in scores[profile_index]:
+                    group_scores = dict(zip(GROUPS, item_scores.tolist()))
+                    results[name].append({
+                        "overall_score": group_scores["content"] + group_scores["format"] + group_scores["sections"],
+                        "content_match_score": group_scores["content"],
+                        "format_compatibility_score": group_scores["format"],
+                        "section_evaluation_score": group_scores["sections"]
+                    })
             
-            # Relevance score (4 points)
-            relevance_score = experience_match.get("relevance_score", 0.0)
-            score += relevance_score * 4
-        
-        return score
-    
-    def _calculate_format_compatibility_score(self, match_results: Dict[str, Any]) -> float:
-        """
-        Calculate format compatibility score (25 points)
-        - Structure clarity (10 points)
-        - Standard section organization (5 points)
-        - Machine readability (10 points)
-        """
-        # For this example, we'll use placeholder scores
-        # In a real implementation, this would analyze the resume format
-        
-        # Structure clarity (10 points)
-        structure_score = 8.0  # Placeholder
-        
-        # Standard section organization (5 points)
-        organization_score = 4.0  # Placeholder
-        
-        # Machine readability (10 points)
-        readability_score = 7.0  # Placeholder
-        
-        return structure_score + organization_score + readability_score
-    
-    def _calculate_section_evaluation_score(self, match_results: Dict[str, Any]) -> float:
-        """
-        Calculate section evaluation score (35 points)
-        - Professional summary/objective (5 points)
-        - Work experience formatting and content (15 points)
-        - Education and certifications (5 points)
-        - Skills presentation (10 points)
-        """
-        score = 0.0
-        
-        # Get section matches
-        section_matches = match_results.get("section_matches", {})
-        
-        # Professional summary/objective (5 points)
-        summary_score = section_matches.get("summary", 0.0) * 5
-        score += summary_score
-        
-        # Work experience formatting and content (15 points)
-        experience_score = section_matches.get("experience", 0.0) * 15
-        score += experience_score
-        
-        # Education and certifications (5 points)
-        education_match = match_results.get("education_match", {})
-        education_score = 0.0
-        
-        if education_match.get("level_match", False):
-            education_score += 2.5
-        
-        if education_match.get("field_match", False):
-            education_score += 2.5
-        
-        score += education_score
-        
-        # Skills presentation (10 points)
-        skills_score = section_matches.get("skills", 0.0) * 10
-        score += skills_score
-        
-        return score
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error calculating batch scores: {str(e)}")
+            raise
     
-    def _calculate_section_scores(self, match_results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    def _calculate_section_scores(self, match_results: Dict[str, Any], compiled: CompiledProfile) -> Dict[str, Dict[str, Any]]:
         """Calculate detailed scores for each resume section"""
         section_scores = {}
+        section_matches = match_results.get("section_matches", {})
         
         # Summary section
+        summary_points = compiled.points("sections", "summary_relevance")
         section_scores["summary"] = {
-            "score": match_results.get("section_matches", {}).get("summary", 0.0) * 5,
-            "max_score": 5.0,
+            "score": section_matches.get("summary", 0.0) * summary_points,
+            "max_score": summary_points,
             "feedback": self._generate_summary_feedback(match_results),
             "keywords_found": self._get_keywords_in_section(match_results, "summary"),
             "keywords_missing": []
         }
         
         # Experience section
+        experience_points = compiled.points("sections", "experience_section")
         section_scores["experience"] = {
-            "score": match_results.get("section_matches", {}).get("experience", 0.0) * 15,
-            "max_score": 15.0,
+            "score": section_matches.get("experience", 0.0) * experience_points,
+            "max_score": experience_points,
             "feedback": self._generate_experience_feedback(match_results),
             "keywords_found": self._get_keywords_in_section(match_results, "experience"),
             "keywords_missing": []
@@ -181,26 +122,29 @@ class ScoringSystemAgent:
         
         # Education section
         education_match = match_results.get("education_match", {})
+        level_points = compiled.points("sections", "education_level")
+        field_points = compiled.points("sections", "education_field")
         education_score = 0.0
         
         if education_match.get("level_match", False):
-            education_score += 2.5
+            education_score += level_points
         
         if education_match.get("field_match", False):
-            education_score += 2.5
+            education_score += field_points
         
         section_scores["education"] = {
             "score": education_score,
-            "max_score": 5.0,
+            "max_score": level_points + field_points,
             "feedback": self._generate_education_feedback(match_results),
             "keywords_found": self._get_keywords_in_section(match_results, "education"),
             "keywords_missing": []
         }
         
         # Skills section
+        skills_points = compiled.points("sections", "skills_section")
         section_scores["skills"] = {
-            "score": match_results.get("section_matches", {}).get("skills", 0.0) * 10,
-            "max_score": 10.0,
+            "score": section_matches.get("skills", 0.0) * skills_points,
+            "max_score": skills_points,
             "feedback": self._generate_skills_feedback(match_results),
             "keywords_found": [skill for skill in match_results.get("skill_matches", {}).get("matched", [])],
             "keywords_missing": [skill for skill in match_results.get("skill_matches", {}).get("missing", [])]
@@ -0,0 +1,276 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Feature vector layout shared by every profile; all features are in [0, 1]
+FEATURES = [
+    "keyword_coverage",       # importance-weighted share of job keywords found
+    "keyword_found_ratio",    # unweighted share of job keywords found
+    "skill_coverage",         # share of job skills matched
+    "years_match",
+    "level_match",
+    "experience_relevance",
+    "format_structure",
+    "format_organization",
+    "format_readability",
+    "summary_relevance",
+    "experience_section",
+    "education_section",
+    "skills_section",
+    "education_level",
+    "education_field"
+]
+FEATURE_INDEX = {name: index for index, name in enumerate(FEATURES)}
+
+# Score groups; the first three sum to the ATS score, "match" is the matching agent's 0-100 overall match
+GROUPS = ["content", "format", "sections", "match"]
+GROUP_MAXIMUMS = {"content": 40.0, "format": 25.0, "sections": 35.0, "match": 100.0}
+
+# Format features used until a resume carries measured format signals
+DEFAULT_FORMAT_FEATURES = {
+    "format_structure": 0.8,
+    "format_organization": 0.8,
+    "format_readability": 0.7
+}
+
+# Sections an ATS expects to find as headed blocks
+CORE_SECTIONS = frozenset(["summary", "experience", "education", "skills"])
+
+# Profiles declare points per feature within each group
+SCORING_PROFILES: Dict[str, Dict[str, Dict[str, float]]] = {
+    "default": {
+        "content": {"keyword_coverage": 20, "skill_coverage": 10, "years_match": 3, "level_match": 3, "experience_relevance": 4},
+        "format": {"format_structure": 10, "format_organization": 5, "format_readability": 10},
+        "sections": {"summary_relevance": 5, "experience_section": 15, "education_level": 2.5, "education_field": 2.5, "skills_section": 10},
+        "match": {
+            "keyword_found_ratio": 30, "skill_coverage": 30,
+            "years_match": 20 / 3, "level_match": 20 / 3, "experience_relevance": 20 / 3,
+            "education_level": 5, "education_field": 5,
+            "summary_relevance": 2.5, "experience_section": 2.5, "education_section": 2.5, "skills_section": 2.5
+        }
+    },
+    "technical": {
+        "content": {"keyword_coverage": 15, "skill_coverage": 17, "years_match": 3, "level_match": 2, "experience_relevance": 3},
+        "format": {"format_structure": 10, "format_organization": 5, "format_readability": 10},
+        "sections": {"summary_relevance": 3, "experience_section": 15, "education_level": 2, "education_field": 3, "skills_section": 12},
+        "match": {
+            "keyword_found_ratio": 25, "skill_coverage": 40,
+            "years_match": 6, "level_match": 4, "experience_relevance": 10,
+            "education_level": 3, "education_field": 2,
+            "summary_relevance": 2.5, "experience_section": 2.5, "education_section": 2.5, "skills_section": 2.5
+        }
+    },
+    "executive": {
+        "content": {"keyword_coverage": 15, "skill_coverage": 5, "years_match": 6, "level_match": 8, "experience_relevance": 6},
+        "format": {"format_structure": 10, "format_organization": 7, "format_readability": 8},
+        "sections": {"summary_relevance": 10, "experience_section": 17, "education_level": 3, "education_field": 1, "skills_section": 4},
+        "match": {
+            "keyword_found_ratio": 25, "skill_coverage": 15,
+            "years_match": 15, "level_match": 20, "experience_relevance": 10,
+            "education_level": 4, "education_field": 1,
+            "summary_relevance": 5, "experience_section": 5
+        }
+    }
+}
+
+class CompiledProfile:
+    """A scoring profile flattened into a (groups x features) weight matrix"""
+
+    def __init__(self, name: str, definition: Dict[str, Dict[str, float]]):
+        self.name = name
+        self.definition = definition
+        self.weights = np.zeros((len(GROUPS), len(FEATURES)), dtype=np.float64)
+
+        for group_index, group in enumerate(GROUPS):
+            for feature, points in definition.get(group, {}).items():
+                if feature not in FEATURE_INDEX:
+                    raise ValueError(f"Unknown feature '{feature}' in scoring profile '{name}'")
+                self.weights[group_index, FEATURE_INDEX[feature]] = points
+
+            # Every feature is at most 1, so the row sum is the group's maximum
+            total = self.weights[group_index].sum()
+            if total > GROUP_MAXIMUMS[group] + 1e-9:
+                raise ValueError(f"Scoring profile '{name}' allots {total} points to '{group}' (max {GROUP_MAXIMUMS[group]})")
+
+    def points(self, group: str, feature: str) -> float:
+        """Points a feature can earn within a group"""
+        return float(self.weights[GROUPS.index(group), FEATURE_INDEX[feature]])
+
+    def score(self, features: np.ndarray) -> Dict[str, float]:
+        """Score one feature vector: a single matrix-vector product"""
+        scores = self.weights @ features
+        return {group: float(scores[index]) for index, group in enumerate(GROUPS)}
+
+_compiled: Dict[str, CompiledProfile] = {}
+_compile_lock = threading.Lock()
+_file_profiles_loaded = False
+
+def register_profile(name: str, definition: Dict[str, Dict[str, float]]) -> CompiledProfile:
+    """
+    Register (or replace) a scoring profile, e.g. for a tenant or job family
+
+    Args:
+        name: The profile name
+        definition: Points per feature, grouped by score group
+
+    Returns:
+        CompiledProfile: The compiled profile
+    """
+    compiled = CompiledProfile(name, definition)
+    with _compile_lock:
+        SCORING_PROFILES[name] = definition
+        _compiled[name] = compiled
+    return compiled
+
+def get_profile(name: Optional[str] = None) -> CompiledProfile:
+    """
+    Return a compiled profile, compiling it on first use
+
+    Args:
+        name: The profile name (defaults to settings.SCORING_PROFILE)
+
+    Returns:
+        CompiledProfile: The compiled profile
+    """
+    _load_profiles_file()
+    name = name or settings.SCORING_PROFILE
+
+    compiled = _compiled.get(name)
+    if compiled is None:
+        if name not in SCORING_PROFILES:
+            raise ValueError(f"Unknown scoring profile: {name}")
+        with _compile_lock:
+            compiled = _compiled.get(name) or CompiledProfile(name, SCORING_PROFILES[name])
+            _compiled[name] = compiled
+    return compiled
+
+def extract_features(match_results: Dict[str, Any]) -> np.ndarray:
+    """
+    Flatten matching results into the shared feature vector
+
+    Args:
+        match_results: The results from the matching algorithm
+
+    Returns:
+        np.ndarray: Feature values in FEATURES order
+    """
+    features = np.zeros(len(FEATURES), dtype=np.float64)
+
+    keyword_matches = match_results.get("keyword_matches", {})
+    if keyword_matches:
+        total_importance = sum(match["importance"] for match in keyword_matches.values())
+        matched_importance = sum(match["importance"] for match in keyword_matches.values() if match["found"])
+        features[FEATURE_INDEX["keyword_coverage"]] = (matched_importance / total_importance) if total_importance > 0 else 0
+        features[FEATURE_INDEX["keyword_found_ratio"]] = sum(1 for match in keyword_matches.values() if match["found"]) / len(keyword_matches)
+
+    skill_matches = match_results.get("skill_matches", {})
+    matched = len(skill_matches.get("matched", []))
+    total = matched + len(skill_matches.get("missing", []))
+    features[FEATURE_INDEX["skill_coverage"]] = (matched / total) if total > 0 else 0
+
+    experience_match = match_results.get("experience_match", {})
+    features[FEATURE_INDEX["years_match"]] = 1.0 if experience_match.get("years_match", False) else 0.0
+    features[FEATURE_INDEX["level_match"]] = 1.0 if experience_match.get("level_match", False) else 0.0
+    features[FEATURE_INDEX["experience_relevance"]] = experience_match.get("relevance_score", 0.0)
+
+    format_scores = format_feature_scores(match_results.get("format_features"))
+    for feature, value in format_scores.items():
+        features[FEATURE_INDEX[feature]] = value
+
+    section_matches = match_results.get("section_matches", {})
+    features[FEATURE_INDEX["summary_relevance"]] = section_matches.get("summary", 0.0)
+    features[FEATURE_INDEX["experience_section"]] = section_matches.get("experience", 0.0)
+    features[FEATURE_INDEX["education_section"]] = section_matches.get("education", 0.0)
+    features[FEATURE_INDEX["skills_section"]] = section_matches.get("skills", 0.0)
+
+    education_match = match_results.get("education_match", {})
+    features[FEATURE_INDEX["education_level"]] = 1.0 if education_match.get("level_match", False) else 0.0
+    features[FEATURE_INDEX["education_field"]] = 1.0 if education_match.get("field_match", False) else 0.0
+
+    return features
+
+def format_feature_scores(format_features: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Turn the parser's format feature record into 0-1 format scores
+
+    - Structure clarity: single column, detected section headers, no tables
+    - Standard section organization: share of core sections found as headers
+    - Machine readability: text layer present, no images, few fonts, simple layout
+
+    Args:
+        format_features: The record stored on the parsed resume, if any
+
+    Returns:
+        Dict[str, float]: Values for the format_* features
+    """
+    if not format_features:
+        return dict(DEFAULT_FORMAT_FEATURES)
+
+    if not format_features.get("has_text_layer", True):
+        # Scanned documents are unreadable to an ATS regardless of layout
+        return {"format_structure": 0.0, "format_organization": 0.0, "format_readability": 0.0}
+
+    columns = format_features.get("column_count", 1)
+    tables = format_features.get("table_count", 0)
+    images = format_features.get("image_count", 0)
+    fonts = format_features.get("font_count", 0)
+    sections = set(format_features.get("sections_detected", []))
+
+    structure = 0.4 if columns <= 1 else 0.1
+    structure += 0.4 * min(len(sections) / 4, 1.0)
+    structure += 0.2 if tables == 0 else 0.0
+
+    organization = len(sections & CORE_SECTIONS) / len(CORE_SECTIONS)
+
+    readability = 1.0
+    readability -= 0.2 if images else 0.0
+    readability -= 0.2 if tables else 0.0
+    readability -= 0.2 if columns > 1 else 0.0
+    readability -= min(max(fonts - 3, 0) * 0.1, 0.3)
+
+    return {
+        "format_structure": structure,
+        "format_organization": organization,
+        "format_readability": max(readability, 0.0)
+    }
+
+def score_batch(feature_matrix: np.ndarray, profile_names: List[str]) -> np.ndarray:
+    """
+    Score many feature vectors under many profiles at once
+
+    Args:
+        feature_matrix: (n_items, n_features) matrix from extract_features
+        profile_names: The profiles to score with
+
+    Returns:
+        np.ndarray: (n_profiles, n_items, n_groups) scores
+    """
+    stacked = np.stack([get_profile(name).weights for name in profile_names])
+    return np.einsum("pgf,nf->png", stacked, feature_matrix)
+
+def _load_profiles_file():
+    """Load additional profiles from settings.SCORING_PROFILES_FILE once"""
+    global _file_profiles_loaded
+    if _file_profiles_loaded:
+        return
+    _file_profiles_loaded = True
+
+    path = settings.SCORING_PROFILES_FILE
+    if not path or not os.path.exists(path):
+        return
+
+    try:
+        with open(path, "r") as f:
+            for name, definition in json.load(f).items():
+                register_profile(name, definition)
+        logger.info(f"Loaded scoring profiles from {path}")
+    except Exception as e:
+        logger.error(f"Error loading scoring profiles from {path}: {str(e)}")
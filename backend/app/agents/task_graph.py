@@ -0,0 +1,162 @@
+import time
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from crewai import Task
+
+logger = logging.getLogger(__name__)
+
+class TaskGraph:
+    """
+    Dependency graph of crew tasks, built from each task's context
+    
+    A task depends on the tasks listed in its context. run() starts every
+    task as soon as its dependencies have finished, so independent branches
+    (for example job analysis and resume keyword analysis) run concurrently
+    and a flow takes as long as its critical path rather than the sum of its
+    stages. crewai's Task.execute() reads the outputs of its context tasks
+    itself, so each node only has to run after its dependencies.
+    """
+    
+    def __init__(self, tasks: Dict[str, "Task"]):
+        """
+        Args:
+            tasks: Tasks keyed by node name, in the order a sequential crew would run them
+        
+        Raises:
+            ValueError: If a task depends on a task outside the graph or the dependencies form a cycle
+        """
+        self.tasks = tasks
+        names = {id(task): name for name, task in tasks.items()}
+        
+        self.dependencies: Dict[str, List[str]] = {}
+        for name, task in tasks.items():
+            dependencies = []
+            for context_task in task.context or []:
+                if id(context_task) not in names:
+                    raise ValueError(f"Task '{name}' depends on a task outside the graph")
+                dependencies.append(names[id(context_task)])
+            self.dependencies[name] = dependencies
+        
+        self.order = self._topological_order()
+    
+    async def run(self, execute: Callable[[str, "Task"], Awaitable[Any]]) -> "TaskGraphRun":
+        """
+        Run every task once its dependencies have finished
+        
+        Args:
+            execute: Runs one task, e.g. on the crew runner's thread pool
+        
+        Returns:
+            TaskGraphRun: Task outputs and timings
+        """
+        graph_run = TaskGraphRun(self)
+        done: Dict[str, asyncio.Future] = {}
+        
+        async def run_node(name: str):
+            if self.dependencies[name]:
+                await asyncio.gather(*(done[dependency] for dependency in self.dependencies[name]))
+            
+            started = time.perf_counter()
+            output = await execute(name, self.tasks[name])
+            graph_run.record(name, started, time.perf_counter(), output)
+        
+        # Nodes are created in topological order, so every dependency already has a future
+        for name in self.order:
+            done[name] = asyncio.ensure_future(run_node(name))
+        
+        try:
+            await asyncio.gather(*done.values())
+        except Exception:
+            # One failed task fails the flow; stop the branches still running
+            for future in done.values():
+                future.cancel()
+            raise
+        
+        graph_run.finish()
+        return graph_run
+    
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        remaining = {name: set(dependencies) for name, dependencies in self.dependencies.items()}
+        
+        while remaining:
+            ready = [name for name, dependencies in remaining.items() if not dependencies]
+            if not ready:
+                raise ValueError(f"Task dependencies form a cycle: {', '.join(remaining)}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for dependencies in remaining.values():
+                dependencies.difference_update(ready)
+        
+        return order
+
+class TaskGraphRun:
+    """Outputs and per-task timings of one task graph run"""
+    
+    def __init__(self, graph: TaskGraph):
+        self.graph = graph
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.outputs: Dict[str, Any] = {}
+        self.spans: Dict[str, Tuple[float, float]] = {}
+    
+    def record(self, name: str, started: float, finished: float, output: Any):
+        """Store a finished task's output and start/end times"""
+        self.outputs[name] = output
+        self.spans[name] = (started, finished)
+    
+    def finish(self):
+        """Mark the run as complete"""
+        self.finished = time.perf_counter()
+    
+    @property
+    def result(self) -> Any:
+        """Output of the last task, matching what a sequential crew's kickoff() returns"""
+        return self.outputs[list(self.graph.tasks)[-1]]
+    
+    def critical_path(self) -> List[str]:
+        """The chain of dependent tasks with the longest total duration"""
+        longest: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        
+        for name in self.graph.order:
+            duration = self.spans[name][1] - self.spans[name][0]
+            best = max(self.graph.dependencies[name], key=lambda dependency: longest[dependency], default=None)
+            longest[name] = duration + (longest[best] if best else 0.0)
+            previous[name] = best
+        
+        node = max(longest, key=longest.get)
+        path = []
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return list(reversed(path))
+    
+    def timings(self) -> Dict[str, Any]:
+        """
+        Summarize the run
+        
+        Returns:
+            Dict[str, Any]: Wall time, the sum of task durations (the sequential
+            equivalent), the critical path and its duration, and per-task spans
+        """
+        durations = {name: finished - started for name, (started, finished) in self.spans.items()}
+        path = self.critical_path()
+        return {
+            "total_seconds": round((self.finished or time.perf_counter()) - self.started, 3),
+            "sequential_seconds": round(sum(durations.values()), 3),
+            "critical_path": path,
+            "critical_path_seconds": round(sum(durations[name] for name in path), 3),
+            "tasks": {
+                name: {
+                    "depends_on": self.graph.dependencies[name],
+                    "start_seconds": round(self.spans[name][0] - self.started, 3),
+                    "duration_seconds": round(durations[name], 3)
+                }
+                for name in self.graph.order
+            }
+        }
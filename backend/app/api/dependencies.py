@@ -0,0 +1,79 @@
+from fastapi import Depends, FastAPI, Request
+import logging
+
+from app.services.resume_processor import ResumeProcessor
+from app.services.job_processor import JobProcessor
+from app.services.score_calculator import ScoreCalculator
+from app.services.recommendation_engine import RecommendationEngine
+from app.services.resume_generator import ResumeGenerator
+from app.services.job_ingestion import JobIngestionPipeline
+from app.services.hybrid_pipeline import HybridPipeline
+from app.services.analysis_pipeline import AnalysisPipeline
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class Services:
+    """
+    Service instances shared by every request for the lifetime of the app
+    
+    Services and agents hold no per-request state, so one of each is built at
+    startup and wired together: the score calculator and recommendation engine
+    share the job processor (and its agent) instead of building their own.
+    """
+    
+    def __init__(self):
+        # In hybrid mode uploads and job descriptions escalate low-confidence fields to the LLM
+        self.hybrid_pipeline = HybridPipeline() if settings.HYBRID_MODE else None
+        self.resume_processor = ResumeProcessor(hybrid_pipeline=self.hybrid_pipeline)
+        self.job_processor = JobProcessor(hybrid_pipeline=self.hybrid_pipeline)
+        self.score_calculator = ScoreCalculator(job_processor=self.job_processor)
+        self.recommendation_engine = RecommendationEngine(
+            job_processor=self.job_processor,
+            score_calculator=self.score_calculator
+        )
+        self.analysis_pipeline = AnalysisPipeline(
+            resume_processor=self.resume_processor,
+            job_processor=self.job_processor,
+            score_calculator=self.score_calculator,
+            recommendation_engine=self.recommendation_engine
+        )
+        self.resume_generator = ResumeGenerator()
+        self.ingestion_pipeline = JobIngestionPipeline()
+
+def init_services(app: FastAPI) -> Services:
+    """Create the shared services and attach them to the app state"""
+    app.state.services = Services()
+    logger.info("Initialized application services")
+    return app.state.services
+
+def get_services(request: Request) -> Services:
+    """Dependency returning the app's shared services"""
+    services = getattr(request.app.state, "services", None)
+    
+    # Apps run without startup events (e.g. some test clients) build them on first use
+    if services is None:
+        services = init_services(request.app)
+    
+    return services
+
+def get_resume_processor(services: Services = Depends(get_services)) -> ResumeProcessor:
+    return services.resume_processor
+
+def get_job_processor(services: Services = Depends(get_services)) -> JobProcessor:
+    return services.job_processor
+
+def get_score_calculator(services: Services = Depends(get_services)) -> ScoreCalculator:
+    return services.score_calculator
+
+def get_recommendation_engine(services: Services = Depends(get_services)) -> RecommendationEngine:
+    return services.recommendation_engine
+
+def get_analysis_pipeline(services: Services = Depends(get_services)) -> AnalysisPipeline:
+    return services.analysis_pipeline
+
+def get_resume_generator(services: Services = Depends(get_services)) -> ResumeGenerator:
+    return services.resume_generator
+
+def get_ingestion_pipeline(services: Services = Depends(get_services)) -> JobIngestionPipeline:
+    return services.ingestion_pipeline
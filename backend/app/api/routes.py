@@ -1,5 +1,7 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks, Depends
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Optional, Dict, Any
+import io
 import logging
 
 from app.services.resume_processor import ResumeProcessor
@@ -7,12 +9,24 @@ from app.services.job_processor import JobProcessor
 from app.services.score_calculator import ScoreCalculator
 from app.services.recommendation_engine import RecommendationEngine
 from app.services.resume_generator import ResumeGenerator
-from app.schemas.requests import JobDescriptionRequest, ResumeBuilderRequest
+from app.services.job_ingestion import JobIngestionPipeline, detect_format
+from app.services.analysis_pipeline import AnalysisPipeline, format_sse
+from app.api.dependencies import (
+    get_resume_processor,
+    get_job_processor,
+    get_score_calculator,
+    get_recommendation_engine,
+    get_analysis_pipeline,
+    get_resume_generator,
+    get_ingestion_pipeline
+)
+from app.schemas.requests import JobDescriptionRequest, ResumeBuilderRequest, ResumePatchRequest
 from app.schemas.responses import (
     ResumeAnalysisResponse, 
     ScoringResponse, 
     RecommendationResponse,
-    ResumeGenerationResponse
+    ResumeGenerationResponse,
+    RescoreResponse
 )
 
 # Import settings routes
@@ -28,15 +42,13 @@ router.include_router(settings_router, prefix="/settings", tags=["settings"])
 @router.post("/analyze-resume", response_model=ResumeAnalysisResponse)
 async def analyze_resume(
     file: UploadFile = File(...),
-    background_tasks: BackgroundTasks = None
+    background_tasks: BackgroundTasks = None,
+    resume_processor: ResumeProcessor = Depends(get_resume_processor)
 ):
     """
     Upload and analyze a resume file
     """
     try:
-        # Initialize resume processor service
-        resume_processor = ResumeProcessor()
-        
         # Process the resume
         result = await resume_processor.process(file)
         
@@ -47,15 +59,13 @@ async def analyze_resume(
 
 @router.post("/process-job-description", response_model=Dict[str, Any])
 async def process_job_description(
-    job_data: JobDescriptionRequest
+    job_data: JobDescriptionRequest,
+    job_processor: JobProcessor = Depends(get_job_processor)
 ):
     """
     Process a job description
     """
     try:
-        # Initialize job processor service
-        job_processor = JobProcessor()
-        
         # Process the job description
         result = await job_processor.process(job_data.description)
         
@@ -64,22 +74,114 @@ async def process_job_description(
         logger.error(f"Error processing job description: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing job description: {str(e)}")
 
+@router.post("/jobs/bulk", response_model=Dict[str, Any])
+async def bulk_ingest_jobs(
+    file: UploadFile = File(...),
+    format: Optional[str] = Form(None),
+    pipeline: JobIngestionPipeline = Depends(get_ingestion_pipeline)
+):
+    """
+    Bulk-ingest job descriptions from a JSONL, JSON array or CSV upload
+    """
+    try:
+        # Stream the upload through the pipeline
+        report = await pipeline.run(file.file, format or detect_format(file.filename))
+        
+        return report
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error ingesting jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error ingesting jobs: {str(e)}")
+
+@router.get("/jobs")
+async def list_jobs(
+    title: Optional[str] = None,
+    company: Optional[str] = None,
+    skill: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    job_processor: JobProcessor = Depends(get_job_processor)
+):
+    """
+    List processed job descriptions, optionally filtered by title, company or skill
+    """
+    try:
+        # Query the job repository
+        jobs = await job_processor.list_jobs(title, company, skill, limit, offset)
+        
+        return {"jobs": jobs, "limit": limit, "offset": offset}
+    except Exception as e:
+        logger.error(f"Error listing jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error listing jobs: {str(e)}")
+
+@router.get("/jobs/cache-stats")
+async def get_job_cache_stats(job_processor: JobProcessor = Depends(get_job_processor)):
+    """
+    Report how often job descriptions were served from the cache instead of reprocessed
+    """
+    try:
+        return job_processor.cache_stats()
+    except Exception as e:
+        logger.error(f"Error retrieving job cache stats: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving job cache stats: {str(e)}")
+
+@router.delete("/jobs/{job_id}")
+async def delete_job(job_id: str, job_processor: JobProcessor = Depends(get_job_processor)):
+    """
+    Delete a processed job description
+    """
+    try:
+        # Delete the job and its index entry
+        if not await job_processor.delete_job(job_id):
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        
+        return {"status": "success", "job_id": job_id}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting job: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error deleting job: {str(e)}")
+
+@router.get("/resumes/{resume_id}/similar-jobs")
+async def get_similar_jobs(
+    resume_id: str,
+    limit: int = 10,
+    job_processor: JobProcessor = Depends(get_job_processor)
+):
+    """
+    Find the processed jobs most similar to an analyzed resume
+    """
+    try:
+        # Search the job index with the resume's document vector
+        matches = await job_processor.find_similar_jobs(resume_id, limit)
+        
+        return {"resume_id": resume_id, "matches": matches}
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error finding similar jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error finding similar jobs: {str(e)}")
+
 @router.post("/calculate-score", response_model=ScoringResponse)
 async def calculate_score(
     resume_id: str = Form(...),
-    job_id: str = Form(...)
+    job_id: str = Form(...),
+    profile: Optional[str] = Form(None),
+    score_calculator: ScoreCalculator = Depends(get_score_calculator)
 ):
     """
     Calculate ATS score by comparing resume and job description
     """
     try:
-        # Initialize score calculator service
-        score_calculator = ScoreCalculator()
-        
         # Calculate the score
-        result = await score_calculator.calculate(resume_id, job_id)
+        result = await score_calculator.calculate(resume_id, job_id, profile)
         
         return result
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error calculating score: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error calculating score: {str(e)}")
@@ -87,34 +189,61 @@ async def calculate_score(
 @router.post("/get-recommendations", response_model=RecommendationResponse)
 async def get_recommendations(
     resume_id: str = Form(...),
-    job_id: str = Form(...)
+    job_id: str = Form(...),
+    recommendation_engine: RecommendationEngine = Depends(get_recommendation_engine)
 ):
     """
     Get recommendations for improving resume ATS score
     """
     try:
-        # Initialize recommendation engine service
-        recommendation_engine = RecommendationEngine()
-        
         # Get recommendations
         result = await recommendation_engine.generate(resume_id, job_id)
         
         return result
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Error generating recommendations: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating recommendations: {str(e)}")
 
+@router.post("/analyze/stream")
+async def analyze_stream(
+    file: UploadFile = File(...),
+    job_description: Optional[str] = Form(None),
+    job_id: Optional[str] = Form(None),
+    pipeline: AnalysisPipeline = Depends(get_analysis_pipeline)
+):
+    """
+    Analyze a resume against a job, streaming each stage as a Server-Sent Event
+    
+    Events: parsed, keywords, match, score, recommendations, complete (or error)
+    """
+    if not job_description and not job_id:
+        raise HTTPException(status_code=400, detail="Provide a job_description or a job_id")
+    
+    # The upload is closed when this handler returns, so the stream reads from its own copy
+    upload = UploadFile(io.BytesIO(await file.read()), filename=file.filename, headers=file.headers)
+    
+    async def events() -> AsyncIterator[str]:
+        async for event, data in pipeline.run(upload, job_description, job_id):
+            yield format_sse(event, data)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Proxies must pass each event through as soon as it is written
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/build-resume", response_model=ResumeGenerationResponse)
 async def build_resume(
-    resume_data: ResumeBuilderRequest
+    resume_data: ResumeBuilderRequest,
+    resume_generator: ResumeGenerator = Depends(get_resume_generator)
 ):
     """
     Build a new ATS-optimized resume
     """
     try:
-        # Initialize resume generator service
-        resume_generator = ResumeGenerator()
-        
         # Generate the resume
         result = await resume_generator.generate(resume_data)
         
@@ -123,6 +252,28 @@ async def build_resume(
         logger.error(f"Error building resume: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error building resume: {str(e)}")
 
+@router.post("/build-resume/{resume_id}/rescore", response_model=RescoreResponse)
+async def rescore_resume(
+    resume_id: str,
+    patch: ResumePatchRequest,
+    resume_generator: ResumeGenerator = Depends(get_resume_generator)
+):
+    """
+    Rescore a generated resume after editing one or more sections
+    """
+    try:
+        # Rescore only the edited sections
+        result = await resume_generator.rescore(resume_id, patch.sections)
+        
+        return result
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Resume {resume_id} not found for rescoring")
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error rescoring resume: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error rescoring resume: {str(e)}")
+
 @router.get("/templates")
 async def get_templates():
     """
@@ -174,7 +325,11 @@ async def get_templates():
         raise HTTPException(status_code=500, detail=f"Error fetching templates: {str(e)}")
 
 @router.get("/download/resume/{resume_id}/{format}")
-async def download_resume(resume_id: str, format: str):
+async def download_resume(
+    resume_id: str,
+    format: str,
+    resume_generator: ResumeGenerator = Depends(get_resume_generator)
+):
     """
     Download a generated resume in the specified format
     """
@@ -183,9 +338,6 @@ async def download_resume(resume_id: str, format: str):
         if format not in ["pdf", "docx"]:
             raise HTTPException(status_code=400, detail="Invalid format. Supported formats: pdf, docx")
         
-        # Initialize resume generator service
-        resume_generator = ResumeGenerator()
-        
         # Get the resume file
         file_path, file_name = await resume_generator.get_resume_file(resume_id, format)
         
@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List, Optional
 import os
-import json
 from pydantic import BaseModel
 import logging
 
+from app.services.storage import file_storage
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -71,7 +72,7 @@ def get_settings_file_path(user_id: str) -> str:
     """Get the file path for a user's settings file"""
     # In a production app, this would likely be stored in a database
     # Here we'll just use a simple file-based approach for demonstration
-    os.makedirs("data/user_settings", exist_ok=True)
+    # (the directory is created by file_storage on first write)
     return f"data/user_settings/{user_id}_settings.json"
 
 @router.get("/")
@@ -83,7 +84,9 @@ async def get_settings():
         user_id = "default_user"
         settings_path = get_settings_file_path(user_id)
         
-        if not os.path.exists(settings_path):
+        settings = await file_storage.read_json(settings_path)
+        
+        if settings is None:
             # Return default settings if no settings file exists
             return {
                 "provider": "openai",
@@ -94,9 +97,6 @@ async def get_settings():
                 "api_key_set": False
             }
         
-        with open(settings_path, "r") as f:
-            settings = json.load(f)
-            
         # Do not return the actual API key for security
         api_key_set = bool(settings.get("api_key"))
         settings_response = {
@@ -126,20 +126,18 @@ async def save_settings(settings: LLMSettings):
         settings_path = get_settings_file_path(user_id)
         
         # If an API key is not provided but settings exist, keep the existing API key
-        if not settings.api_key and os.path.exists(settings_path):
+        if not settings.api_key:
             try:
-                with open(settings_path, "r") as f:
-                    existing_settings = json.load(f)
-                    if existing_settings.get("api_key") and settings.provider == existing_settings.get("provider"):
-                        settings.api_key = existing_settings.get("api_key")
+                existing_settings = await file_storage.read_json(settings_path, default={})
+                if existing_settings.get("api_key") and settings.provider == existing_settings.get("provider"):
+                    settings.api_key = existing_settings.get("api_key")
             except:
                 # If there's an error reading the file, just continue with no API key
                 pass
         
         settings_dict = settings.dict()
         
-        with open(settings_path, "w") as f:
-            json.dump(settings_dict, f)
+        await file_storage.write_json(settings_path, settings_dict)
         
         # Update environment variables for the current session
         if settings.api_key:
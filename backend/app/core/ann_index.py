@@ -0,0 +1,325 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class IVFIndex:
+    """
+    In-process approximate nearest-neighbour index (inverted file over k-means cells)
+
+    Vectors are expected to be L2-normalized, so inner product equals cosine
+    similarity. Until enough vectors are present to train the coarse quantizer,
+    searches are exact. Deletes are tombstones that are dropped on save.
+    """
+
+    def __init__(self, dim: int, n_lists: int = 64, n_probe: int = 8, train_threshold: Optional[int] = None):
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.train_threshold = train_threshold or max(n_lists * 8, 256)
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._size = 0
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._lists: List[List[int]] = []
+        self._list_arrays: Dict[int, np.ndarray] = {}
+        self._trained_size = 0
+        self._training = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    def add(self, item_id: str, vector: np.ndarray) -> None:
+        """Insert a vector, replacing any existing vector with the same ID"""
+        vector = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        with self._lock:
+            if item_id in self._rows:
+                self.remove(item_id)
+
+            self._ensure_capacity(self._size + 1)
+            row = self._size
+            self._vectors[row] = vector
+            self._alive[row] = True
+            self._ids.append(item_id)
+            self._rows[item_id] = row
+            self._size += 1
+
+            if self.trained:
+                cell = int(np.argmax(self._centroids @ vector))
+                self._assignments[row] = cell
+                self._lists[cell].append(row)
+                self._list_arrays.pop(cell, None)
+
+            # Train once big enough, and retrain whenever the index has doubled since
+            should_train = (
+                not self._training
+                and len(self._rows) >= self.train_threshold
+                and len(self._rows) >= 2 * self._trained_size
+            )
+
+        if should_train:
+            self.train()
+
+    def remove(self, item_id: str) -> bool:
+        """Delete a vector by ID; returns False if the ID is unknown"""
+        with self._lock:
+            row = self._rows.pop(item_id, None)
+            if row is None:
+                return False
+            self._alive[row] = False
+            self._ids[row] = None
+            return True
+
+    def get_vector(self, item_id: str) -> Optional[np.ndarray]:
+        """Return a copy of the stored vector for an ID"""
+        with self._lock:
+            row = self._rows.get(item_id)
+            return None if row is None else np.array(self._vectors[row])
+
+    def search(self, vector: np.ndarray, k: int = 10, n_probe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Approximate top-k search by inner product
+
+        Args:
+            vector: The query vector
+            k: Number of results
+            n_probe: Number of cells to scan (defaults to the index setting)
+
+        Returns:
+            List[Tuple[str, float]]: (id, similarity) pairs, best first
+        """
+        query = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        with self._lock:
+            if not self.trained:
+                return self._exact(query, k)
+
+            probe = min(n_probe or self.n_probe, self.n_lists)
+            cells = np.argpartition(-(self._centroids @ query), probe - 1)[:probe]
+            candidates = [self._list_array(int(cell)) for cell in cells]
+            rows = np.concatenate(candidates) if candidates else np.zeros(0, dtype=np.int64)
+            rows = rows[self._alive[rows]]
+            return self._top_k(rows, self._vectors[rows] @ query, k)
+
+    def exact_search(self, vector: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        """Brute-force top-k search, used as ground truth"""
+        query = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        with self._lock:
+            return self._exact(query, k)
+
+    def train(self, iterations: int = 10) -> None:
+        """
+        Fit the coarse quantizer with spherical k-means and rebuild the inverted lists
+
+        k-means runs on a snapshot of the live vectors without holding the lock,
+        so searches and inserts continue meanwhile; the centroids are swapped in
+        afterwards and every row, including ones added during training, is
+        reassigned.
+        """
+        with self._lock:
+            if self._training:
+                return
+            live_rows = np.flatnonzero(self._alive[:self._size])
+            if len(live_rows) < self.n_lists:
+                return
+            # Fancy indexing copies, so the snapshot is safe to read unlocked
+            data = self._vectors[live_rows]
+            self._training = True
+
+        try:
+            centroids = self._kmeans(data, iterations)
+            with self._lock:
+                self._centroids = centroids
+                self._assign_all()
+                self._trained_size = len(live_rows)
+        finally:
+            with self._lock:
+                self._training = False
+        logger.info(f"Trained IVF index with {self.n_lists} cells over {len(live_rows)} vectors")
+
+    def _kmeans(self, data: np.ndarray, iterations: int) -> np.ndarray:
+        """Spherical k-means over the rows of data; returns the centroids"""
+        rng = np.random.default_rng(0)
+        centroids = data[rng.choice(len(data), self.n_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            for cell in range(self.n_lists):
+                members = data[labels == cell]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[cell] = centroid / (np.linalg.norm(centroid) or 1.0)
+                else:
+                    # Re-seed empty cells from a random vector
+                    centroids[cell] = data[rng.integers(len(data))]
+
+        return centroids.astype(np.float32)
+
+    def save(self, directory: str) -> None:
+        """
+        Persist the index, dropping tombstoned rows
+
+        Vectors are written as a .npy file so they can be memory-mapped on load.
+        Each save writes a new generation of data files and then replaces
+        meta.json, which names them; that replace is the only commit point, so
+        a crash at any step leaves the previous generation loadable.
+        """
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            live_rows = np.flatnonzero(self._alive[:self._size])
+
+            meta_path = os.path.join(directory, "meta.json")
+            generation = 1
+            if os.path.exists(meta_path):
+                try:
+                    with open(meta_path, "r") as f:
+                        generation = json.load(f).get("generation", 0) + 1
+                except (OSError, ValueError):
+                    pass
+
+            vectors_file = f"vectors-{generation}.npy"
+            centroids_file = f"centroids-{generation}.npy" if self.trained else None
+            meta = {
+                "dim": self.dim,
+                "n_lists": self.n_lists,
+                "n_probe": self.n_probe,
+                "train_threshold": self.train_threshold,
+                "trained_size": self._trained_size,
+                "generation": generation,
+                "rows": len(live_rows),
+                "vectors": vectors_file,
+                "centroids": centroids_file,
+                "ids": [self._ids[row] for row in live_rows]
+            }
+
+            self._atomic_save(os.path.join(directory, vectors_file), self._vectors[live_rows])
+            if centroids_file:
+                self._atomic_save(os.path.join(directory, centroids_file), self._centroids)
+            tmp_meta = meta_path + ".tmp"
+            with open(tmp_meta, "w") as f:
+                json.dump(meta, f)
+            os.replace(tmp_meta, meta_path)
+
+            # Earlier generations are unreachable now
+            current = {vectors_file, centroids_file}
+            for name in os.listdir(directory):
+                if name.startswith(("vectors", "centroids")) and name.endswith(".npy") and name not in current:
+                    try:
+                        os.remove(os.path.join(directory, name))
+                    except OSError as e:
+                        logger.warning(f"Could not remove stale index file {name}: {str(e)}")
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "IVFIndex":
+        """
+        Load an index saved with save()
+
+        With mmap=True the vector file is memory-mapped read-only and only
+        copied into memory on the first write.
+
+        Raises:
+            ValueError: If the vector file does not match the ids in meta.json
+        """
+        with open(os.path.join(directory, "meta.json"), "r") as f:
+            meta = json.load(f)
+
+        # Indexes saved before generations used fixed file names
+        vectors_file = meta.get("vectors", "vectors.npy")
+        centroids_file = meta["centroids"] if "vectors" in meta else "centroids.npy"
+
+        vectors = np.load(os.path.join(directory, vectors_file), mmap_mode="r" if mmap else None)
+        ids = list(meta["ids"])
+        if vectors.ndim != 2 or vectors.shape[0] != len(ids) or vectors.shape[1] != meta["dim"] or meta.get("rows", len(ids)) != len(ids):
+            raise ValueError(
+                f"Index in {directory} is inconsistent: {vectors.shape[0]} vectors of "
+                f"dimension {vectors.shape[-1]} for {len(ids)} ids"
+            )
+
+        index = cls(meta["dim"], n_lists=meta["n_lists"], n_probe=meta["n_probe"], train_threshold=meta["train_threshold"])
+        index._vectors = vectors
+        index._size = len(ids)
+        index._ids = ids
+        index._rows = {item_id: row for row, item_id in enumerate(index._ids)}
+        index._alive = np.ones(index._size, dtype=bool)
+        index._trained_size = meta["trained_size"]
+
+        centroids_path = os.path.join(directory, centroids_file) if centroids_file else None
+        if centroids_path and os.path.exists(centroids_path):
+            index._centroids = np.load(centroids_path)
+            index._assign_all()
+
+        return index
+
+    def _exact(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        # Score the contiguous block, then drop tombstones, avoiding a gather copy
+        alive = self._alive[:self._size]
+        scores = self._vectors[:self._size] @ query
+        return self._top_k(np.flatnonzero(alive), scores[alive], k)
+
+    def _top_k(self, rows: np.ndarray, scores: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        if len(rows) == 0 or k <= 0:
+            return []
+        k = min(k, len(rows))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(self._ids[rows[i]], float(scores[i])) for i in best]
+
+    def _assign_all(self) -> None:
+        """Assign every stored row to its nearest centroid and rebuild the inverted lists"""
+        self._assignments = np.zeros(len(self._alive), dtype=np.int32)
+        self._lists = [[] for _ in range(self.n_lists)]
+        self._list_arrays = {}
+        if self._size:
+            labels = np.argmax(self._vectors[:self._size] @ self._centroids.T, axis=1).astype(np.int32)
+            self._assignments[:self._size] = labels
+            for row in np.flatnonzero(self._alive[:self._size]):
+                self._lists[labels[row]].append(int(row))
+
+    def _list_array(self, cell: int) -> np.ndarray:
+        array = self._list_arrays.get(cell)
+        if array is None:
+            array = np.array(self._lists[cell], dtype=np.int64)
+            self._list_arrays[cell] = array
+        return array
+
+    def _ensure_writable(self) -> None:
+        """Copy a memory-mapped vector file into memory before the first write"""
+        if isinstance(self._vectors, np.memmap) or not self._vectors.flags.writeable:
+            self._vectors = np.array(self._vectors, dtype=np.float32)
+
+    def _ensure_capacity(self, size: int) -> None:
+        self._ensure_writable()
+        capacity = self._vectors.shape[0]
+        if size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2, 64)
+        vectors = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        self._vectors = vectors
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:len(self._alive)] = self._alive
+        self._alive = alive
+        assignments = np.zeros(new_capacity, dtype=np.int32)
+        assignments[:len(self._assignments)] = self._assignments
+        self._assignments = assignments
+
+    def _atomic_save(self, path: str, array: np.ndarray) -> None:
+        tmp_path = path + ".tmp.npy"
+        np.save(tmp_path, np.ascontiguousarray(array))
+        os.replace(tmp_path, path)
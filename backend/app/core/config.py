@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -19,6 +19,65 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "uploads"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
     
+    # Storage settings
+    DATABASE_PATH: str = "data/resume_ats.db"
+    RESUME_CACHE_SIZE: int = 1000  # Parsed resumes kept in memory
+    JOB_CACHE_SIZE: int = 1000  # Processed jobs kept in memory
+    JOB_TEXT_CACHE_SIZE: int = 10000  # Description text hashes mapped to processed jobs in memory
+    JOB_DEDUP_ENABLED: bool = True  # Map near-duplicate job postings to the existing record
+    JOB_DEDUP_THRESHOLD: float = 0.8  # Minimum estimated Jaccard similarity of word 3-gram shingles
+    JOB_INGEST_WORKERS: int = 4  # Jobs in flight during bulk ingestion
+    JOB_INGEST_PROCESSES: int = 0  # Agent worker processes for bulk ingestion (0 = run on the event loop)
+    JOB_INGEST_BATCH_SIZE: int = 200  # Jobs saved per transaction
+    JOB_INGEST_QUEUE_SIZE: int = 1000  # Records read ahead before the reader waits
+    STORAGE_IO_WORKERS: Optional[int] = None  # File I/O threads (default: min(4, CPU count))
+    
+    # Resume builder settings
+    RESCORE_CACHE_SIZE: int = 1000  # Scoring states kept for incremental rescoring
+    
+    # LLM settings
+    LLM_PROVIDER: str = "openai"
+    LLM_MODEL: str = "gpt-4-turbo"
+    LLM_TEMPERATURE: float = 0.2
+    LLM_MAX_WORKERS: int = 8  # Threads running blocking crew kickoffs
+    LLM_CREW_TIMEOUT: float = 120.0  # Seconds a request waits for a crew
+    LLM_PROVIDER_CONCURRENCY: int = 4  # Crews in flight per LLM provider
+    LLM_CACHE_ENABLED: bool = True  # Cache LLM responses for repeated prompts
+    LLM_CACHE_MAX_TEMPERATURE: float = 0.3  # Models sampling above this are never cached
+    LLM_CACHE_SIZE: int = 1000  # Responses kept in memory
+    LLM_CACHE_TTL: float = 7 * 24 * 3600  # Seconds a cached response stays valid
+    LLM_POOL_IDLE_TIMEOUT: float = 900.0  # Seconds an unused pooled client is kept
+    LLM_POOL_MAX_SIZE: int = 16  # Distinct provider/model/key combinations pooled
+    LLM_OUTPUT_REPAIR_ATTEMPTS: int = 2  # Targeted re-prompts for fields failing schema validation
+    LLM_PROMPT_TOKEN_BUDGET: int = 3000  # Tokens of resume/job context per crew prompt
+    LLM_PROMPT_TOKEN_BUDGETS: Dict[str, int] = {"groq": 2000, "gemini": 6000}  # Per-provider overrides
+    
+    # Offline LLM settings (LLM_PROVIDER=local-fake), for benchmarks and load tests
+    LOCAL_FAKE_RESPONSES_FILE: Optional[str] = None  # JSON lines of recorded responses to replay
+    LOCAL_FAKE_LATENCY_DISTRIBUTION: str = "lognormal"  # fixed, uniform, normal or lognormal
+    LOCAL_FAKE_LATENCY_MS: float = 800.0  # Mean simulated response time
+    LOCAL_FAKE_LATENCY_JITTER_MS: float = 200.0  # Spread of the simulated response time
+    LOCAL_FAKE_SEED: Optional[int] = None  # Fixes the latency sequence for reproducible runs
+    
+    # Hybrid analysis settings
+    HYBRID_MODE: bool = False  # Rule-based agents first, LLM only for low-confidence fields
+    HYBRID_CONFIDENCE_THRESHOLD: float = 0.5  # Fields scoring below this are escalated
+    HYBRID_LLM_ESCALATION: bool = True  # Set False to report confidence without calling the LLM
+    HYBRID_EXCERPT_CHARS: int = 2000  # Longest document excerpt sent per escalated field
+    
+    # Streaming analysis settings
+    ANALYSIS_STREAM_HEARTBEAT: float = 15.0  # Seconds between keep-alives while a stage runs
+    
+    # Scoring settings
+    SCORING_PROFILE: str = "default"
+    SCORING_PROFILES_FILE: Optional[str] = None  # JSON file of extra profiles, e.g. per tenant
+    
+    # Vector index settings
+    VECTOR_INDEX_DIR: str = "data/index"
+    VECTOR_INDEX_LISTS: int = 64  # k-means cells in the IVF index
+    VECTOR_INDEX_PROBE: int = 8  # Cells scanned per query
+    VECTOR_INDEX_SAVE_EVERY: int = 100  # Inserts between automatic saves
+    
     # Logging settings
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -26,6 +85,7 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         case_sensitive = True
+        extra = "ignore"  # .env is shared with the Node services
 
 # Create settings instance
 settings = Settings()
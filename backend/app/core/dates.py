@@ -0,0 +1,183 @@
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Month ordinal = year * 12 + (month - 1); differences between ordinals are month counts.
+# Date ranges are half-open, [first month, month after the last), so end - start counts both ends
+
+MONTHS = {
+    "jan": 1, "january": 1,
+    "feb": 2, "february": 2,
+    "mar": 3, "march": 3,
+    "apr": 4, "april": 4,
+    "may": 5,
+    "jun": 6, "june": 6,
+    "jul": 7, "july": 7,
+    "aug": 8, "august": 8,
+    "sep": 9, "sept": 9, "september": 9,
+    "oct": 10, "october": 10,
+    "nov": 11, "november": 11,
+    "dec": 12, "december": 12
+}
+
+# Seasons map to their first month
+SEASONS = {"spring": 3, "summer": 6, "fall": 9, "autumn": 9, "winter": 12}
+
+PRESENT_TERMS = frozenset(["present", "current", "currently", "now", "today", "ongoing", "to date"])
+
+_MONTH_NAME_PATTERN = re.compile(r"^([a-z]+)\.?,?\s+'?(\d{4}|\d{2})$")
+_NUMERIC_PATTERN = re.compile(r"^(\d{1,2})\s*[/.\-]\s*(\d{4})$")
+_ISO_PATTERN = re.compile(r"^(\d{4})\s*[/.\-]\s*(\d{1,2})(?:\s*[/.\-]\s*\d{1,2})?(?:[t\s].*)?$")
+_YEAR_PATTERN = re.compile(r"^(\d{4})$")
+
+
+def month_ordinal(year: int, month: int) -> int:
+    """Convert a year and month into a month ordinal"""
+    return year * 12 + (month - 1)
+
+
+def current_month_ordinal() -> int:
+    """Month ordinal of today"""
+    today = date.today()
+    return month_ordinal(today.year, today.month)
+
+
+def parse_month_ordinal(value: Any) -> Optional[int]:
+    """
+    Normalize a resume date into a month ordinal
+
+    Accepts the strings the parser produces ("Jan 2020", "January 2020",
+    "01/2020", "2020-01-01", "2020", "Present") as well as date objects.
+
+    Args:
+        value: The raw date value
+
+    Returns:
+        Optional[int]: The month ordinal, or None if the value is not a date
+    """
+    if value is None:
+        return None
+    if isinstance(value, date):
+        return month_ordinal(value.year, value.month)
+
+    text = str(value).strip().lower()
+    if not text:
+        return None
+    if text in PRESENT_TERMS:
+        # Not memoized: "present" moves with the calendar
+        return current_month_ordinal()
+
+    return _parse_date_string(text)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_string(text: str) -> Optional[int]:
+    """Parse a lowercased, stripped date string (memoized, as resumes repeat few date strings)"""
+    match = _MONTH_NAME_PATTERN.match(text)
+    if match:
+        name, year = match.groups()
+        month = MONTHS.get(name) or SEASONS.get(name)
+        if month:
+            return month_ordinal(_expand_year(year), month)
+        return None
+
+    match = _ISO_PATTERN.match(text)
+    if match:
+        year, month = int(match.group(1)), int(match.group(2))
+        if 1 <= month <= 12:
+            return month_ordinal(year, month)
+        return None
+
+    match = _NUMERIC_PATTERN.match(text)
+    if match:
+        month, year = int(match.group(1)), int(match.group(2))
+        if 1 <= month <= 12:
+            return month_ordinal(year, month)
+        return None
+
+    match = _YEAR_PATTERN.match(text)
+    if match:
+        return month_ordinal(int(match.group(1)), 1)
+
+    return None
+
+
+def _expand_year(year: str) -> int:
+    """Expand two-digit years ('19 -> 2019, '98 -> 1998)"""
+    value = int(year)
+    if len(year) == 2:
+        return 2000 + value if value <= date.today().year % 100 else 1900 + value
+    return value
+
+
+def parse_date_range(start: Any, end: Any, current: bool = False) -> Optional[Tuple[int, int]]:
+    """
+    Normalize a start/end pair into a half-open month-ordinal interval
+
+    Both months are worked, so "Jan 2019" to "Dec 2019" is (Jan 2019, Jan 2020)
+    and spans 12 months, and a role that starts and ends in the same month
+    spans one. An end given as a bare year runs through its December, so
+    "2018" to "2020" spans 36 months.
+
+    Args:
+        start: The raw start date
+        end: The raw end date (missing or "Present" means ongoing)
+        current: Whether the entry is flagged as current
+
+    Returns:
+        Optional[Tuple[int, int]]: (start, end + 1) ordinals, or None if the start is unparseable
+    """
+    start_ordinal = parse_month_ordinal(start)
+    if start_ordinal is None:
+        return None
+
+    end_ordinal = current_month_ordinal() if current or not end else parse_month_ordinal(end)
+    if end_ordinal is not None and not current and _YEAR_PATTERN.match(str(end).strip()):
+        end_ordinal += 11
+    if end_ordinal is None or end_ordinal < start_ordinal:
+        return None
+
+    return start_ordinal, end_ordinal + 1
+
+
+def merge_intervals(intervals: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Merge overlapping or touching month intervals in O(n log n)
+
+    Intervals are half-open, so back-to-back roles (Jan-Jun and Jul-Dec)
+    touch and merge into one.
+
+    Args:
+        intervals: Half-open (start, end) month ordinals; the span covers end - start months
+
+    Returns:
+        List[Tuple[int, int]]: Disjoint intervals sorted by start
+    """
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def total_experience_months(entries: Iterable[Dict[str, Any]]) -> int:
+    """
+    Total months of employment across experience entries, counting overlaps once
+
+    Args:
+        entries: Experience items with start_date, end_date and optional current flag
+
+    Returns:
+        int: Number of distinct months covered
+    """
+    intervals = []
+    for entry in entries:
+        interval = parse_date_range(entry.get("start_date"), entry.get("end_date"), entry.get("current", False))
+        if interval:
+            intervals.append(interval)
+
+    return sum(end - start for start, end in merge_intervals(intervals))
@@ -0,0 +1,107 @@
+import hashlib
+import re
+import threading
+import zlib
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+_WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+
+class HashingEmbedder:
+    """
+    Local, CPU-only text embedder based on hashed n-gram features
+
+    Texts are mapped to L2-normalized vectors of word unigrams, word bigrams and
+    character 4-grams using the signed hashing trick, so no model download is
+    needed. Vectors are cached per content hash in one flat matrix, which keeps
+    batch cosine similarity a single matrix multiplication.
+    """
+
+    def __init__(self, dim: int = 512, max_rows: int = 50000):
+        self.dim = dim
+        self.max_rows = max_rows
+        self._matrix = np.zeros((min(1024, max_rows), dim), dtype=np.float32)
+        self._rows: Dict[str, int] = {}
+        self._row_keys: List[str] = []
+        self._next_row = 0
+        self._lock = threading.Lock()
+
+    def embed(self, text: str) -> np.ndarray:
+        """Return the normalized vector for a single text"""
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Return normalized vectors for several texts
+
+        Args:
+            texts: The texts to embed
+
+        Returns:
+            np.ndarray: A (len(texts), dim) float32 matrix
+        """
+        with self._lock:
+            rows = [self._row_for(text) for text in texts]
+            return self._matrix[rows].copy() if rows else np.zeros((0, self.dim), dtype=np.float32)
+
+    def similarity(self, texts_a: Sequence[str], texts_b: Sequence[str]) -> np.ndarray:
+        """
+        Cosine similarity between every text in texts_a and every text in texts_b
+
+        Returns:
+            np.ndarray: A (len(texts_a), len(texts_b)) matrix
+        """
+        return self.embed_many(texts_a) @ self.embed_many(texts_b).T
+
+    def _row_for(self, text: str) -> int:
+        """Return the cache row holding the vector for text, computing it on a miss"""
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        row = self._rows.get(key)
+        if row is not None:
+            return row
+
+        if self._next_row >= self._matrix.shape[0] and self._matrix.shape[0] < self.max_rows:
+            # Grow the matrix geometrically up to max_rows
+            grown = np.zeros((min(self._matrix.shape[0] * 2, self.max_rows), self.dim), dtype=np.float32)
+            grown[:self._matrix.shape[0]] = self._matrix
+            self._matrix = grown
+
+        # Once full, rows are reused in insertion order
+        row = self._next_row % self.max_rows
+        if row < len(self._row_keys):
+            del self._rows[self._row_keys[row]]
+            self._row_keys[row] = key
+        else:
+            self._row_keys.append(key)
+
+        self._matrix[row] = self._vectorize(text)
+        self._rows[key] = row
+        self._next_row += 1
+        return row
+
+    def _vectorize(self, text: str) -> np.ndarray:
+        """Compute the hashed n-gram vector for text"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        words = _WORD_PATTERN.findall(text.lower())
+
+        features = list(words)
+        features.extend(f"{first} {second}" for first, second in zip(words, words[1:]))
+        for word in words:
+            padded = f"<{word}>"
+            features.extend(padded[i:i + 4] for i in range(len(padded) - 3))
+
+        for feature in features:
+            hashed = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if hashed & 0x80000000 else -1.0
+            vector[hashed % self.dim] += sign
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+
+# Shared embedder so the vector cache survives across per-request agent instances
+default_embedder = HashingEmbedder()
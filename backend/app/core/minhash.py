@@ -0,0 +1,141 @@
+import re
+import threading
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Mersenne prime for the universal hash family; products of two values below it fit in uint64
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles
+
+    A signature is num_perm minimum hash values; the share of positions on
+    which two signatures agree estimates the Jaccard similarity of the
+    texts' shingle sets. Hashes are seeded, so signatures are stable across
+    processes and can be persisted.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> Set[str]:
+        """Overlapping word n-grams of the normalized text"""
+        words = _WORD_PATTERN.findall(text.lower())
+        if len(words) < self.shingle_size:
+            return {" ".join(words)} if words else set()
+        return {" ".join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        Compute the MinHash signature of a text
+
+        Returns:
+            Optional[np.ndarray]: A (num_perm,) uint32 array, or None for text without words
+        """
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        hashes %= _PRIME
+        # (num_perm, n_shingles) universal hashes, reduced to the minimum per permutation
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+
+def estimate_jaccard(signature_a: np.ndarray, signature_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return float(np.mean(signature_a == signature_b))
+
+
+class MinHashLSH:
+    """
+    Locality-sensitive hashing index over MinHash signatures
+
+    Signatures are split into bands; documents sharing any band bucket become
+    candidates, which are then verified against the full signature. With b
+    bands of r rows, pairs with Jaccard s collide with probability
+    1 - (1 - s^r)^b, a steep S-curve around (1/b)^(1/r).
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: List[Dict[bytes, Set[str]]] = [defaultdict(set) for _ in range(bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._signatures
+
+    def add(self, item_id: str, signature: np.ndarray) -> None:
+        """Insert a signature, replacing any existing one for the ID"""
+        with self._lock:
+            if item_id in self._signatures:
+                self._remove(item_id)
+            self._signatures[item_id] = signature
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band][key].add(item_id)
+
+    def remove(self, item_id: str) -> bool:
+        """Delete a signature; returns False if the ID is unknown"""
+        with self._lock:
+            return self._remove(item_id)
+
+    def query(self, signature: np.ndarray, threshold: float) -> List[Tuple[str, float]]:
+        """
+        Find indexed items whose estimated Jaccard similarity reaches threshold
+
+        Args:
+            signature: The query signature
+            threshold: Minimum estimated Jaccard similarity
+
+        Returns:
+            List[Tuple[str, float]]: (id, similarity) pairs, most similar first
+        """
+        with self._lock:
+            candidates: Set[str] = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                bucket = self._buckets[band].get(key)
+                if bucket:
+                    candidates |= bucket
+
+            matches = []
+            for item_id in candidates:
+                similarity = estimate_jaccard(signature, self._signatures[item_id])
+                if similarity >= threshold:
+                    matches.append((item_id, similarity))
+
+        return sorted(matches, key=lambda match: match[1], reverse=True)
+
+    def _remove(self, item_id: str) -> bool:
+        signature = self._signatures.pop(item_id, None)
+        if signature is None:
+            return False
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del self._buckets[band][key]
+        return True
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
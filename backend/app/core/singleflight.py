@@ -0,0 +1,72 @@
+import json
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable SHA-256 of JSON-serializable call arguments, for keys over large inputs"""
+    encoded = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical async calls into one execution
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task and receive the same result (or
+    exception). The key is forgotten as soon as the task finishes, so this
+    never serves stale results - it only removes duplicate in-flight work.
+    Waiters are shielded: a cancelled caller does not cancel the shared task.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn() once per key at a time
+
+        Args:
+            key: Identifies the operation and its inputs
+            fn: Starts the work; only called by the first concurrent caller
+
+        Returns:
+            T: The shared result
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running"""
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return execution and coalescing counters"""
+        total = self.executions + self.coalesced
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+            "coalesced_rate": (self.coalesced / total) if total else 0.0
+        }
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieve the exception so an unawaited failure is not reported as never retrieved
+        if not task.cancelled():
+            task.exception()
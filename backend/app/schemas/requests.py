@@ -94,3 +94,7 @@ class ResumeBuilderRequest(BaseModel):
     template_id: Optional[str] = "modern"
     target_job_description: Optional[str] = None
     custom_sections: Dict[str, List[str]] = {}
+
+class ResumePatchRequest(BaseModel):
+    """Request model for incremental rescoring of an edited resume"""
+    sections: Dict[str, Any] = Field(..., description="Replacement values keyed by resume builder field name, e.g. {\"summary\": \"...\"}")
@@ -88,3 +88,121 @@ class ResumeGenerationResponse(BaseModel):
     target_job_match: Optional[float] = None
     download_links: Dict[str, str]
     status: str = "success"
+
+class RescoreResponse(BaseModel):
+    """Response model for incremental resume rescoring"""
+    resume_id: str
+    ats_score: float = Field(..., ge=0.0, le=100.0)
+    target_job_match: Optional[float] = None
+    section_scores: Dict[str, float]
+    changed_sections: List[str]
+    timestamp: datetime
+    status: str = "success"
+
+class CrewKeyword(BaseModel):
+    """Keyword reported by an LLM crew"""
+    keyword: str
+    category: Optional[str] = None
+    importance: float = Field(0.5, ge=0.0, le=1.0)
+
+class CrewResumeAnalysis(BaseModel):
+    """Structured output of the resume parsing crew"""
+    contact_info: Dict[str, str] = {}
+    summary: str = ""
+    experience: List[Dict[str, Any]] = []
+    education: List[Dict[str, Any]] = []
+    skills: List[str] = []
+    keywords: List[CrewKeyword] = []
+
+class CrewJobAnalysis(BaseModel):
+    """Structured output of the job description crew"""
+    title: str
+    company: str = ""
+    required_skills: List[str] = []
+    preferred_skills: List[str] = []
+    responsibilities: List[str] = []
+    experience_years: Optional[float] = Field(None, ge=0.0)
+    keywords: List[CrewKeyword] = []
+
+class CrewComparison(BaseModel):
+    """Structured output of the resume-to-job comparison crew"""
+    overall_score: float = Field(..., ge=0.0, le=100.0)
+    matched_keywords: List[str] = []
+    missing_keywords: List[str] = []
+    recommendations: List[RecommendationItem] = []
+
+class CrewResumeBuild(BaseModel):
+    """Structured output of the resume builder crew"""
+    sections: Dict[str, Any]
+    ats_score: float = Field(..., ge=0.0, le=100.0)
+    feedback: List[str] = []
+
+class HybridContactInfo(BaseModel):
+    """Contact details extracted by a hybrid pipeline escalation"""
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    linkedin: str = ""
+    github: str = ""
+
+class HybridSummary(BaseModel):
+    """Professional summary extracted by a hybrid pipeline escalation"""
+    summary: str
+
+class HybridExperienceEntry(BaseModel):
+    """Work experience entry in the resume parser's shape"""
+    company: str = ""
+    position: str = ""
+    start_date: str = ""
+    end_date: str = ""
+    description: List[str] = []
+
+class HybridExperience(BaseModel):
+    """Work experience extracted by a hybrid pipeline escalation"""
+    experience: List[HybridExperienceEntry]
+
+class HybridEducationEntry(BaseModel):
+    """Education entry in the resume parser's shape"""
+    institution: str = ""
+    degree: str = ""
+    field_of_study: str = ""
+    start_date: str = ""
+    end_date: str = ""
+
+class HybridEducation(BaseModel):
+    """Education extracted by a hybrid pipeline escalation"""
+    education: List[HybridEducationEntry]
+
+class HybridSkill(BaseModel):
+    """Skill in the resume parser's shape"""
+    name: str
+
+class HybridSkills(BaseModel):
+    """Skills extracted by a hybrid pipeline escalation"""
+    skills: List[HybridSkill]
+
+class HybridJobTitle(BaseModel):
+    """Job title extracted by a hybrid pipeline escalation"""
+    title: str
+
+class HybridJobCompany(BaseModel):
+    """Hiring company extracted by a hybrid pipeline escalation"""
+    company: str
+
+class HybridRequiredSkills(BaseModel):
+    """Required skills extracted by a hybrid pipeline escalation"""
+    required_skills: List[str]
+
+class HybridResponsibilities(BaseModel):
+    """Responsibilities extracted by a hybrid pipeline escalation"""
+    responsibilities: List[str]
+
+class HybridExperienceRequirement(BaseModel):
+    """Experience requirement in the job agent's shape"""
+    years: int = Field(0, ge=0)
+    level: str = ""
+    description: str = ""
+
+class HybridJobExperience(BaseModel):
+    """Experience requirement extracted by a hybrid pipeline escalation"""
+    experience: HybridExperienceRequirement
@@ -0,0 +1,154 @@
+import json
+import time
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional, Tuple
+
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.services.resume_processor import ResumeProcessor
+from app.services.job_processor import JobProcessor
+from app.services.score_calculator import ScoreCalculator
+from app.services.recommendation_engine import RecommendationEngine
+
+logger = logging.getLogger(__name__)
+
+# Job fields sent with the keywords event; the raw description and section index stay server-side
+JOB_SUMMARY_FIELDS = ["job_id", "title", "company", "location", "required_skills", "preferred_skills", "keywords", "experience"]
+
+def format_sse(event: str, data: Any = None) -> str:
+    """
+    Encode one Server-Sent Event
+    
+    Heartbeats are sent as comment lines, which clients ignore but which keep
+    proxies from closing an idle connection.
+    """
+    if event == "heartbeat":
+        return ": keep-alive\n\n"
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+class AnalysisPipeline:
+    """
+    Resume-to-job analysis as a stream of stage events
+    
+    Runs the same services as the individual endpoints: resume parsing and
+    job processing concurrently, then scoring, then recommendations (reusing
+    the score instead of recalculating it). Each stage's result is yielded
+    as soon as it is ready, so clients render partial results while later
+    stages run, and a heartbeat is yielded whenever a stage takes longer
+    than the heartbeat interval.
+    """
+    
+    def __init__(
+        self,
+        resume_processor: Optional[ResumeProcessor] = None,
+        job_processor: Optional[JobProcessor] = None,
+        score_calculator: Optional[ScoreCalculator] = None,
+        recommendation_engine: Optional[RecommendationEngine] = None,
+        heartbeat: Optional[float] = None
+    ):
+        self.resume_processor = resume_processor or ResumeProcessor()
+        self.job_processor = job_processor or JobProcessor()
+        self.score_calculator = score_calculator or ScoreCalculator(job_processor=self.job_processor)
+        self.recommendation_engine = recommendation_engine or RecommendationEngine(
+            job_processor=self.job_processor,
+            score_calculator=self.score_calculator
+        )
+        self.heartbeat = heartbeat or settings.ANALYSIS_STREAM_HEARTBEAT
+    
+    async def run(
+        self,
+        file: UploadFile,
+        job_description: Optional[str] = None,
+        job_id: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Analyze a resume against a job, yielding (event, data) pairs
+        
+        Events, in order of completion: parsed and keywords (concurrently),
+        match, score, recommendations, then complete. A failure yields an
+        error event with an HTTP-style status and ends the stream.
+        
+        Args:
+            file: The uploaded resume file
+            job_description: The job description text
+            job_id: The ID of an already processed job, used when no text is given
+        """
+        started = time.perf_counter()
+        
+        def elapsed() -> float:
+            return round(time.perf_counter() - started, 3)
+        
+        try:
+            # Step 1: parse the resume and process the job description concurrently
+            job_stage = (
+                self.job_processor.process(job_description) if job_description
+                else self.job_processor.get_job_by_id(job_id)
+            )
+            results: Dict[str, Any] = {}
+            async for event, result in self._stages({"parsed": self.resume_processor.process(file), "keywords": job_stage}):
+                if event == "heartbeat":
+                    yield event, None
+                    continue
+                results[event] = result
+                if event == "parsed":
+                    yield event, {**result.model_dump(mode="json"), "elapsed": elapsed()}
+                else:
+                    summary = {field: result.get(field) for field in JOB_SUMMARY_FIELDS}
+                    yield event, {**summary, "elapsed": elapsed()}
+            
+            resume_id = results["parsed"].resume_id
+            job_id = results["keywords"]["job_id"]
+            
+            # Step 2: score the resume; keyword matches are streamed before the full breakdown
+            async for event, score in self._stages({"score": self.score_calculator.calculate(resume_id, job_id)}):
+                if event == "heartbeat":
+                    yield event, None
+                    continue
+                score_data = score.model_dump(mode="json")
+                matched = [match["keyword"] for match in score_data["keyword_matches"] if match["found"]]
+                missing = [match["keyword"] for match in score_data["keyword_matches"] if not match["found"]]
+                yield "match", {
+                    "resume_id": resume_id,
+                    "job_id": job_id,
+                    "matched_keywords": matched,
+                    "missing_keywords": missing,
+                    "content_match_score": score_data["content_match_score"],
+                    "elapsed": elapsed()
+                }
+                yield "score", {**score_data, "elapsed": elapsed()}
+            
+            # Step 3: generate recommendations from the score just calculated
+            recommendations = self.recommendation_engine.generate(resume_id, job_id, score_response=score)
+            async for event, result in self._stages({"recommendations": recommendations}):
+                if event == "heartbeat":
+                    yield event, None
+                    continue
+                yield event, {**result.model_dump(mode="json"), "elapsed": elapsed()}
+            
+            yield "complete", {"resume_id": resume_id, "job_id": job_id, "elapsed": elapsed()}
+        
+        except FileNotFoundError as e:
+            yield "error", {"status_code": 404, "detail": str(e)}
+        except ValueError as e:
+            yield "error", {"status_code": 400, "detail": str(e)}
+        except Exception as e:
+            logger.error(f"Error in streaming analysis: {str(e)}")
+            yield "error", {"status_code": 500, "detail": f"Error analyzing resume: {str(e)}"}
+    
+    async def _stages(self, stages: Dict[str, Awaitable[Any]]) -> AsyncIterator[Tuple[str, Any]]:
+        """Run stages concurrently, yielding each result as it finishes and heartbeats while waiting"""
+        tasks = {asyncio.ensure_future(stage): name for name, stage in stages.items()}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=self.heartbeat, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    yield "heartbeat", None
+                for task in done:
+                    yield tasks[task], task.result()
+        finally:
+            # A failed stage or a disconnected client stops the remaining work
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,65 @@
+import os
+import sqlite3
+import asyncio
+import logging
+import threading
+from typing import Any, Callable
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class SQLiteDatabase:
+    """
+    Local SQLite database in WAL mode with an async interface
+    
+    Each worker thread keeps its own connection, so reads run concurrently
+    with a writer. Statements are parameterized constants, which sqlite3
+    compiles once per connection and reuses from its statement cache.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schemas = []
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    
+    def register_schema(self, schema: str):
+        """Register DDL to run on every new connection (must be idempotent)"""
+        with self._schema_lock:
+            self._schemas.append(schema)
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.executescript(schema)
+    
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False, cached_statements=256, timeout=30)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            with self._schema_lock:
+                for schema in self._schemas:
+                    connection.executescript(schema)
+            self._local.connection = connection
+        return connection
+    
+    def run_sync(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run fn(connection) inside a transaction on the calling thread"""
+        connection = self.connection()
+        with connection:
+            return fn(connection)
+    
+    async def run(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run fn(connection) inside a transaction on a worker thread"""
+        return await asyncio.to_thread(self.run_sync, fn)
+
+# Shared application database
+database = SQLiteDatabase(settings.DATABASE_PATH)
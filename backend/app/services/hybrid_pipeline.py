@@ -0,0 +1,306 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import settings
+from app.agents.parser_agent import ResumeParserAgent, SECTION_HEADERS as RESUME_SECTION_HEADERS
+from app.agents.job_agent import (
+    JobDescriptionAgent,
+    RESPONSIBILITY_HEADERS,
+    REQUIRED_SKILL_HEADERS,
+    REQUIRED_QUALIFICATION_HEADERS,
+    EXPERIENCE_HEADERS
+)
+from app.agents.crew_runner import CrewRunner, crew_runner
+from app.agents.output_parser import OutputParserError, extract_json, invalid_fields
+from app.schemas.responses import (
+    HybridContactInfo,
+    HybridSummary,
+    HybridExperience,
+    HybridEducation,
+    HybridSkills,
+    HybridJobTitle,
+    HybridJobCompany,
+    HybridRequiredSkills,
+    HybridResponsibilities,
+    HybridJobExperience
+)
+
+logger = logging.getLogger(__name__)
+
+# What each escalated field asks the LLM for, the JSON shape it must return, and the model
+# that answer is validated against before it replaces the deterministic value
+RESUME_FIELD_PROMPTS = {
+    "contact_info": (
+        "the candidate's contact details",
+        '{"name": "", "email": "", "phone": "", "linkedin": "", "github": ""}',
+        HybridContactInfo
+    ),
+    "summary": ("the professional summary, verbatim", '{"summary": ""}', HybridSummary),
+    "experience": (
+        "every work experience entry",
+        '{"experience": [{"company": "", "position": "", "start_date": "", "end_date": "", "description": [""]}]}',
+        HybridExperience
+    ),
+    "education": (
+        "every education entry",
+        '{"education": [{"institution": "", "degree": "", "field_of_study": "", "start_date": "", "end_date": ""}]}',
+        HybridEducation
+    ),
+    "skills": ("the candidate's skills", '{"skills": [{"name": ""}]}', HybridSkills),
+}
+
+JOB_FIELD_PROMPTS = {
+    "title": ("the job title", '{"title": ""}', HybridJobTitle),
+    "company": ("the hiring company's name (empty if not stated)", '{"company": ""}', HybridJobCompany),
+    "required_skills": ("the required skills", '{"required_skills": [""]}', HybridRequiredSkills),
+    "responsibilities": ("the responsibilities of the role", '{"responsibilities": [""]}', HybridResponsibilities),
+    "experience": (
+        "the experience requirement",
+        '{"experience": {"years": 0, "level": "", "description": ""}}',
+        HybridJobExperience
+    ),
+}
+
+# Job description sections that hold the source text for each field
+JOB_FIELD_SECTIONS = {
+    "required_skills": REQUIRED_SKILL_HEADERS + REQUIRED_QUALIFICATION_HEADERS,
+    "responsibilities": RESPONSIBILITY_HEADERS,
+    "experience": EXPERIENCE_HEADERS + REQUIRED_QUALIFICATION_HEADERS,
+}
+
+def _resume_confidence(parsed: Dict[str, Any], sections: Dict[str, str]) -> Dict[str, float]:
+    """
+    Confidence that the rule-based parser got each resume field right
+    
+    An empty field is only suspicious when the resume has a section for it;
+    partially filled entries lower the confidence in proportion.
+    """
+    def entries(field: str, keys: Tuple[str, ...], expected: bool) -> float:
+        items = parsed.get(field) or []
+        if not items:
+            return 0.1 if field in sections else (0.4 if expected else 0.9)
+        complete = sum(1 for item in items if all(item.get(key) for key in keys))
+        return 0.4 + 0.6 * complete / len(items)
+    
+    contact = parsed.get("contact_info") or {}
+    skills = parsed.get("skills") or []
+    summary = parsed.get("summary") or ""
+    
+    return {
+        "contact_info": (0.5 * bool(contact.get("name"))) + (0.5 * bool(contact.get("email") or contact.get("phone"))),
+        "summary": 0.9 if summary or "summary" not in sections else 0.2,
+        "experience": entries("experience", ("position", "start_date"), expected=True),
+        "education": entries("education", ("institution",), expected=False),
+        "skills": 1.0 if len(skills) >= 5 else 0.7 if skills else (0.1 if "skills" in sections else 0.4),
+    }
+
+def _job_confidence(job: Dict[str, Any]) -> Dict[str, float]:
+    """Confidence that the rule-based job agent got each job field right"""
+    sections = job.get("sections") or {}
+    title = job.get("title") or ""
+    experience = job.get("experience") or {}
+    
+    def has_section(field: str) -> bool:
+        return any(header in sections for header in JOB_FIELD_SECTIONS[field])
+    
+    # The title falls back to the first line, which may be a sentence
+    if not title:
+        title_confidence = 0.0
+    elif len(title) > 80 or title.endswith("."):
+        title_confidence = 0.3
+    else:
+        title_confidence = 0.9
+    
+    skills = job.get("required_skills") or []
+    return {
+        "title": title_confidence,
+        "company": 0.9 if job.get("company") else 0.4,
+        "required_skills": 1.0 if len(skills) >= 3 else 0.7 if skills else 0.2,
+        "responsibilities": 0.9 if job.get("responsibilities") else (0.1 if has_section("responsibilities") else 0.5),
+        "experience": 0.9 if experience.get("years") or experience.get("level") else (0.2 if has_section("experience") else 0.6),
+    }
+
+def _resume_sections(text: str) -> Dict[str, str]:
+    """Split resume text on standalone header lines, keyed by standard section"""
+    sections: Dict[str, List[str]] = {}
+    current = None
+    
+    for line in text.splitlines():
+        section = RESUME_SECTION_HEADERS.get(line.strip().rstrip(":").lower())
+        if section:
+            current = section
+            sections.setdefault(current, [])
+        elif current:
+            sections[current].append(line)
+    
+    return {section: "\n".join(lines).strip() for section, lines in sections.items()}
+
+class HybridPipeline:
+    """
+    Deterministic-first analysis with LLM escalation on low confidence
+    
+    The rule-based parser and job agent run first. Each field gets a
+    confidence score; only fields below the threshold are sent to the LLM,
+    each with a narrow prompt holding just the relevant excerpt. Most
+    documents never reach the network, and the rest send small prompts.
+    The LLM client comes from the shared pool on first escalation.
+    """
+    
+    def __init__(
+        self,
+        parser_agent: Optional[ResumeParserAgent] = None,
+        job_agent: Optional[JobDescriptionAgent] = None,
+        threshold: Optional[float] = None,
+        escalate: Optional[bool] = None,
+        runner: Optional[CrewRunner] = None
+    ):
+        self.parser_agent = parser_agent or ResumeParserAgent()
+        self.job_agent = job_agent or JobDescriptionAgent()
+        self.threshold = settings.HYBRID_CONFIDENCE_THRESHOLD if threshold is None else threshold
+        self.escalate = settings.HYBRID_LLM_ESCALATION if escalate is None else escalate
+        self.runner = runner or crew_runner
+    
+    async def analyze_resume(self, file_path: str) -> Dict[str, Any]:
+        """
+        Parse a resume, escalating low-confidence fields to the LLM
+        
+        Args:
+            file_path: Path to the resume file
+        
+        Returns:
+            Dict[str, Any]: Parsed resume data with a "hybrid" report
+        """
+        try:
+            # Run the rule-based parser in a worker thread; PDF and DOCX extraction is CPU-bound
+            text, format_features = await asyncio.to_thread(self.parser_agent.extract_text, file_path)
+            parsed = await asyncio.to_thread(self.parser_agent.parse_extracted_text, text, format_features)
+            
+            # Score each field and escalate the weak ones with their section as context
+            sections = _resume_sections(text)
+            confidence = _resume_confidence(parsed, sections)
+            excerpts = {
+                field: sections.get(field) or text
+                for field in RESUME_FIELD_PROMPTS
+            }
+            # Contact details sit at the top of a resume
+            excerpts["contact_info"] = text[:settings.HYBRID_EXCERPT_CHARS // 4]
+            
+            return await self._escalate(parsed, confidence, excerpts, RESUME_FIELD_PROMPTS, "resume")
+        
+        except Exception as e:
+            logger.error(f"Error in hybrid resume analysis: {str(e)}")
+            raise
+    
+    async def analyze_job(self, job_description: str) -> Dict[str, Any]:
+        """
+        Process a job description, escalating low-confidence fields to the LLM
+        
+        Args:
+            job_description: The job description text
+        
+        Returns:
+            Dict[str, Any]: Structured job data with a "hybrid" report
+        """
+        try:
+            # Run the rule-based job agent
+            job = await self.job_agent.process_job_description(job_description)
+            
+            # Score each field and escalate the weak ones with their sections as context
+            confidence = _job_confidence(job)
+            sections = job.get("sections") or {}
+            excerpts = {}
+            for field in JOB_FIELD_PROMPTS:
+                relevant = [sections[header] for header in JOB_FIELD_SECTIONS.get(field, []) if header in sections]
+                excerpts[field] = "\n".join(relevant) or job_description
+            # Titles and company names sit at the top of a posting
+            excerpts["title"] = excerpts["company"] = job_description[:settings.HYBRID_EXCERPT_CHARS // 4]
+            
+            return await self._escalate(job, confidence, excerpts, JOB_FIELD_PROMPTS, "job description")
+        
+        except Exception as e:
+            logger.error(f"Error in hybrid job analysis: {str(e)}")
+            raise
+    
+    async def _escalate(
+        self,
+        data: Dict[str, Any],
+        confidence: Dict[str, float],
+        excerpts: Dict[str, str],
+        prompts: Dict[str, Tuple[str, str, Type[BaseModel]]],
+        document: str
+    ) -> Dict[str, Any]:
+        """Ask the LLM for every field below the threshold, concurrently, and merge the answers"""
+        low = [field for field, score in confidence.items() if score < self.threshold]
+        escalated: List[str] = []
+        
+        if low and self.escalate:
+            answers = await asyncio.gather(
+                *(self._ask(field, prompts[field], excerpts[field], document) for field in low),
+                return_exceptions=True
+            )
+            for field, answer in zip(low, answers):
+                if isinstance(answer, Exception):
+                    logger.error(f"LLM escalation for {field} failed: {str(answer)}")
+                    continue
+                value = self._field_value(field, answer, prompts[field][2])
+                if value:
+                    data[field] = value
+                    escalated.append(field)
+        
+        data["hybrid"] = {
+            "confidence": {field: round(score, 2) for field, score in confidence.items()},
+            "threshold": self.threshold,
+            "low_confidence": low,
+            "escalated": escalated
+        }
+        return data
+    
+    async def _ask(self, field: str, prompt: Tuple[str, str, Type[BaseModel]], excerpt: str, document: str) -> Optional[Dict[str, Any]]:
+        """Send one narrowly scoped extraction prompt"""
+        what, shape, _ = prompt
+        excerpt = excerpt[:settings.HYBRID_EXCERPT_CHARS]
+        message = (
+            f"Extract {what} from this {document} excerpt. "
+            f"Respond with JSON only, in exactly this shape: {shape}\n\n"
+            f"{excerpt}"
+        )
+        
+        # The client is looked up on the worker thread, so building it never blocks the event loop
+        answer = await self.runner.call(lambda: self._get_llm().invoke(message), settings.LLM_PROVIDER)
+        try:
+            value = extract_json(getattr(answer, "content", answer), prompt[2])
+        except OutputParserError:
+            return None
+        return value if isinstance(value, dict) else None
+    
+    def _field_value(self, field: str, answer: Optional[Dict[str, Any]], schema: Type[BaseModel]) -> Any:
+        """
+        Validate an answer against the field's model and pick the field out of it
+        
+        Downstream agents index into these values (skill["name"], integer
+        experience years), so an answer in the wrong shape is discarded and
+        the deterministic value kept. Empty values are dropped too.
+        """
+        if not answer:
+            return None
+        try:
+            value = schema.model_validate(answer).model_dump()
+        except ValidationError as e:
+            logger.warning(f"Discarding LLM answer for {field}: {invalid_fields(e)}")
+            return None
+        
+        if field == "contact_info":
+            return {key: item for key, item in value.items() if item} or None
+        value = value[field]
+        if isinstance(value, dict) and not any(value.values()):
+            return None
+        return value or None
+    
+    def _get_llm(self):
+        """Get the pooled LLM on use, so documents that never escalate never import LangChain"""
+        from app.agents.llm_pool import pooled_llm
+        
+        return pooled_llm(settings.LLM_PROVIDER, settings.LLM_MODEL, settings.LLM_TEMPERATURE)
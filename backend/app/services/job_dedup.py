@@ -0,0 +1,147 @@
+import json
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.minhash import MinHasher, MinHashLSH
+from app.services.database import SQLiteDatabase, database
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_signatures (
+    job_id TEXT PRIMARY KEY REFERENCES jobs(job_id) ON DELETE CASCADE,
+    signature BLOB NOT NULL
+);
+"""
+
+INSERT_SIGNATURE = "INSERT OR REPLACE INTO job_signatures (job_id, signature) VALUES (?, ?)"
+SELECT_SIGNATURES = "SELECT job_id, signature FROM job_signatures"
+SELECT_UNSIGNED_JOBS = """
+SELECT j.job_id, j.data FROM jobs j
+LEFT JOIN job_signatures s ON s.job_id = j.job_id
+WHERE s.job_id IS NULL
+"""
+
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_SIZE = 3
+
+class JobDeduplicator:
+    """Near-duplicate detection for job descriptions using MinHash LSH"""
+    
+    def __init__(self, db: SQLiteDatabase = None, threshold: float = None):
+        self.db = db or database
+        self.db.register_schema(SCHEMA)
+        self.threshold = threshold or settings.JOB_DEDUP_THRESHOLD
+        self.hasher = MinHasher(num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE)
+        self.lsh = MinHashLSH(num_perm=NUM_PERM, bands=BANDS)
+        self._warmed = False
+        self._warm_lock = asyncio.Lock()
+    
+    def signature(self, job_description: str) -> Optional[np.ndarray]:
+        """Compute the MinHash signature of a job description"""
+        return self.hasher.signature(job_description)
+    
+    async def find_duplicate(self, signature: Optional[np.ndarray]) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar stored job above the duplicate threshold
+        
+        Args:
+            signature: The signature of the incoming job description
+        
+        Returns:
+            Optional[Tuple[str, float]]: (job_id, estimated Jaccard similarity), or None
+        """
+        if signature is None or not settings.JOB_DEDUP_ENABLED:
+            return None
+        
+        await self.warm()
+        matches = self.lsh.query(signature, self.threshold)
+        return matches[0] if matches else None
+    
+    async def add(self, job_id: str, signature: Optional[np.ndarray]):
+        """
+        Record the signature of a newly processed job
+        
+        Args:
+            job_id: The job ID (must already be saved in the job repository)
+            signature: The job description signature
+        """
+        if signature is None:
+            return
+        
+        try:
+            await self.db.run(lambda connection: connection.execute(INSERT_SIGNATURE, (job_id, signature.tobytes())))
+            self.lsh.add(job_id, signature)
+        
+        except Exception as e:
+            logger.error(f"Error saving job signature: {str(e)}")
+            raise
+    
+    async def add_many(self, signatures: Dict[str, np.ndarray]):
+        """
+        Persist the signatures of several saved jobs in a single transaction
+        
+        Args:
+            signatures: Signatures keyed by job ID
+        """
+        rows = [(job_id, signature.tobytes()) for job_id, signature in signatures.items() if signature is not None]
+        
+        try:
+            await self.db.run(lambda connection: connection.executemany(INSERT_SIGNATURE, rows))
+            for job_id, signature in signatures.items():
+                if signature is not None:
+                    self.lsh.add(job_id, signature)
+        
+        except Exception as e:
+            logger.error(f"Error saving job signatures: {str(e)}")
+            raise
+    
+    def remove(self, job_id: str) -> bool:
+        """Forget a deleted job (its stored signature is removed with the job row)"""
+        return self.lsh.remove(job_id)
+    
+    async def warm(self):
+        """
+        Load stored signatures into the LSH index once, signing any jobs saved without one
+        """
+        if self._warmed:
+            return
+        
+        def load(connection) -> Dict[str, np.ndarray]:
+            signatures = {
+                row["job_id"]: np.frombuffer(row["signature"], dtype=np.uint32)
+                for row in connection.execute(SELECT_SIGNATURES)
+            }
+            
+            # Jobs imported from legacy files have no signature yet
+            for row in connection.execute(SELECT_UNSIGNED_JOBS).fetchall():
+                description = json.loads(row["data"]).get("raw_description") or ""
+                signature = self.signature(description)
+                if signature is not None:
+                    connection.execute(INSERT_SIGNATURE, (row["job_id"], signature.tobytes()))
+                    signatures[row["job_id"]] = signature
+            
+            return signatures
+        
+        async with self._warm_lock:
+            if self._warmed:
+                return
+            
+            try:
+                signatures = await self.db.run(load)
+                for job_id, signature in signatures.items():
+                    self.lsh.add(job_id, signature)
+                self._warmed = True
+                logger.info(f"Loaded {len(signatures)} job signatures for duplicate detection")
+                
+            except Exception as e:
+                logger.error(f"Error loading job signatures: {str(e)}")
+                raise
+
+# Shared deduplicator
+job_deduplicator = JobDeduplicator()
@@ -0,0 +1,471 @@
+import io
+import csv
+import json
+import time
+import uuid
+import asyncio
+import logging
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Awaitable, List, Optional, BinaryIO, Iterator, Tuple
+
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.minhash import MinHashLSH
+from app.schemas.requests import JobDescriptionRequest
+from app.agents.job_agent import JobDescriptionAgent
+from app.services.job_repository import job_repository, job_text_hash
+from app.services.job_dedup import job_deduplicator, NUM_PERM, BANDS
+from app.services.vector_index import job_index, save_indexes
+
+logger = logging.getLogger(__name__)
+
+# Records read from the input per worker-thread hop
+READ_CHUNK_SIZE = 256
+
+# Characters read at a time from a JSON array file
+JSON_ARRAY_CHUNK_CHARS = 65536
+
+# Error messages kept in the final report
+MAX_REPORTED_ERRORS = 20
+
+STAGES = ["read", "dedup", "process", "save", "index"]
+
+def iter_job_records(stream: BinaryIO, input_format: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Stream job records from a JSONL, JSON array or CSV file without loading it into memory
+    
+    Args:
+        stream: A binary file object
+        input_format: "jsonl", "json" (a top-level array of objects) or "csv"
+    
+    Yields:
+        Tuple[int, Optional[Dict[str, Any]], Optional[str]]: (record number, record, parse error)
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    
+    if input_format == "csv":
+        for number, row in enumerate(csv.DictReader(text), start=1):
+            yield number, row, None
+        return
+    
+    if input_format == "json":
+        yield from _iter_json_array(text)
+        return
+    
+    number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"Invalid JSON: {str(e)}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "Record is not a JSON object"
+            continue
+        yield number, record, None
+
+def _iter_json_array(text: io.TextIOBase) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Stream the elements of a top-level JSON array, decoding one element at a time"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    exhausted = False
+    
+    def skip(characters: str) -> Optional[str]:
+        # Advance past the given characters, reading more input as needed; returns the next one
+        nonlocal buffer, position, exhausted
+        while True:
+            while position < len(buffer) and buffer[position] in characters:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if exhausted:
+                return None
+            chunk = text.read(JSON_ARRAY_CHUNK_CHARS)
+            exhausted = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+    
+    if skip(" \t\r\n\ufeff") != "[":
+        yield 1, None, "Invalid JSON: expected a top-level array of job objects"
+        return
+    position += 1
+    
+    number = 0
+    while True:
+        char = skip(" \t\r\n,")
+        if char is None:
+            yield number + 1, None, "Invalid JSON: unterminated array"
+            return
+        if char == "]":
+            return
+        
+        # A partial element fails to decode; read more until it completes or the input ends
+        while True:
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+                break
+            except ValueError as e:
+                chunk = "" if exhausted else text.read(JSON_ARRAY_CHUNK_CHARS)
+                if not chunk:
+                    # The rest of the array cannot be located after a syntax error
+                    yield number + 1, None, f"Invalid JSON: {str(e)}"
+                    return
+                buffer, position = buffer[position:] + chunk, 0
+        
+        number += 1
+        position = end
+        if not isinstance(record, dict):
+            yield number, None, "Record is not a JSON object"
+            continue
+        yield number, record, None
+
+def detect_format(filename: Optional[str]) -> str:
+    """Infer the input format from a file name"""
+    if filename and filename.lower().endswith(".csv"):
+        return "csv"
+    if filename and filename.lower().endswith(".json"):
+        return "json"
+    if filename and filename.lower().endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"Cannot infer input format from file name: {filename}")
+
+# One agent per worker process, created on first use
+_process_agent = None
+
+def _process_in_worker(job_description: str) -> Dict[str, Any]:
+    """Run the job description agent inside a worker process"""
+    global _process_agent
+    if _process_agent is None:
+        _process_agent = JobDescriptionAgent()
+    return asyncio.run(_process_agent.process_job_description(job_description))
+
+class IngestionStats:
+    """Counters and per-stage timings for one ingestion run"""
+    
+    def __init__(self):
+        self.records = 0
+        self.processed = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.batches = 0
+        self.stage_seconds = {stage: 0.0 for stage in STAGES}
+        self.stage_counts = {stage: 0 for stage in STAGES}
+        self.errors: List[str] = []
+        self.started = time.perf_counter()
+    
+    def record_stage(self, stage: str, started: float, count: int = 1):
+        """Add the time since started to a stage"""
+        self.stage_seconds[stage] += time.perf_counter() - started
+        self.stage_counts[stage] += count
+    
+    def record_error(self, number: Optional[int], message: str):
+        """Count a failed record, keeping the first few messages"""
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Record {number}: {message}" if number else message)
+    
+    def report(self) -> Dict[str, Any]:
+        """Summarize the run"""
+        elapsed = time.perf_counter() - self.started
+        return {
+            "records": self.records,
+            "processed": self.processed,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "batches": self.batches,
+            "elapsed_seconds": round(elapsed, 3),
+            "jobs_per_second": round(self.records / elapsed, 2) if elapsed > 0 else 0.0,
+            "stages": {
+                stage: {
+                    "total_seconds": round(self.stage_seconds[stage], 3),
+                    "mean_ms": round(self.stage_seconds[stage] / self.stage_counts[stage] * 1000, 3) if self.stage_counts[stage] else 0.0
+                }
+                for stage in STAGES
+            },
+            "errors": self.errors
+        }
+
+class JobIngestionPipeline:
+    """
+    Bulk job ingestion: stream records, process them in a worker pool, save in batches
+    
+    A reader feeds a bounded queue, so a slow processing stage applies
+    backpressure instead of buffering the whole input. Workers skip
+    near-duplicates (against stored jobs and earlier records in the same run)
+    before running the job description agent, either on the event loop or in
+    a process pool. A single writer saves processed jobs and their duplicate
+    signatures in batched transactions, then indexes them for similarity search.
+    """
+    
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        processes: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None
+    ):
+        self.processes = settings.JOB_INGEST_PROCESSES if processes is None else processes
+        self.workers = workers or max(settings.JOB_INGEST_WORKERS, self.processes * 2)
+        self.batch_size = batch_size or settings.JOB_INGEST_BATCH_SIZE
+        self.queue_size = queue_size or settings.JOB_INGEST_QUEUE_SIZE
+    
+    async def run(self, stream: BinaryIO, input_format: str) -> Dict[str, Any]:
+        """
+        Ingest every job record in a stream
+        
+        Args:
+            stream: A binary JSONL, JSON array or CSV file object
+            input_format: "jsonl", "json" or "csv"
+        
+        Returns:
+            Dict[str, Any]: Counts, throughput and per-stage timings
+        """
+        if input_format not in ("jsonl", "json", "csv"):
+            raise ValueError(f"Unsupported input format: {input_format}")
+        
+        stats = IngestionStats()
+        await job_deduplicator.warm()
+        
+        records: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        processed: asyncio.Queue = asyncio.Queue(maxsize=self.batch_size * 2)
+        pending = MinHashLSH(num_perm=NUM_PERM, bands=BANDS)
+        
+        executor = ProcessPoolExecutor(max_workers=self.processes) if self.processes > 0 else None
+        agent = None if executor else JobDescriptionAgent()
+        
+        writer = asyncio.create_task(self._write(processed, pending, stats))
+        workers = [
+            asyncio.create_task(self._work(records, processed, pending, agent, executor, stats))
+            for _ in range(self.workers)
+        ]
+        
+        try:
+            # A dead worker or writer would leave the queues full and block every put() behind it,
+            # so each step fails fast when a task it depends on stops
+            await self._watch(self._read(stream, input_format, records, stats), [writer, *workers])
+            
+            # Stop the workers once the queue drains, then the writer
+            await self._watch(self._stop_workers(records, workers), [writer])
+            await self._watch(processed.put(None), [writer])
+            await writer
+        
+        except BaseException:
+            for task in [writer, *workers]:
+                task.cancel()
+            await asyncio.gather(writer, *workers, return_exceptions=True)
+            raise
+        
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        report = stats.report()
+        logger.info(
+            f"Ingested {report['records']} job records in {report['elapsed_seconds']}s "
+            f"({report['jobs_per_second']} jobs/s): {report['processed']} processed, "
+            f"{report['duplicates']} duplicates, {report['failed']} failed"
+        )
+        return report
+    
+    async def _read(self, stream: BinaryIO, input_format: str, records: asyncio.Queue, stats: IngestionStats):
+        """Read records in chunks off the event loop; put() blocks while the queue is full"""
+        iterator = iter_job_records(stream, input_format)
+        
+        while True:
+            started = time.perf_counter()
+            chunk = await asyncio.to_thread(lambda: list(itertools.islice(iterator, READ_CHUNK_SIZE)))
+            stats.record_stage("read", started, len(chunk))
+            if not chunk:
+                break
+            
+            for number, record, error in chunk:
+                stats.records += 1
+                if error:
+                    stats.record_error(number, error)
+                    continue
+                await records.put((number, record))
+    
+    async def _watch(self, operation: Awaitable[Any], tasks: List[asyncio.Task]):
+        """
+        Await an operation while watching the tasks that consume its output
+        
+        The watched tasks only stop after a sentinel that is sent once the
+        operation is done, so any of them finishing first means it failed:
+        the operation is cancelled and the failure raised.
+        """
+        operation = asyncio.ensure_future(operation)
+        waiting = {operation, *tasks}
+        
+        try:
+            while True:
+                done, waiting = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if operation in done:
+                    return operation.result()
+                for task in done:
+                    if not task.cancelled() and task.exception() is not None:
+                        raise task.exception()
+                    raise RuntimeError("Ingestion task stopped before its input was complete")
+        finally:
+            operation.cancel()
+    
+    async def _stop_workers(self, records: asyncio.Queue, workers: List[asyncio.Task]):
+        """Send each worker a None sentinel and wait for them to finish the queued records"""
+        for _ in workers:
+            await records.put(None)
+        await asyncio.gather(*workers)
+    
+    async def _work(
+        self,
+        records: asyncio.Queue,
+        processed: asyncio.Queue,
+        pending: MinHashLSH,
+        agent: Optional[JobDescriptionAgent],
+        executor: Optional[ProcessPoolExecutor],
+        stats: IngestionStats
+    ):
+        """Validate, deduplicate and process records until a None sentinel arrives"""
+        while True:
+            item = await records.get()
+            if item is None:
+                return
+            number, record = item
+            
+            # One bad record must not stop the worker, or the reader would block on a full queue
+            try:
+                await self._work_one(number, record, processed, pending, agent, executor, stats)
+            except Exception as e:
+                logger.error(f"Error ingesting job record {number}: {str(e)}")
+                stats.record_error(number, f"Ingestion failed: {str(e)}")
+    
+    async def _work_one(
+        self,
+        number: int,
+        record: Dict[str, Any],
+        processed: asyncio.Queue,
+        pending: MinHashLSH,
+        agent: Optional[JobDescriptionAgent],
+        executor: Optional[ProcessPoolExecutor],
+        stats: IngestionStats
+    ):
+        """Validate, deduplicate and process one record, queueing it for the writer"""
+        try:
+            request = JobDescriptionRequest.model_validate(record)
+        except ValidationError as e:
+            stats.record_error(number, f"Invalid record: {e.errors()[0]['msg']}")
+            return
+        
+        # Skip postings that duplicate a stored job or an earlier record in this run
+        started = time.perf_counter()
+        signature = job_deduplicator.signature(request.description)
+        duplicate = None
+        if signature is not None and settings.JOB_DEDUP_ENABLED:
+            duplicate = pending.query(signature, job_deduplicator.threshold) or await job_deduplicator.find_duplicate(signature)
+        job_id = str(uuid.uuid4())
+        if signature is not None and not duplicate:
+            pending.add(job_id, signature)
+        stats.record_stage("dedup", started)
+        
+        if duplicate:
+            stats.duplicates += 1
+            return
+        
+        started = time.perf_counter()
+        try:
+            if executor is not None:
+                processed_data = await asyncio.get_running_loop().run_in_executor(executor, _process_in_worker, request.description)
+            else:
+                processed_data = await agent.process_job_description(request.description)
+                # Let the reader and writer run between jobs processed on the loop
+                await asyncio.sleep(0)
+        except Exception as e:
+            pending.remove(job_id)
+            stats.record_error(number, f"Processing failed: {str(e)}")
+            return
+        finally:
+            stats.record_stage("process", started)
+        
+        # Add metadata, preferring the fields supplied with the record
+        processed_data["job_id"] = job_id
+        processed_data["timestamp"] = datetime.now().isoformat()
+        processed_data["raw_description"] = request.description
+        processed_data["text_hash"] = job_text_hash(request.description)
+        processed_data["title"] = request.title or processed_data.get("title", "")
+        processed_data["company"] = request.company or processed_data.get("company", "")
+        if request.url:
+            processed_data["url"] = request.url
+        
+        await processed.put((processed_data, signature))
+    
+    async def _write(self, processed: asyncio.Queue, pending: MinHashLSH, stats: IngestionStats):
+        """Save processed jobs in batched transactions until a None sentinel arrives"""
+        batch: List[Tuple[Dict[str, Any], Any]] = []
+        
+        while True:
+            item = await processed.get()
+            if item is not None:
+                batch.append(item)
+            
+            if batch and (item is None or len(batch) >= self.batch_size):
+                await self._flush(batch, pending, stats)
+                batch = []
+            
+            if item is None:
+                return
+    
+    async def _flush(self, batch: List[Tuple[Dict[str, Any], Any]], pending: MinHashLSH, stats: IngestionStats):
+        """Save one batch of jobs and signatures, then index the jobs"""
+        jobs = [job_data for job_data, _ in batch]
+        
+        started = time.perf_counter()
+        try:
+            await job_repository.save_many(jobs)
+            await job_deduplicator.add_many({job_data["job_id"]: signature for job_data, signature in batch})
+        except Exception as e:
+            for job_data in jobs:
+                # An unsaved job must not mark later records in the run as its duplicates
+                pending.remove(job_data["job_id"])
+                stats.record_error(None, f"Saving job {job_data['job_id']} failed: {str(e)}")
+            return
+        finally:
+            stats.record_stage("save", started, len(jobs))
+        
+        started = time.perf_counter()
+        for job_data in jobs:
+            # The job is saved either way; it is only missing from similarity search
+            try:
+                await job_index.add(job_data["job_id"], job_data["raw_description"])
+            except Exception as e:
+                stats.record_error(None, f"Indexing job {job_data['job_id']} failed: {str(e)}")
+        stats.record_stage("index", started, len(jobs))
+        
+        stats.processed += len(jobs)
+        stats.batches += 1
+
+def main():
+    """Command-line entry point for nightly job syncs"""
+    parser = argparse.ArgumentParser(description="Bulk-ingest job descriptions from a JSONL, JSON or CSV file")
+    parser.add_argument("path", help="Input file, one job per JSONL line, JSON array element or CSV row (needs a 'description' field)")
+    parser.add_argument("--format", choices=["jsonl", "json", "csv"], help="Input format (default: from the file extension)")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent jobs in flight")
+    parser.add_argument("--processes", type=int, default=None, help="Agent worker processes (0 runs the agent in-process)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Jobs saved per transaction")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=settings.LOG_LEVEL, format=settings.LOG_FORMAT)
+    
+    pipeline = JobIngestionPipeline(workers=args.workers, processes=args.processes, batch_size=args.batch_size)
+    with open(args.path, "rb") as stream:
+        report = asyncio.run(pipeline.run(stream, args.format or detect_format(args.path)))
+    save_indexes()
+    
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,31 @@
-import os
 import uuid
+import asyncio
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
-import json
 
-from app.core.config import settings
+from app.core.singleflight import SingleFlight
 from app.agents.job_agent import JobDescriptionAgent
+from app.services.hybrid_pipeline import HybridPipeline
+from app.services.job_repository import job_repository, job_text_hash
+from app.services.job_dedup import job_deduplicator
+from app.services.vector_index import job_index, resume_index
 
 logger = logging.getLogger(__name__)
 
+# How process() requests were served, shared across processor instances
+_process_counts = {"requests": 0, "exact_hits": 0, "near_duplicate_hits": 0, "processed": 0}
+
+# Concurrent submissions of the same description share one processing run
+_process_flights = SingleFlight()
+
 class JobProcessor:
     """Service for processing job descriptions"""
     
+    def __init__(self, job_agent: Optional[JobDescriptionAgent] = None, hybrid_pipeline: Optional[HybridPipeline] = None):
+        self.job_agent = job_agent or JobDescriptionAgent()
+        self.hybrid_pipeline = hybrid_pipeline
+    
     async def process(self, job_description: str) -> Dict[str, Any]:
         """
         Process a job description
@@ -23,30 +36,66 @@ class JobProcessor:
         Returns:
             Dict[str, Any]: The processed job data
         """
+        _process_counts["requests"] += 1
+        
+        # Identical descriptions in flight are processed once
+        text_hash = job_text_hash(job_description)
+        return await _process_flights.do(
+            ("process_job", text_hash),
+            lambda: self._process(job_description, text_hash)
+        )
+    
+    async def _process(self, job_description: str, text_hash: str) -> Dict[str, Any]:
+        """Serve a job description from the cache, a near-duplicate or the agent"""
         try:
-            # Generate a unique ID for this job
-            job_id = str(uuid.uuid4())
+            # Return the stored job if this exact (normalized) text was processed before
+            cached_id = await job_repository.find_by_text_hash(text_hash)
+            if cached_id is not None:
+                existing = await job_repository.get(cached_id)
+                if existing is not None:
+                    _process_counts["exact_hits"] += 1
+                    return existing
+                job_repository.forget_text_hash(text_hash)
             
-            # Create a directory for storing job data
-            jobs_dir = os.path.join(settings.UPLOAD_DIR, "jobs")
-            os.makedirs(jobs_dir, exist_ok=True)
+            # Reuse the processed record of a near-identical posting
+            signature = job_deduplicator.signature(job_description)
+            duplicate = await job_deduplicator.find_duplicate(signature)
+            if duplicate:
+                duplicate_id, similarity = duplicate
+                existing = await job_repository.get(duplicate_id)
+                if existing is not None:
+                    logger.info(f"Job description matches job {duplicate_id} (similarity {similarity:.2f})")
+                    _process_counts["near_duplicate_hits"] += 1
+                    
+                    # Alias this text to the existing job so a resubmission is an exact hit
+                    await job_repository.add_text_alias(text_hash, duplicate_id)
+                    return {**existing, "duplicate": True, "duplicate_similarity": similarity}
             
-            # Initialize job description agent
-            job_agent = JobDescriptionAgent()
+            # Generate a unique ID for this job
+            job_id = str(uuid.uuid4())
             
-            # Process the job description
-            processed_data = await job_agent.process_job_description(job_description)
+            # Process the job description, escalating weak fields to the LLM in hybrid mode
+            if self.hybrid_pipeline is not None:
+                processed_data = await self.hybrid_pipeline.analyze_job(job_description)
+            else:
+                processed_data = await self.job_agent.process_job_description(job_description)
             
             # Add metadata
             processed_data["job_id"] = job_id
             processed_data["timestamp"] = datetime.now().isoformat()
             processed_data["raw_description"] = job_description
+            processed_data["text_hash"] = text_hash
             
             # Save the processed data
-            job_file_path = os.path.join(jobs_dir, f"{job_id}.json")
-            with open(job_file_path, 'w') as f:
-                json.dump(processed_data, f, indent=2)
+            await job_repository.save(processed_data)
+            
+            # Remember the posting for duplicate detection
+            await job_deduplicator.add(job_id, signature)
+            
+            # Index the job for similarity search
+            await job_index.add(job_id, job_description)
             
+            _process_counts["processed"] += 1
             return processed_data
             
         except Exception as e:
@@ -64,17 +113,107 @@ class JobProcessor:
             Dict[str, Any]: The job data
         """
         try:
-            job_file_path = os.path.join(settings.UPLOAD_DIR, "jobs", f"{job_id}.json")
+            job_data = await job_repository.get(job_id)
             
-            if not os.path.exists(job_file_path):
+            if job_data is None:
                 logger.error(f"Job with ID {job_id} not found")
                 raise FileNotFoundError(f"Job with ID {job_id} not found")
             
-            with open(job_file_path, 'r') as f:
-                job_data = json.load(f)
-            
             return job_data
             
         except Exception as e:
             logger.error(f"Error retrieving job: {str(e)}")
             raise
+    
+    async def delete_job(self, job_id: str) -> bool:
+        """
+        Delete a processed job and remove it from the similarity index
+        
+        Args:
+            job_id: The job ID
+            
+        Returns:
+            bool: Whether the job existed
+        """
+        try:
+            existed = await job_repository.delete(job_id)
+            job_deduplicator.remove(job_id)
+            
+            return job_index.remove(job_id) or existed
+            
+        except Exception as e:
+            logger.error(f"Error deleting job: {str(e)}")
+            raise
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Report how job description requests were served
+        
+        Returns:
+            Dict[str, Any]: Request counts, the share served without processing, and text-hash cache metrics
+        """
+        requests = _process_counts["requests"]
+        reused = _process_counts["exact_hits"] + _process_counts["near_duplicate_hits"] + _process_flights.coalesced
+        return {
+            **_process_counts,
+            "hit_rate": (reused / requests) if requests else 0.0,
+            "text_hash_cache": job_repository.text_hash_cache.stats(),
+            "coalescing": _process_flights.stats()
+        }
+    
+    async def list_jobs(
+        self,
+        title: Optional[str] = None,
+        company: Optional[str] = None,
+        skill: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        List processed jobs, optionally filtered by title prefix, company or skill
+        
+        Args:
+            title: Case-insensitive title prefix
+            company: Case-insensitive company name
+            skill: Case-insensitive skill name
+            limit: Maximum number of jobs to return
+            offset: Number of jobs to skip
+            
+        Returns:
+            List[Dict[str, Any]]: Job summaries, newest first
+        """
+        try:
+            return await job_repository.list_jobs(title, company, skill, limit, offset)
+            
+        except Exception as e:
+            logger.error(f"Error listing jobs: {str(e)}")
+            raise
+    
+    async def find_similar_jobs(self, resume_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find the jobs whose descriptions are closest to an analyzed resume
+        
+        Args:
+            resume_id: The resume ID
+            limit: Maximum number of jobs to return
+            
+        Returns:
+            List[Dict[str, Any]]: Job IDs with cosine similarity, best first
+        """
+        def search() -> Optional[List[Tuple[str, float]]]:
+            resume_vector = resume_index.get_vector(resume_id)
+            if resume_vector is None:
+                return None
+            return job_index.search_vector(resume_vector, limit)
+        
+        try:
+            # Loading the indexes and searching take their locks, so keep both off the event loop
+            matches = await asyncio.to_thread(search)
+            if matches is None:
+                raise FileNotFoundError(f"Resume with ID {resume_id} not found in the index")
+            
+            return [{"job_id": job_id, "similarity": similarity} for job_id, similarity in matches]
+            
+        except Exception as e:
+            logger.error(f"Error finding similar jobs: {str(e)}")
+            raise
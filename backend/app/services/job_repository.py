@@ -0,0 +1,303 @@
+import os
+import json
+import hashlib
+import logging
+import unicodedata
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.cache import LRUCache
+from app.services.database import SQLiteDatabase, database
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_skills (
+    job_id TEXT NOT NULL REFERENCES jobs(job_id) ON DELETE CASCADE,
+    skill TEXT NOT NULL COLLATE NOCASE,
+    required INTEGER NOT NULL,
+    PRIMARY KEY (job_id, skill)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_title ON jobs(title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at);
+CREATE INDEX IF NOT EXISTS idx_job_skills_skill ON job_skills(skill COLLATE NOCASE, job_id);
+CREATE TABLE IF NOT EXISTS job_text_hashes (
+    text_hash TEXT PRIMARY KEY,
+    job_id TEXT NOT NULL REFERENCES jobs(job_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_job_text_hashes_job ON job_text_hashes(job_id);
+"""
+
+UPSERT_JOB = """
+INSERT INTO jobs (job_id, title, company, location, created_at, data)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(job_id) DO UPDATE SET
+    title = excluded.title,
+    company = excluded.company,
+    location = excluded.location,
+    data = excluded.data
+"""
+DELETE_SKILLS = "DELETE FROM job_skills WHERE job_id = ?"
+INSERT_SKILL = "INSERT OR IGNORE INTO job_skills (job_id, skill, required) VALUES (?, ?, ?)"
+SELECT_JOB = "SELECT data FROM jobs WHERE job_id = ?"
+DELETE_JOB = "DELETE FROM jobs WHERE job_id = ?"
+INSERT_TEXT_HASH = "INSERT OR REPLACE INTO job_text_hashes (text_hash, job_id) VALUES (?, ?)"
+SELECT_TEXT_HASH = "SELECT job_id FROM job_text_hashes WHERE text_hash = ?"
+
+def job_text_hash(job_description: str) -> str:
+    """
+    Hash a job description after normalizing Unicode, case and whitespace
+    
+    Args:
+        job_description: The job description text
+        
+    Returns:
+        str: The hex SHA-256 digest of the normalized text
+    """
+    normalized = " ".join(unicodedata.normalize("NFKC", job_description).lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+class JobRepository:
+    """Indexed store of processed job descriptions, with a read-through LRU"""
+    
+    def __init__(self, db: SQLiteDatabase = None, cache_size: int = None):
+        self.db = db or database
+        self.db.register_schema(SCHEMA)
+        self.cache = LRUCache(maxsize=cache_size or settings.JOB_CACHE_SIZE)
+        self.text_hash_cache = LRUCache(maxsize=settings.JOB_TEXT_CACHE_SIZE)
+    
+    async def save(self, job_data: Dict[str, Any]):
+        """
+        Insert or replace a processed job
+        
+        Args:
+            job_data: The processed job data, including job_id
+        """
+        try:
+            await self.db.run(lambda connection: self._write(connection, job_data))
+            self.cache.set(job_data["job_id"], job_data)
+            if job_data.get("text_hash"):
+                self.text_hash_cache.set(job_data["text_hash"], job_data["job_id"])
+        
+        except Exception as e:
+            logger.error(f"Error saving job: {str(e)}")
+            raise
+    
+    async def save_many(self, jobs: List[Dict[str, Any]]):
+        """
+        Insert or replace several processed jobs in a single transaction
+        
+        Args:
+            jobs: Processed job data, each including job_id
+        """
+        def write_all(connection):
+            for job_data in jobs:
+                self._write(connection, job_data)
+        
+        try:
+            await self.db.run(write_all)
+            for job_data in jobs:
+                self.cache.set(job_data["job_id"], job_data)
+        
+        except Exception as e:
+            logger.error(f"Error saving jobs: {str(e)}")
+            raise
+    
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a processed job
+        
+        Args:
+            job_id: The job ID
+        
+        Returns:
+            Optional[Dict[str, Any]]: The job data, or None if not found
+        """
+        cached = self.cache.get(job_id)
+        if cached is not None:
+            return cached
+        
+        try:
+            row = await self.db.run(lambda connection: connection.execute(SELECT_JOB, (job_id,)).fetchone())
+            if row is None:
+                return None
+            
+            job_data = json.loads(row["data"])
+            self.cache.set(job_id, job_data)
+            return job_data
+        
+        except Exception as e:
+            logger.error(f"Error retrieving job: {str(e)}")
+            raise
+    
+    async def find_by_text_hash(self, text_hash: str) -> Optional[str]:
+        """
+        Look up the job processed from a normalized description text
+        
+        Args:
+            text_hash: The hash from job_text_hash
+            
+        Returns:
+            Optional[str]: The job ID, or None if this text has not been processed
+        """
+        job_id = self.text_hash_cache.get(text_hash)
+        if job_id is not None:
+            return job_id
+        
+        try:
+            row = await self.db.run(lambda connection: connection.execute(SELECT_TEXT_HASH, (text_hash,)).fetchone())
+            if row is None:
+                return None
+            
+            self.text_hash_cache.set(text_hash, row["job_id"])
+            return row["job_id"]
+        
+        except Exception as e:
+            logger.error(f"Error looking up job text hash: {str(e)}")
+            raise
+    
+    async def add_text_alias(self, text_hash: str, job_id: str):
+        """Map another description text (e.g. a near-duplicate posting) to an existing job"""
+        await self.db.run(lambda connection: connection.execute(INSERT_TEXT_HASH, (text_hash, job_id)))
+        self.text_hash_cache.set(text_hash, job_id)
+    
+    def forget_text_hash(self, text_hash: str):
+        """Drop a cached text hash whose job no longer exists"""
+        self.text_hash_cache.pop(text_hash)
+    
+    async def delete(self, job_id: str) -> bool:
+        """Delete a job and its skill index entries"""
+        self.cache.pop(job_id)
+        deleted = await self.db.run(lambda connection: connection.execute(DELETE_JOB, (job_id,)).rowcount)
+        return deleted > 0
+    
+    async def list_jobs(
+        self,
+        title: Optional[str] = None,
+        company: Optional[str] = None,
+        skill: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        List job summaries, newest first, using the secondary indexes for filters
+        
+        Args:
+            title: Case-insensitive title prefix
+            company: Case-insensitive company name
+            skill: Case-insensitive skill name (required or preferred)
+            limit: Maximum number of jobs to return
+            offset: Number of jobs to skip
+        
+        Returns:
+            List[Dict[str, Any]]: Job summaries
+        """
+        query = "SELECT j.job_id, j.title, j.company, j.location, j.created_at FROM jobs j"
+        conditions = []
+        params: List[Any] = []
+        
+        if skill:
+            query += " JOIN job_skills s ON s.job_id = j.job_id AND s.skill = ?"
+            params.append(skill)
+        if title:
+            # Escape LIKE wildcards so the prefix is matched literally
+            escaped = title.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("j.title LIKE ? ESCAPE '\\'")
+            params.append(f"{escaped}%")
+        if company:
+            conditions.append("j.company = ? COLLATE NOCASE")
+            params.append(company)
+        
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY j.created_at DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+        
+        try:
+            rows = await self.db.run(lambda connection: connection.execute(query, params).fetchall())
+            return [dict(row) for row in rows]
+        
+        except Exception as e:
+            logger.error(f"Error listing jobs: {str(e)}")
+            raise
+    
+    async def import_legacy_files(self, jobs_dir: Optional[str] = None) -> int:
+        """
+        Import jobs saved as one JSON file per job by earlier versions
+        
+        Imported files are left in place; jobs already in the database are skipped.
+        
+        Args:
+            jobs_dir: Directory of {job_id}.json files (defaults to UPLOAD_DIR/jobs)
+        
+        Returns:
+            int: Number of jobs imported
+        """
+        jobs_dir = jobs_dir or os.path.join(settings.UPLOAD_DIR, "jobs")
+        
+        def import_all(connection) -> int:
+            if not os.path.isdir(jobs_dir):
+                return 0
+            
+            imported = 0
+            for filename in os.listdir(jobs_dir):
+                if not filename.endswith(".json"):
+                    continue
+                job_id = filename[:-len(".json")]
+                if connection.execute(SELECT_JOB, (job_id,)).fetchone() is not None:
+                    continue
+                
+                try:
+                    with open(os.path.join(jobs_dir, filename), "r") as f:
+                        job_data = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping unreadable job file {filename}: {str(e)}")
+                    continue
+                
+                job_data.setdefault("job_id", job_id)
+                self._write(connection, job_data)
+                imported += 1
+            return imported
+        
+        try:
+            imported = await self.db.run(import_all)
+            if imported:
+                logger.info(f"Imported {imported} legacy job files from {jobs_dir}")
+            return imported
+        
+        except Exception as e:
+            logger.error(f"Error importing legacy job files: {str(e)}")
+            raise
+    
+    def _write(self, connection, job_data: Dict[str, Any]):
+        """Write one job and its skill index rows using an open connection"""
+        job_id = job_data["job_id"]
+        connection.execute(UPSERT_JOB, (
+            job_id,
+            job_data.get("title") or "",
+            job_data.get("company") or "",
+            job_data.get("location") or "",
+            job_data.get("timestamp") or datetime.now().isoformat(),
+            json.dumps(job_data, separators=(",", ":"), default=str)
+        ))
+        
+        if job_data.get("text_hash"):
+            connection.execute(INSERT_TEXT_HASH, (job_data["text_hash"], job_id))
+        
+        connection.execute(DELETE_SKILLS, (job_id,))
+        skills = [(job_id, skill.strip(), 1) for skill in job_data.get("required_skills", []) if skill.strip()]
+        skills += [(job_id, skill.strip(), 0) for skill in job_data.get("preferred_skills", []) if skill.strip()]
+        connection.executemany(INSERT_SKILL, skills)
+
+# Shared repository
+job_repository = JobRepository()
@@ -0,0 +1,181 @@
+import re
+import json
+import time
+import hashlib
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.services.database import SQLiteDatabase, database
+
+if TYPE_CHECKING:
+    from langchain_core.outputs import Generation
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    cache_key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    generations TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires_at ON llm_cache(expires_at);
+"""
+
+SELECT_ENTRY = "SELECT generations, expires_at FROM llm_cache WHERE cache_key = ?"
+INSERT_ENTRY = """
+INSERT OR REPLACE INTO llm_cache (cache_key, provider, model, created_at, expires_at, generations)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+DELETE_ENTRY = "DELETE FROM llm_cache WHERE cache_key = ?"
+DELETE_EXPIRED = "DELETE FROM llm_cache WHERE expires_at <= ?"
+DELETE_MODEL = "DELETE FROM llm_cache WHERE provider = ? AND model = ?"
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+def prompt_fingerprint(prompt: str) -> str:
+    """SHA-256 of a prompt with whitespace collapsed, so reformatted prompts share an entry"""
+    normalized = _WHITESPACE_PATTERN.sub(" ", prompt).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+class TieredLLMCache(BaseCache):
+    """
+    LangChain LLM cache with an in-memory LRU tier over a SQLite tier
+    
+    One cache is attached to each model. Keys combine the provider, model,
+    temperature, the model's parameter string (LangChain's llm_string, which
+    also covers stop sequences) and the prompt fingerprint. Entries expire
+    after a TTL in both tiers; disk hits are promoted to memory. Lookups run
+    on the crew worker threads, which is why the SQLite tier is synchronous.
+    """
+    
+    def __init__(
+        self,
+        provider: str,
+        model: str,
+        temperature: float,
+        ttl: Optional[float] = None,
+        maxsize: Optional[int] = None,
+        db: SQLiteDatabase = None
+    ):
+        self.provider = provider
+        self.model = model
+        self.temperature = temperature
+        self.ttl = ttl or settings.LLM_CACHE_TTL
+        self.memory = LRUCache(maxsize=maxsize or settings.LLM_CACHE_SIZE)
+        self.db = db or database
+        self.db.register_schema(SCHEMA)
+        self.disk_hits = 0
+    
+    def cache_key(self, prompt: str, llm_string: str) -> str:
+        """Key for a prompt sent to this model"""
+        parts = [self.provider, self.model, repr(float(self.temperature)), llm_string, prompt_fingerprint(prompt)]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+    
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence["Generation"]]:
+        """
+        Look up cached generations for a prompt
+        
+        Args:
+            prompt: The prompt sent to the model
+            llm_string: LangChain's string form of the model parameters
+        
+        Returns:
+            Optional[Sequence[Generation]]: The cached generations, or None on a miss
+        """
+        key = self.cache_key(prompt, llm_string)
+        now = time.time()
+        
+        entry = self.memory.get(key)
+        if entry is not None:
+            generations, expires_at = entry
+            if expires_at > now:
+                return generations
+            self.memory.pop(key)
+        
+        try:
+            row = self.db.run_sync(lambda connection: connection.execute(SELECT_ENTRY, (key,)).fetchone())
+            if row is None:
+                return None
+            if row["expires_at"] <= now:
+                self.db.run_sync(lambda connection: connection.execute(DELETE_ENTRY, (key,)))
+                return None
+            
+            generations = [loads(generation) for generation in json.loads(row["generations"])]
+            self.memory.set(key, (generations, row["expires_at"]))
+            self.disk_hits += 1
+            return generations
+        
+        except Exception as e:
+            # A broken cache entry must never fail the LLM call
+            logger.error(f"Error reading LLM cache: {str(e)}")
+            return None
+    
+    def update(self, prompt: str, llm_string: str, return_val: Sequence["Generation"]) -> None:
+        """
+        Store the generations returned for a prompt in both tiers
+        
+        Args:
+            prompt: The prompt sent to the model
+            llm_string: LangChain's string form of the model parameters
+            return_val: The generations the model returned
+        """
+        key = self.cache_key(prompt, llm_string)
+        now = time.time()
+        expires_at = now + self.ttl
+        
+        self.memory.set(key, (list(return_val), expires_at))
+        
+        try:
+            serialized = json.dumps([dumps(generation) for generation in return_val])
+            self.db.run_sync(lambda connection: connection.execute(
+                INSERT_ENTRY,
+                (key, self.provider, self.model, now, expires_at, serialized)
+            ))
+        
+        except Exception as e:
+            logger.error(f"Error writing LLM cache: {str(e)}")
+    
+    def clear(self, **kwargs: Any) -> None:
+        """Drop this model's entries from both tiers"""
+        self.memory.clear()
+        self.disk_hits = 0
+        self.db.run_sync(lambda connection: connection.execute(DELETE_MODEL, (self.provider, self.model)))
+    
+    def purge_expired(self) -> int:
+        """Delete expired entries from the SQLite tier; returns how many were removed"""
+        return self.db.run_sync(lambda connection: connection.execute(DELETE_EXPIRED, (time.time(),)).rowcount)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return memory-tier metrics and the number of disk-tier hits"""
+        return {**self.memory.stats(), "disk_hits": self.disk_hits}
+
+def with_llm_cache(llm: Any, provider: str, model: str, temperature: float) -> Any:
+    """
+    Attach a tiered response cache to a LangChain model
+    
+    Caching is skipped when disabled or when the temperature is above
+    LLM_CACHE_MAX_TEMPERATURE, where callers expect varied responses.
+    
+    Args:
+        llm: The LangChain LLM or chat model
+        provider: The provider name
+        model: The model name
+        temperature: The sampling temperature
+    
+    Returns:
+        Any: The same model, with its cache set when caching applies
+    """
+    if not settings.LLM_CACHE_ENABLED or temperature > settings.LLM_CACHE_MAX_TEMPERATURE:
+        return llm
+    
+    llm.cache = TieredLLMCache(provider, model, temperature)
+    logger.info(f"LLM response cache enabled for {provider}/{model} (temperature {temperature})")
+    return llm
@@ -1,11 +1,11 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
-from app.services.resume_processor import ResumeProcessor
 from app.services.job_processor import JobProcessor
+from app.services.resume_repository import resume_repository
 from app.services.score_calculator import ScoreCalculator
-from app.schemas.responses import RecommendationResponse, RecommendationItem, ResumeSection
+from app.schemas.responses import RecommendationResponse, RecommendationItem, ResumeSection, ScoringResponse
 from app.agents.recommendation_agent import RecommendationAgent
 
 logger = logging.getLogger(__name__)
@@ -13,19 +13,30 @@ logger = logging.getLogger(__name__)
 class RecommendationEngine:
     """Service for generating ATS optimization recommendations"""
     
-    def __init__(self):
-        self.resume_processor = ResumeProcessor()
-        self.job_processor = JobProcessor()
-        self.score_calculator = ScoreCalculator()
-        self.recommendation_agent = RecommendationAgent()
+    def __init__(
+        self,
+        job_processor: Optional[JobProcessor] = None,
+        score_calculator: Optional[ScoreCalculator] = None,
+        recommendation_agent: Optional[RecommendationAgent] = None
+    ):
+        self.resume_repository = resume_repository
+        self.job_processor = job_processor or JobProcessor()
+        self.score_calculator = score_calculator or ScoreCalculator(job_processor=self.job_processor)
+        self.recommendation_agent = recommendation_agent or RecommendationAgent()
     
-    async def generate(self, resume_id: str, job_id: str) -> RecommendationResponse:
+    async def generate(
+        self,
+        resume_id: str,
+        job_id: str,
+        score_response: Optional[ScoringResponse] = None
+    ) -> RecommendationResponse:
         """
         Generate recommendations for improving resume ATS score
         
         Args:
             resume_id: The resume ID
             job_id: The job ID
+            score_response: The score already calculated for this pair, if any
             
         Returns:
             RecommendationResponse: The recommendation results
@@ -37,14 +48,15 @@ class RecommendationEngine:
             # Get job data
             job_data = await self.job_processor.get_job_by_id(job_id)
             
-            # Get current score
-            score_response = await self.score_calculator.calculate(resume_id, job_id)
+            # Get current score unless the caller already has it
+            if score_response is None:
+                score_response = await self.score_calculator.calculate(resume_id, job_id)
             
             # Generate recommendations using the agent
             recommendation_results = await self.recommendation_agent.generate_recommendations(
                 resume_data, 
                 job_data, 
-                score_response
+                self._score_data(score_response)
             )
             
             # Create recommendation items
@@ -76,6 +88,18 @@ class RecommendationEngine:
             logger.error(f"Error generating recommendations: {str(e)}")
             raise
     
+    def _score_data(self, score_response: ScoringResponse) -> Dict[str, Any]:
+        """
+        Convert a score to the shape the recommendation agent reads
+        
+        The agent looks up keyword matches by keyword and section scores by
+        section name, so both lists are re-keyed.
+        """
+        score_data = score_response.model_dump(mode="json")
+        score_data["keyword_matches"] = {match["keyword"]: match for match in score_data["keyword_matches"]}
+        score_data["section_scores"] = {section["section"]: section for section in score_data["section_scores"]}
+        return score_data
+    
     async def _get_resume_data(self, resume_id: str) -> Dict[str, Any]:
         """
         Retrieve resume data by ID
@@ -86,48 +110,10 @@ class RecommendationEngine:
         Returns:
             Dict[str, Any]: The resume data
         """
-        # In a real implementation, this would retrieve the stored resume data from a database
-        # For now, we'll return a placeholder
-        # This would be replaced with actual data retrieval logic
+        resume_data = await self.resume_repository.get(resume_id)
+        
+        if resume_data is None:
+            logger.error(f"Resume with ID {resume_id} not found")
+            raise FileNotFoundError(f"Resume with ID {resume_id} not found")
         
-        # Placeholder for demonstration purposes
-        return {
-            "resume_id": resume_id,
-            "parsed_content": {
-                "contact_info": {
-                    "name": "John Doe",
-                    "email": "john.doe@example.com",
-                    "phone": "123-456-7890"
-                },
-                "summary": "Experienced software engineer with expertise in Python and web development.",
-                "experience": [
-                    {
-                        "company": "Tech Company",
-                        "position": "Senior Software Engineer",
-                        "start_date": "2018-01-01",
-                        "end_date": "2023-01-01",
-                        "description": [
-                            "Developed and maintained web applications using Python and Django",
-                            "Led a team of 5 developers on various projects",
-                            "Implemented CI/CD pipelines using GitHub Actions"
-                        ]
-                    }
-                ],
-                "education": [
-                    {
-                        "institution": "University of Technology",
-                        "degree": "Bachelor of Science",
-                        "field_of_study": "Computer Science",
-                        "start_date": "2014-09-01",
-                        "end_date": "2018-05-01"
-                    }
-                ],
-                "skills": [
-                    {"name": "Python", "level": "expert"},
-                    {"name": "Django", "level": "advanced"},
-                    {"name": "JavaScript", "level": "intermediate"},
-                    {"name": "Docker", "level": "intermediate"},
-                    {"name": "AWS", "level": "intermediate"}
-                ]
-            }
-        }
+        return resume_data
@@ -1,22 +1,31 @@
 import os
 import uuid
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import json
 
 from app.core.config import settings
+from app.core.cache import LRUCache
 from app.schemas.requests import ResumeBuilderRequest
-from app.schemas.responses import ResumeGenerationResponse, ResumeSection
+from app.schemas.responses import ResumeGenerationResponse, ResumeSection, RescoreResponse
 from app.agents.builder_agent import ResumeBuilderAgent
+from app.services.resume_repository import resume_repository
+from app.services.storage import file_storage
 
 logger = logging.getLogger(__name__)
 
+# Scoring states of recently generated resumes, shared across generator instances
+_scoring_states = LRUCache(maxsize=settings.RESCORE_CACHE_SIZE)
+
+# Repository sources whose content is resume builder data
+BUILDER_SOURCES = ("builder", "edit")
+
 class ResumeGenerator:
     """Service for generating ATS-optimized resumes"""
     
-    def __init__(self):
-        self.builder_agent = ResumeBuilderAgent()
+    def __init__(self, builder_agent: Optional[ResumeBuilderAgent] = None):
+        self.builder_agent = builder_agent or ResumeBuilderAgent()
     
     async def generate(self, resume_data: ResumeBuilderRequest) -> ResumeGenerationResponse:
         """
@@ -32,41 +41,20 @@ class ResumeGenerator:
             # Generate a unique ID for this resume
             resume_id = str(uuid.uuid4())
             
-            # Create a directory for this generated resume
+            # Directory for this generated resume
             generated_dir = os.path.join(settings.UPLOAD_DIR, "generated", resume_id)
-            os.makedirs(generated_dir, exist_ok=True)
             
             # Generate the resume using the builder agent
-            generation_result = await self.builder_agent.build_resume(resume_data)
-            
-            # Save the generated resume in different formats
-            file_paths = {}
-            
-            # Save as DOCX
-            docx_path = os.path.join(generated_dir, f"resume_{resume_id}.docx")
-            with open(docx_path, 'wb') as f:
-                f.write(generation_result["docx_content"])
-            file_paths["docx"] = f"/api/download/resume/{resume_id}/docx"
-            
-            # Save as PDF
-            pdf_path = os.path.join(generated_dir, f"resume_{resume_id}.pdf")
-            with open(pdf_path, 'wb') as f:
-                f.write(generation_result["pdf_content"])
-            file_paths["pdf"] = f"/api/download/resume/{resume_id}/pdf"
-            
-            # Save as HTML
-            html_path = os.path.join(generated_dir, f"resume_{resume_id}.html")
-            with open(html_path, 'w') as f:
-                f.write(generation_result["html_content"])
-            file_paths["html"] = f"/api/download/resume/{resume_id}/html"
-            
-            # Save as plain text
-            txt_path = os.path.join(generated_dir, f"resume_{resume_id}.txt")
-            with open(txt_path, 'w') as f:
-                f.write(generation_result["text_content"])
-            file_paths["txt"] = f"/api/download/resume/{resume_id}/txt"
-            
-            # Save metadata
+            resume_content = resume_data.model_dump(mode="json")
+            generation_result = await self.builder_agent.build_resume(resume_content)
+            
+            # Store the builder content so the resume can be scored against jobs
+            await resume_repository.save(resume_id, resume_content, source="builder")
+            
+            # Keep the scoring state for incremental rescoring of later edits
+            _scoring_states.set(resume_id, generation_result["scoring_state"])
+            
+            # Metadata saved alongside the generated files
             metadata = {
                 "resume_id": resume_id,
                 "template_used": resume_data.template_id or "modern",
@@ -76,9 +64,18 @@ class ResumeGenerator:
                 "target_job_match": generation_result.get("target_job_match")
             }
             
-            metadata_path = os.path.join(generated_dir, "metadata.json")
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            # Save the generated resume in different formats, writing all files concurrently
+            await file_storage.write_many({
+                os.path.join(generated_dir, f"resume_{resume_id}.docx"): generation_result["docx_content"],
+                os.path.join(generated_dir, f"resume_{resume_id}.pdf"): generation_result["pdf_content"],
+                os.path.join(generated_dir, f"resume_{resume_id}.html"): generation_result["html_content"],
+                os.path.join(generated_dir, f"resume_{resume_id}.txt"): generation_result["text_content"],
+                os.path.join(generated_dir, "metadata.json"): json.dumps(metadata, indent=2)
+            })
+            file_paths = {
+                file_format: f"/api/download/resume/{resume_id}/{file_format}"
+                for file_format in ["docx", "pdf", "html", "txt"]
+            }
             
             # Create response
             response = ResumeGenerationResponse(
@@ -98,6 +95,80 @@ class ResumeGenerator:
             logger.error(f"Error generating resume: {str(e)}")
             raise
     
+    async def rescore(self, resume_id: str, sections: Dict[str, Any]) -> RescoreResponse:
+        """
+        Rescore a generated resume after a section-level edit
+        
+        Only the edited sections are rescored, using the scoring state cached
+        when the resume was generated; no files are regenerated. The state is
+        rebuilt from the stored resume when it is not cached in this process.
+        
+        Args:
+            resume_id: The ID of a previously generated resume
+            sections: Replacement values keyed by resume builder field name
+            
+        Returns:
+            RescoreResponse: The updated scores
+        """
+        try:
+            state = await self._get_scoring_state(resume_id)
+            
+            unknown = set(sections) - set(ResumeBuilderRequest.model_fields)
+            if unknown:
+                raise ValueError(f"Unknown resume sections: {', '.join(sorted(unknown))}")
+            
+            # Validate the edited resume as a whole, then keep only the patched sections
+            validated = ResumeBuilderRequest.model_validate({**state["resume_data"], **sections})
+            patch = validated.model_dump(mode="json", include=set(sections))
+            
+            changed_sections = self.builder_agent.rescore(state, patch)
+            
+            # Record the edit as a new version of the stored resume
+            await resume_repository.save(resume_id, dict(state["resume_data"]), source="edit")
+            
+            return RescoreResponse(
+                resume_id=resume_id,
+                ats_score=state["ats_score"],
+                target_job_match=state["target_job_match"],
+                section_scores=state["section_scores"],
+                changed_sections=changed_sections,
+                timestamp=datetime.now()
+            )
+            
+        except Exception as e:
+            logger.error(f"Error rescoring resume: {str(e)}")
+            raise
+    
+    async def _get_scoring_state(self, resume_id: str) -> Dict[str, Any]:
+        """
+        Get the scoring state of a generated resume
+        
+        Falls back to rebuilding the state from the resume repository, so that
+        rescoring survives a restart or lands on another worker.
+        
+        Args:
+            resume_id: The ID of a previously generated resume
+            
+        Returns:
+            Dict[str, Any]: The scoring state
+            
+        Raises:
+            KeyError: If no builder resume is stored under this ID
+        """
+        state = _scoring_states.get(resume_id)
+        if state is not None:
+            return state
+        
+        # Only builder content can be rescored; uploaded resumes hold parser output
+        record = await resume_repository.get(resume_id)
+        if record is None or record["source"] not in BUILDER_SOURCES:
+            raise KeyError(f"No scoring state for resume {resume_id}")
+        
+        state = self.builder_agent.build_scoring_state(record["parsed_content"])
+        _scoring_states.set(resume_id, state)
+        
+        return state
+    
     def _get_sections_included(self, resume_data: ResumeBuilderRequest) -> List[ResumeSection]:
         """
         Determine which sections are included in the resume
@@ -112,7 +183,7 @@ class ResumeGenerator:
         
         section_map = {
             "summary": ResumeSection.SUMMARY,
-            "work_experience": ResumeSection.EXPERIENCE,
+            "experience": ResumeSection.EXPERIENCE,
             "education": ResumeSection.EDUCATION,
             "skills": ResumeSection.SKILLS,
             "certifications": ResumeSection.CERTIFICATIONS,
@@ -125,7 +196,7 @@ class ResumeGenerator:
                 sections.append(section)
         
         return sections
-
+    
     async def get_resume_file(self, resume_id: str, format: str) -> tuple:
         """
         Get the resume file for download
@@ -147,7 +218,7 @@ class ResumeGenerator:
             file_path = os.path.join(settings.UPLOAD_DIR, "generated", resume_id, file_name)
             
             # Check if the file exists
-            if not os.path.exists(file_path):
+            if not await file_storage.exists(file_path):
                 raise FileNotFoundError(f"Resume file not found: {file_path}")
                 
             return file_path, file_name
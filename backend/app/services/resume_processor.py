@@ -2,19 +2,26 @@ import os
 import uuid
 import logging
 from fastapi import UploadFile
-import aiofiles
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from app.core.config import settings
 from app.schemas.responses import ResumeAnalysisResponse, ResumeSection
 from app.agents.parser_agent import ResumeParserAgent
+from app.services.hybrid_pipeline import HybridPipeline
+from app.services.vector_index import resume_index, resume_document_text
+from app.services.resume_repository import resume_repository
+from app.services.storage import file_storage
 
 logger = logging.getLogger(__name__)
 
 class ResumeProcessor:
     """Service for processing uploaded resume files"""
     
+    def __init__(self, parser_agent: Optional[ResumeParserAgent] = None, hybrid_pipeline: Optional[HybridPipeline] = None):
+        self.parser_agent = parser_agent or ResumeParserAgent()
+        self.hybrid_pipeline = hybrid_pipeline
+    
     async def process(self, file: UploadFile) -> ResumeAnalysisResponse:
         """
         Process an uploaded resume file
@@ -29,28 +36,22 @@ class ResumeProcessor:
             # Generate a unique ID for this resume
             resume_id = str(uuid.uuid4())
             
-            # Create a directory for this resume
-            resume_dir = os.path.join(settings.UPLOAD_DIR, resume_id)
-            os.makedirs(resume_dir, exist_ok=True)
-            
-            # Save the file
-            file_path = os.path.join(resume_dir, file.filename)
-            async with aiofiles.open(file_path, 'wb') as out_file:
-                content = await file.read()
-                await out_file.write(content)
+            # Save the file in a directory for this resume; storage creates it off the event loop
+            content = await file.read()
+            file_path = await file_storage.write(os.path.join(settings.UPLOAD_DIR, resume_id, file.filename), content)
             
             # Reset file position
             await file.seek(0)
             
             # Get file info
-            file_size = os.path.getsize(file_path)
+            file_size = len(content)
             content_type = file.content_type
             
-            # Initialize parser agent
-            parser_agent = ResumeParserAgent()
-            
-            # Parse the resume
-            parsed_content = await parser_agent.parse_resume(file_path)
+            # Parse the resume, escalating weak fields to the LLM in hybrid mode
+            if self.hybrid_pipeline is not None:
+                parsed_content = await self.hybrid_pipeline.analyze_resume(file_path)
+            else:
+                parsed_content = await self.parser_agent.parse_resume(file_path)
             
             # Determine which sections were found
             sections_found = self._identify_sections(parsed_content)
@@ -58,6 +59,18 @@ class ResumeProcessor:
             # Count words
             word_count = self._count_words(parsed_content)
             
+            # Store the parsed resume so scoring never needs to re-parse it
+            await resume_repository.save(
+                resume_id,
+                parsed_content,
+                source="upload",
+                filename=file.filename,
+                content_type=content_type
+            )
+            
+            # Index the resume for job similarity search
+            await resume_index.add(resume_id, resume_document_text(parsed_content))
+            
             # Create response
             response = ResumeAnalysisResponse(
                 resume_id=resume_id,
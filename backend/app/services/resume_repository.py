@@ -0,0 +1,169 @@
+import json
+import logging
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.cache import LRUCache
+from app.services.database import SQLiteDatabase, database
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    resume_id TEXT PRIMARY KEY,
+    filename TEXT,
+    content_type TEXT,
+    current_version INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resume_versions (
+    resume_id TEXT NOT NULL REFERENCES resumes(resume_id) ON DELETE CASCADE,
+    version INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    parsed_content TEXT NOT NULL,
+    format_features TEXT,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (resume_id, version)
+);
+"""
+
+SELECT_CURRENT_VERSION = "SELECT current_version FROM resumes WHERE resume_id = ?"
+INSERT_RESUME = """
+INSERT INTO resumes (resume_id, filename, content_type, current_version, created_at, updated_at)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+UPDATE_RESUME = "UPDATE resumes SET current_version = ?, updated_at = ? WHERE resume_id = ?"
+INSERT_VERSION = """
+INSERT INTO resume_versions (resume_id, version, source, parsed_content, format_features, created_at)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+SELECT_RESUME = """
+SELECT r.resume_id, r.filename, r.content_type, r.created_at, v.version, v.source, v.parsed_content, v.format_features, v.created_at AS version_created_at
+FROM resumes r JOIN resume_versions v ON v.resume_id = r.resume_id
+WHERE r.resume_id = ? AND v.version = COALESCE(?, r.current_version)
+"""
+SELECT_VERSIONS = "SELECT version, source, created_at FROM resume_versions WHERE resume_id = ? ORDER BY version"
+DELETE_RESUME = "DELETE FROM resumes WHERE resume_id = ?"
+
+class ResumeRepository:
+    """Versioned store of parsed resumes keyed by resume_id, with a read-through LRU"""
+    
+    def __init__(self, db: SQLiteDatabase = None, cache_size: int = None):
+        self.db = db or database
+        self.db.register_schema(SCHEMA)
+        self.cache = LRUCache(maxsize=cache_size or settings.RESUME_CACHE_SIZE)
+    
+    async def save(
+        self,
+        resume_id: str,
+        parsed_content: Dict[str, Any],
+        source: str = "upload",
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None
+    ) -> int:
+        """
+        Store a new version of a resume
+        
+        Args:
+            resume_id: The resume ID
+            parsed_content: The parsed (or builder) resume content
+            source: Where this version came from (upload, builder, edit)
+            filename: Original file name, recorded on the first version
+            content_type: Original content type, recorded on the first version
+            
+        Returns:
+            int: The new version number
+        """
+        now = datetime.now().isoformat()
+        content_json = json.dumps(parsed_content, default=str)
+        features_json = json.dumps(parsed_content.get("format_features")) if parsed_content.get("format_features") else None
+        
+        def write(connection) -> int:
+            # Take the write lock before reading the version, so concurrent saves queue up
+            # instead of both reading N and colliding on version N + 1
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(SELECT_CURRENT_VERSION, (resume_id,)).fetchone()
+            if row is None:
+                version = 1
+                connection.execute(INSERT_RESUME, (resume_id, filename, content_type, version, now, now))
+            else:
+                version = row["current_version"] + 1
+                connection.execute(UPDATE_RESUME, (version, now, resume_id))
+            connection.execute(INSERT_VERSION, (resume_id, version, source, content_json, features_json, now))
+            return version
+        
+        try:
+            version = await self.db.run(write)
+            
+            # Concurrent saves can finish out of order; keep the newest version cached
+            cached = self.cache.get(resume_id)
+            if cached is None or cached["version"] < version:
+                self.cache.set(resume_id, {
+                    "resume_id": resume_id,
+                    "version": version,
+                    "source": source,
+                    "filename": filename,
+                    "content_type": content_type,
+                    "parsed_content": parsed_content
+                })
+            
+            return version
+            
+        except Exception as e:
+            logger.error(f"Error saving resume: {str(e)}")
+            raise
+    
+    async def get(self, resume_id: str, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a resume, by default its current version
+        
+        Args:
+            resume_id: The resume ID
+            version: A specific version to load
+            
+        Returns:
+            Optional[Dict[str, Any]]: The resume record, or None if not found
+        """
+        if version is None:
+            cached = self.cache.get(resume_id)
+            if cached is not None:
+                return cached
+        
+        try:
+            row = await self.db.run(lambda connection: connection.execute(SELECT_RESUME, (resume_id, version)).fetchone())
+            if row is None:
+                return None
+            
+            record = {
+                "resume_id": row["resume_id"],
+                "version": row["version"],
+                "source": row["source"],
+                "filename": row["filename"],
+                "content_type": row["content_type"],
+                "parsed_content": json.loads(row["parsed_content"])
+            }
+            
+            if version is None:
+                self.cache.set(resume_id, record)
+            
+            return record
+            
+        except Exception as e:
+            logger.error(f"Error retrieving resume: {str(e)}")
+            raise
+    
+    async def list_versions(self, resume_id: str) -> List[Dict[str, Any]]:
+        """List the stored versions of a resume"""
+        rows = await self.db.run(lambda connection: connection.execute(SELECT_VERSIONS, (resume_id,)).fetchall())
+        return [dict(row) for row in rows]
+    
+    async def delete(self, resume_id: str) -> bool:
+        """Delete a resume and all its versions"""
+        self.cache.pop(resume_id)
+        deleted = await self.db.run(lambda connection: connection.execute(DELETE_RESUME, (resume_id,)).rowcount)
+        return deleted > 0
+
+# Shared repository
+resume_repository = ResumeRepository()
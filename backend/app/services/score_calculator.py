@@ -1,49 +1,74 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
-from app.services.resume_processor import ResumeProcessor
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
 from app.services.job_processor import JobProcessor
+from app.services.resume_repository import resume_repository
 from app.schemas.responses import ScoringResponse, SectionScore, KeywordMatch, ResumeSection
 from app.agents.matching_agent import MatchingAlgorithmAgent
 from app.agents.score_agent import ScoringSystemAgent
 
 logger = logging.getLogger(__name__)
 
+# Concurrent identical score requests share one calculation
+_score_flights = SingleFlight()
+
 class ScoreCalculator:
     """Service for calculating ATS scores by comparing resumes and job descriptions"""
     
-    def __init__(self):
-        self.resume_processor = ResumeProcessor()
-        self.job_processor = JobProcessor()
-        self.matching_agent = MatchingAlgorithmAgent()
-        self.scoring_agent = ScoringSystemAgent()
+    def __init__(
+        self,
+        job_processor: Optional[JobProcessor] = None,
+        matching_agent: Optional[MatchingAlgorithmAgent] = None,
+        scoring_agent: Optional[ScoringSystemAgent] = None
+    ):
+        self.resume_repository = resume_repository
+        self.job_processor = job_processor or JobProcessor()
+        self.matching_agent = matching_agent or MatchingAlgorithmAgent()
+        self.scoring_agent = scoring_agent or ScoringSystemAgent()
     
-    async def calculate(self, resume_id: str, job_id: str) -> ScoringResponse:
+    async def calculate(self, resume_id: str, job_id: str, profile: Optional[str] = None) -> ScoringResponse:
         """
         Calculate ATS score by comparing resume and job description
         
         Args:
             resume_id: The resume ID
             job_id: The job ID
+            profile: Scoring profile name, e.g. per tenant or job family
             
         Returns:
             ScoringResponse: The scoring results
         """
+        # Get resume data
+        resume_data = await self._get_resume_data(resume_id)
+        
+        # Get job data
+        job_data = await self.job_processor.get_job_by_id(job_id)
+        
+        # Double-clicks and parallel tabs await the calculation already running. The key holds
+        # the resume version and job text hash, so a request made after an edit never receives
+        # a score computed from the previous version
+        profile = profile or settings.SCORING_PROFILE
+        key = ("calculate_score", resume_id, resume_data.get("version"), job_id, job_data.get("text_hash"), profile)
+        return await _score_flights.do(key, lambda: self._calculate(resume_id, job_id, resume_data, job_data, profile))
+    
+    async def _calculate(
+        self,
+        resume_id: str,
+        job_id: str,
+        resume_data: Dict[str, Any],
+        job_data: Dict[str, Any],
+        profile: str
+    ) -> ScoringResponse:
+        """Calculate the score for one resume and job pair"""
         try:
-            # Get resume data
-            # In a real implementation, this would retrieve the stored resume data
-            # For now, we'll simulate this
-            resume_data = await self._get_resume_data(resume_id)
-            
-            # Get job data
-            job_data = await self.job_processor.get_job_by_id(job_id)
-            
             # Use matching agent to compare resume and job
-            match_results = await self.matching_agent.compare(resume_data, job_data)
+            match_results = await self.matching_agent.compare(resume_data, job_data, profile)
             
             # Use scoring agent to calculate scores
-            scoring_results = await self.scoring_agent.calculate_scores(match_results)
+            scoring_results = await self.scoring_agent.calculate_scores(match_results, profile)
             
             # Create section scores
             section_scores = []
@@ -68,7 +93,7 @@ class ScoreCalculator:
                         found=data["found"],
                         importance=data["importance"],
                         context=data.get("context"),
-                        section=ResumeSection(data["section"]) if "section" in data else None
+                        section=ResumeSection(data["section"]) if data.get("section") else None
                     )
                 )
             
@@ -101,48 +126,10 @@ class ScoreCalculator:
         Returns:
             Dict[str, Any]: The resume data
         """
-        # In a real implementation, this would retrieve the stored resume data from a database
-        # For now, we'll return a placeholder
-        # This would be replaced with actual data retrieval logic
+        resume_data = await self.resume_repository.get(resume_id)
+        
+        if resume_data is None:
+            logger.error(f"Resume with ID {resume_id} not found")
+            raise FileNotFoundError(f"Resume with ID {resume_id} not found")
         
-        # Placeholder for demonstration purposes
-        return {
-            "resume_id": resume_id,
-            "parsed_content": {
-                "contact_info": {
-                    "name": "John Doe",
-                    "email": "john.doe@example.com",
-                    "phone": "123-456-7890"
-                },
-                "summary": "Experienced software engineer with expertise in Python and web development.",
-                "experience": [
-                    {
-                        "company": "Tech Company",
-                        "position": "Senior Software Engineer",
-                        "start_date": "2018-01-01",
-                        "end_date": "2023-01-01",
-                        "description": [
-                            "Developed and maintained web applications using Python and Django",
-                            "Led a team of 5 developers on various projects",
-                            "Implemented CI/CD pipelines using GitHub Actions"
-                        ]
-                    }
-                ],
-                "education": [
-                    {
-                        "institution": "University of Technology",
-                        "degree": "Bachelor of Science",
-                        "field_of_study": "Computer Science",
-                        "start_date": "2014-09-01",
-                        "end_date": "2018-05-01"
-                    }
-                ],
-                "skills": [
-                    {"name": "Python", "level": "expert"},
-                    {"name": "Django", "level": "advanced"},
-                    {"name": "JavaScript", "level": "intermediate"},
-                    {"name": "Docker", "level": "intermediate"},
-                    {"name": "AWS", "level": "intermediate"}
-                ]
-            }
-        }
+        return resume_data
@@ -0,0 +1,133 @@
+import os
+import json
+import uuid
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Union
+
+from app.core.config import settings
+
+class FileStorage:
+    """
+    Non-blocking file storage for the services layer
+    
+    Every read, write and directory operation runs on a small dedicated
+    thread pool, one thread hop per file. Writes are atomic (temporary file
+    plus rename), and write_many issues a batch of writes concurrently with
+    asyncio.gather. The pool is kept small on purpose: many threads doing
+    Python-level work contend with the event loop for the GIL.
+    """
+    
+    def __init__(self, root: str = "", max_workers: Optional[int] = None):
+        self.root = root
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.STORAGE_IO_WORKERS or min(4, os.cpu_count() or 1),
+            thread_name_prefix="file-storage"
+        )
+    
+    def path(self, *parts: str) -> str:
+        """Resolve a path relative to the storage root"""
+        return os.path.join(self.root, *parts)
+    
+    async def exists(self, path: str) -> bool:
+        """Check whether a file exists"""
+        return await self._run(os.path.exists, self.path(path))
+    
+    async def read(self, path: str, binary: bool = False) -> Union[str, bytes]:
+        """
+        Read a whole file
+        
+        Args:
+            path: The file path
+            binary: Return bytes instead of text
+        
+        Returns:
+            Union[str, bytes]: The file content
+        """
+        return await self._run(self._read_file, self.path(path), binary)
+    
+    async def write(self, path: str, content: Union[str, bytes]) -> str:
+        """
+        Atomically write a whole file, creating parent directories
+        
+        Args:
+            path: The file path
+            content: Text or bytes to write
+        
+        Returns:
+            str: The resolved file path
+        """
+        full_path = self.path(path)
+        await self._run(self._write_file, full_path, content, True)
+        return full_path
+    
+    async def write_many(self, files: Dict[str, Union[str, bytes]]) -> Dict[str, str]:
+        """
+        Write several files concurrently
+        
+        Args:
+            files: Content keyed by file path
+        
+        Returns:
+            Dict[str, str]: Resolved file paths keyed by the given paths
+        """
+        full_paths = {path: self.path(path) for path in files}
+        
+        # Create each parent directory once before the writes start
+        directories = {os.path.dirname(full_path) for full_path in full_paths.values()}
+        await asyncio.gather(*(self._run(partial(os.makedirs, exist_ok=True), directory) for directory in directories if directory))
+        
+        await asyncio.gather(*(
+            self._run(self._write_file, full_paths[path], content, False)
+            for path, content in files.items()
+        ))
+        return full_paths
+    
+    async def read_json(self, path: str, default: Optional[Any] = None) -> Any:
+        """Read a JSON file, returning default if it does not exist"""
+        try:
+            content = await self.read(path)
+        except FileNotFoundError:
+            return default
+        return json.loads(content)
+    
+    async def write_json(self, path: str, data: Any, indent: Optional[int] = None) -> str:
+        """Atomically write data as JSON"""
+        return await self.write(path, json.dumps(data, indent=indent, default=str))
+    
+    async def delete(self, path: str) -> bool:
+        """Delete a file; returns False if it did not exist"""
+        try:
+            await self._run(os.remove, self.path(path))
+            return True
+        except FileNotFoundError:
+            return False
+    
+    async def _run(self, fn: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+    
+    def _read_file(self, full_path: str, binary: bool) -> Union[str, bytes]:
+        with open(full_path, "rb" if binary else "r", encoding=None if binary else "utf-8") as f:
+            return f.read()
+    
+    def _write_file(self, full_path: str, content: Union[str, bytes], make_dirs: bool):
+        # Each file is one worker-thread job: open, write and rename without returning to the loop
+        directory = os.path.dirname(full_path)
+        if make_dirs and directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        # Write to a unique temporary file so concurrent writers never interleave
+        tmp_path = f"{full_path}.{uuid.uuid4().hex}.tmp"
+        binary = isinstance(content, bytes)
+        try:
+            with open(tmp_path, "wb" if binary else "w", encoding=None if binary else "utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, full_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+# Shared storage for paths relative to the working directory
+file_storage = FileStorage()
@@ -0,0 +1,126 @@
+import os
+import asyncio
+import logging
+import threading
+from typing import Dict, Any, List, Tuple
+
+from app.core.config import settings
+from app.core.ann_index import IVFIndex
+from app.core.embeddings import default_embedder
+
+logger = logging.getLogger(__name__)
+
+class DocumentIndex:
+    """Persistent ANN index of document vectors (jobs or resumes)"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.directory = os.path.join(settings.VECTOR_INDEX_DIR, name)
+        self.embedder = default_embedder
+        self._index = None
+        self._pending_writes = 0
+        self._lock = threading.Lock()
+        self._writes_lock = threading.Lock()
+    
+    @property
+    def index(self) -> IVFIndex:
+        """The underlying index, loaded (memory-mapped) from disk on first use"""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._load()
+        return self._index
+    
+    async def add(self, doc_id: str, text: str):
+        """
+        Embed a document and insert it into the index
+        
+        Embedding, k-means retraining and the periodic save all run in a
+        worker thread, so indexing never stalls the event loop.
+        
+        Args:
+            doc_id: The document ID
+            text: The document text
+        """
+        await asyncio.to_thread(self._add, doc_id, text)
+    
+    def _add(self, doc_id: str, text: str):
+        self.index.add(doc_id, self.embedder.embed(text))
+        with self._writes_lock:
+            self._pending_writes += 1
+            due = self._pending_writes >= settings.VECTOR_INDEX_SAVE_EVERY
+        if due:
+            self.save()
+    
+    def remove(self, doc_id: str) -> bool:
+        """Delete a document from the index"""
+        removed = self.index.remove(doc_id)
+        if removed:
+            with self._writes_lock:
+                self._pending_writes += 1
+        return removed
+    
+    def search_text(self, text: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Find the k documents most similar to a text"""
+        return self.index.search(self.embedder.embed(text), k)
+    
+    def search_vector(self, vector, k: int = 10) -> List[Tuple[str, float]]:
+        """Find the k documents most similar to a vector"""
+        return self.index.search(vector, k)
+    
+    def get_vector(self, doc_id: str):
+        """Return the stored vector for a document, or None"""
+        return self.index.get_vector(doc_id)
+    
+    def save(self):
+        """Persist the index if it has unsaved changes"""
+        if self._index is None or self._pending_writes == 0:
+            return
+        
+        try:
+            with self._writes_lock:
+                pending = self._pending_writes
+            self._index.save(self.directory)
+            with self._writes_lock:
+                self._pending_writes -= pending
+        except Exception as e:
+            logger.error(f"Error saving {self.name} vector index: {str(e)}")
+    
+    def _load(self) -> IVFIndex:
+        if os.path.exists(os.path.join(self.directory, "meta.json")):
+            try:
+                index = IVFIndex.load(self.directory, mmap=True)
+                logger.info(f"Loaded {self.name} vector index with {len(index)} documents")
+                return index
+            except Exception as e:
+                logger.error(f"Error loading {self.name} vector index, starting empty: {str(e)}")
+        
+        return IVFIndex(
+            self.embedder.dim,
+            n_lists=settings.VECTOR_INDEX_LISTS,
+            n_probe=settings.VECTOR_INDEX_PROBE
+        )
+
+# Process-wide indexes
+job_index = DocumentIndex("jobs")
+resume_index = DocumentIndex("resumes")
+
+def save_indexes():
+    """Persist all document indexes (called on shutdown)"""
+    job_index.save()
+    resume_index.save()
+
+def resume_document_text(parsed_content: Dict[str, Any]) -> str:
+    """Flatten parsed resume content into a single text for document embedding"""
+    parts = [parsed_content.get("summary", "")]
+    for exp in parsed_content.get("experience", []):
+        parts.append(exp.get("position", ""))
+        description = exp.get("description", [])
+        parts.extend(description if isinstance(description, list) else [description])
+    for skill in parsed_content.get("skills", []):
+        parts.append(skill.get("name", "") if isinstance(skill, dict) else str(skill))
+    for edu in parsed_content.get("education", []):
+        parts.extend([edu.get("degree", ""), edu.get("field_of_study", "")])
+    for project in parsed_content.get("projects", []):
+        parts.extend([project.get("name", ""), project.get("description", "")])
+    return " ".join(part for part in parts if part)
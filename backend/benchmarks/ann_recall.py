@@ -0,0 +1,59 @@
+"""
+Recall-vs-latency benchmark for the IVF index against exact search
+
+Usage (from the backend directory):
+    python -m benchmarks.ann_recall --size 50000 --queries 200
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.core.ann_index import IVFIndex
+
+
+def make_vectors(size: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Clustered unit vectors, which resemble document embeddings better than uniform noise"""
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(clusters, size=size)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((size, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--lists", type=int, default=64)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    vectors = make_vectors(args.size, args.dim, clusters=200, rng=rng)
+    queries = make_vectors(args.queries, args.dim, clusters=200, rng=rng)
+
+    index = IVFIndex(args.dim, n_lists=args.lists)
+    start = time.perf_counter()
+    for i, vector in enumerate(vectors):
+        index.add(f"doc-{i}", vector)
+    print(f"Inserted {args.size} vectors in {time.perf_counter() - start:.2f}s (trained={index.trained})")
+
+    start = time.perf_counter()
+    truth = [{doc_id for doc_id, _ in index.exact_search(q, args.k)} for q in queries]
+    exact_ms = (time.perf_counter() - start) / args.queries * 1000
+
+    print(f"{'n_probe':>8} {'recall@' + str(args.k):>10} {'ms/query':>10} {'speedup':>8}")
+    print(f"{'exact':>8} {1.0:>10.3f} {exact_ms:>10.3f} {1.0:>8.1f}")
+    for n_probe in (1, 2, 4, 8, 16, 32):
+        if n_probe > args.lists:
+            break
+        start = time.perf_counter()
+        results = [{doc_id for doc_id, _ in index.search(q, args.k, n_probe=n_probe)} for q in queries]
+        ann_ms = (time.perf_counter() - start) / args.queries * 1000
+        recall = np.mean([len(found & expected) / len(expected) for found, expected in zip(results, truth)])
+        print(f"{n_probe:>8} {recall:>10.3f} {ann_ms:>10.3f} {exact_ms / ann_ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Event-loop stall benchmark: blocking open()/write() versus FileStorage
+
+Simulates concurrent resume generations, each awaiting upstream work (the
+builder) and then saving the four rendered formats plus metadata.json, while a
+heartbeat task measures how late the event loop wakes it up. Blocking writes
+delay every other request on the loop; FileStorage moves the I/O to worker
+threads. Lag above STALL_THRESHOLD_MS counts as stall time.
+
+Usage (from the backend directory):
+    python -m benchmarks.event_loop_stall --requests 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.storage import FileStorage
+
+HEARTBEAT_INTERVAL = 0.001
+STALL_THRESHOLD_MS = 2.0
+
+
+def make_payload(scale: int) -> dict:
+    """Rendered outputs roughly the size of a generated two-page resume"""
+    return {
+        "docx": os.urandom(40_000 * scale),
+        "pdf": os.urandom(60_000 * scale),
+        "html": "<p>experience</p>" * 1_200 * scale,
+        "txt": "experience " * 500 * scale,
+        "metadata": {"ats_score": 87.5, "sections_included": ["contact", "summary", "experience"]}
+    }
+
+
+async def save_blocking(directory: str, resume_id: str, payload: dict):
+    """The original ResumeGenerator code path: sequential blocking writes"""
+    generated_dir = os.path.join(directory, resume_id)
+    os.makedirs(generated_dir, exist_ok=True)
+    with open(os.path.join(generated_dir, f"resume_{resume_id}.docx"), "wb") as f:
+        f.write(payload["docx"])
+    with open(os.path.join(generated_dir, f"resume_{resume_id}.pdf"), "wb") as f:
+        f.write(payload["pdf"])
+    with open(os.path.join(generated_dir, f"resume_{resume_id}.html"), "w") as f:
+        f.write(payload["html"])
+    with open(os.path.join(generated_dir, f"resume_{resume_id}.txt"), "w") as f:
+        f.write(payload["txt"])
+    with open(os.path.join(generated_dir, "metadata.json"), "w") as f:
+        json.dump(payload["metadata"], f, indent=2)
+
+
+async def save_async(storage: FileStorage, directory: str, resume_id: str, payload: dict):
+    """The FileStorage code path: one concurrent batch of atomic writes"""
+    generated_dir = os.path.join(directory, resume_id)
+    await storage.write_many({
+        os.path.join(generated_dir, f"resume_{resume_id}.docx"): payload["docx"],
+        os.path.join(generated_dir, f"resume_{resume_id}.pdf"): payload["pdf"],
+        os.path.join(generated_dir, f"resume_{resume_id}.html"): payload["html"],
+        os.path.join(generated_dir, f"resume_{resume_id}.txt"): payload["txt"],
+        os.path.join(generated_dir, "metadata.json"): json.dumps(payload["metadata"], indent=2)
+    })
+
+
+async def heartbeat(lags: list, stop: asyncio.Event):
+    """Record how far past its deadline each wake-up of the loop lands"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(max(time.perf_counter() - start - HEARTBEAT_INTERVAL, 0.0))
+
+
+async def run(mode: str, requests: int, concurrency: int, payload: dict, workers: int = None) -> dict:
+    storage = FileStorage(max_workers=workers)
+    lags: list = []
+    stop = asyncio.Event()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    with tempfile.TemporaryDirectory() as directory:
+        async def one(i: int):
+            async with semaphore:
+                # Upstream awaits (parsing, building) interleave requests on the loop
+                await asyncio.sleep(0.002 * (i % 5))
+                if mode == "blocking":
+                    await save_blocking(directory, f"r{i}", payload)
+                else:
+                    await save_async(storage, directory, f"r{i}", payload)
+
+        monitor = asyncio.create_task(heartbeat(lags, stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await monitor
+
+    lag_ms = np.array(lags or [0.0]) * 1000
+    return {
+        "mode": mode,
+        "elapsed_s": elapsed,
+        "p50_ms": float(np.percentile(lag_ms, 50)),
+        "p99_ms": float(np.percentile(lag_ms, 99)),
+        "max_ms": float(lag_ms.max()),
+        "stall_ms": float(lag_ms[lag_ms > STALL_THRESHOLD_MS].sum())
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--scale", type=int, default=1, help="Multiply the payload sizes")
+    parser.add_argument("--workers", type=int, default=None, help="FileStorage I/O threads")
+    args = parser.parse_args()
+
+    payload = make_payload(args.scale)
+    print(f"{'mode':>9} {'total s':>8} {'lag p50':>8} {'lag p99':>8} {'lag max':>8} {'stall ms':>9}")
+    for mode in ("blocking", "async"):
+        result = asyncio.run(run(mode, args.requests, args.concurrency, payload, args.workers))
+        print(
+            f"{result['mode']:>9} {result['elapsed_s']:>8.2f} {result['p50_ms']:>8.2f} "
+            f"{result['p99_ms']:>8.2f} {result['max_ms']:>8.2f} {result['stall_ms']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
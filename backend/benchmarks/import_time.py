@@ -0,0 +1,91 @@
+"""
+Cold-start import budget for the API
+
+Imports the app module in fresh interpreters with `python -X importtime`,
+reports the median total import time and the slowest top-level packages,
+and checks that no heavy AI integration (CrewAI, LangChain, spaCy, pandas)
+was loaded: those are imported lazily by app.agents.llm_providers and the
+orchestrator, only when an LLM crew actually runs.
+
+Exits with status 1 when the median exceeds the budget or a forbidden module
+was imported, so it can gate CI.
+
+Usage (from the backend directory):
+    python -m benchmarks.import_time --budget-ms 1500 --runs 5
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+# Packages the deterministic routes must not pull in at import time
+FORBIDDEN_MODULES = ["crewai", "langchain", "langchain_core", "langchain_openai", "langchain_groq", "langchain_google_genai", "spacy", "pandas"]
+
+_LINE_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+\d+ \|\s*(\S+)$")
+
+PROBE = """
+import json, sys, importlib
+importlib.import_module({module!r})
+print(json.dumps(sorted(name for name in sys.modules if name.split(".")[0] in {forbidden!r})))
+"""
+
+
+def run_once(module: str):
+    """Import the module in a fresh interpreter; returns (per-package self time in us, loaded forbidden modules)"""
+    probe = PROBE.format(module=module, forbidden=set(FORBIDDEN_MODULES))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True, text=True, check=True
+    )
+
+    packages = defaultdict(int)
+    for line in completed.stderr.splitlines():
+        match = _LINE_PATTERN.match(line)
+        # Attribute each module's self time to its top-level package
+        if match:
+            packages[match.group(2).split(".")[0]] += int(match.group(1))
+
+    return packages, json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="Module to import (default: the FastAPI app)")
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="Maximum median import time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=10, help="Slowest packages to list")
+    args = parser.parse_args()
+
+    totals = []
+    package_times = defaultdict(list)
+    forbidden = set()
+    for _ in range(args.runs):
+        packages, loaded = run_once(args.module)
+        totals.append(sum(packages.values()) / 1000)
+        for package, micros in packages.items():
+            package_times[package].append(micros / 1000)
+        forbidden.update(loaded)
+
+    median = statistics.median(totals)
+    print(f"import {args.module}: median {median:.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    print(f"{'package':>24} {'median ms':>10}")
+    slowest = sorted(package_times.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for package, times in slowest[:args.top]:
+        print(f"{package:>24} {statistics.median(times):>10.1f}")
+
+    failed = False
+    if forbidden:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(sorted(forbidden))}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAIL: median import time {median:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
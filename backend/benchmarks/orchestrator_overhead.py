@@ -0,0 +1,199 @@
+"""
+Offline orchestrator benchmark on the local-fake LLM provider
+
+Every LLM call is answered by a ReplayResponder after a simulated latency,
+so the numbers below measure our own code, with no network or API cost:
+
+    runner        blocking calls through CrewRunner at the requested concurrency:
+                  per-call overhead, wall time against the ideal for the
+                  provider limit, and the peak number of calls in flight
+    cache         repeated prompts through the tiered response cache: hit rate
+                  and latency of hits against misses (needs langchain-core)
+    orchestrator  full compare_resume_to_job flows: orchestration overhead per
+                  LLM call, i.e. task time not spent waiting on the model
+                  (needs crewai)
+
+Exits with status 1 when the runner overhead exceeds --max-overhead-ms or the
+provider concurrency limit is exceeded, so it can gate CI.
+
+Usage (from the backend directory):
+    python -m benchmarks.orchestrator_overhead --mode all --requests 200 --concurrency 16
+    python -m benchmarks.orchestrator_overhead --mode orchestrator --latency-ms 300 --responses recorded.jsonl
+"""
+import argparse
+import asyncio
+import importlib.util
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from app.core.config import settings
+from app.agents.crew_runner import CrewRunner
+from app.agents.replay import LATENCY_DISTRIBUTIONS, LatencyModel, ReplayResponder
+
+
+def make_responder(args) -> ReplayResponder:
+    recordings = ReplayResponder.load(args.responses) if args.responses else []
+    return ReplayResponder(recordings, LatencyModel(args.distribution, args.latency_ms, args.jitter_ms, args.seed))
+
+
+async def run_calls(runner: CrewRunner, responder: ReplayResponder, requests: int, concurrency: int):
+    """Send calls through the runner; returns the wall time and each call's time outside the model"""
+    semaphore = asyncio.Semaphore(concurrency)
+    outside_model = []
+
+    def timed_call(prompt: str) -> float:
+        start = time.perf_counter()
+        responder.respond(prompt)
+        return time.perf_counter() - start
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            model_seconds = await runner.call(lambda: timed_call(f"prompt {i}"), "local-fake")
+            outside_model.append(time.perf_counter() - start - model_seconds)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return time.perf_counter() - start, outside_model
+
+
+async def bench_runner(args) -> dict:
+    limit = min(args.provider_concurrency, args.workers)
+    runner = CrewRunner(max_workers=args.workers, provider_concurrency=args.provider_concurrency)
+
+    # Overhead is measured below the provider limit, where no call waits for a slot
+    _, outside_model = await run_calls(runner, make_responder(args), min(args.requests, 50), min(args.concurrency, limit))
+
+    responder = make_responder(args)
+    wall, _ = await run_calls(runner, responder, args.requests, args.concurrency)
+    runner.shutdown()
+
+    stats = responder.stats()
+    return {
+        "wall": wall,
+        "ideal": stats["simulated_seconds"] / min(args.concurrency, limit),
+        "peak": stats["peak_concurrency"],
+        "limit": limit,
+        "overhead_ms": statistics.median(outside_model) * 1000
+    }
+
+
+def bench_cache(args) -> dict:
+    from app.agents.fake_llm import fake_replay_llm
+    from app.services.database import SQLiteDatabase
+    from app.services.llm_cache import TieredLLMCache
+
+    responder = make_responder(args)
+    llm = fake_replay_llm(responder)
+    with tempfile.TemporaryDirectory() as directory:
+        llm.cache = TieredLLMCache("local-fake", "replay", 0.0, db=SQLiteDatabase(os.path.join(directory, "cache.db")))
+
+        hits, misses = [], []
+        for i in range(args.requests):
+            calls = responder.calls
+            start = time.perf_counter()
+            llm.invoke(f"prompt {i % args.unique_prompts}")
+            (misses if responder.calls > calls else hits).append(time.perf_counter() - start)
+
+    return {
+        "hit_rate": len(hits) / args.requests,
+        "hit_ms": statistics.median(hits) * 1000 if hits else None,
+        "miss_ms": statistics.median(misses) * 1000 if misses else None
+    }
+
+
+async def bench_orchestrator(args) -> dict:
+    from app.agents.fake_llm import fake_replay_llm
+    from app.agents.orchestrator import AgentOrchestrator
+
+    responder = make_responder(args)
+    runner = CrewRunner(max_workers=args.workers, provider_concurrency=args.provider_concurrency)
+    # A private, uncached client with the benchmark's responder; distinct inputs keep coalescing out of the way
+    orchestrator = AgentOrchestrator(
+        runner=runner, provider="local-fake", model="replay", temperature=0.0, llm=fake_replay_llm(responder)
+    )
+    semaphore = asyncio.Semaphore(args.concurrency)
+    task_seconds = []
+
+    async def one(i: int):
+        async with semaphore:
+            result = await orchestrator.compare_resume_to_job(
+                {"summary": f"Candidate {i}: backend engineer", "skills": ["Python", "SQL", "Docker"]},
+                {"title": f"Backend Engineer {i}", "required_skills": ["Python", "PostgreSQL"]}
+            )
+            task_seconds.append(result["timings"]["sequential_seconds"])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    wall = time.perf_counter() - start
+    orchestrator.runner.shutdown()
+
+    stats = responder.stats()
+    return {
+        "wall": wall,
+        "calls": stats["calls"],
+        "overhead_ms": (sum(task_seconds) - stats["simulated_seconds"]) / max(stats["calls"], 1) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["runner", "cache", "orchestrator", "all"], default="all")
+    parser.add_argument("--requests", type=int, default=200, help="Calls (runner, cache) or flows (orchestrator)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight at once")
+    parser.add_argument("--workers", type=int, default=settings.LLM_MAX_WORKERS, help="CrewRunner threads")
+    parser.add_argument("--provider-concurrency", type=int, default=settings.LLM_PROVIDER_CONCURRENCY)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Mean simulated LLM latency")
+    parser.add_argument("--jitter-ms", type=float, default=15.0, help="Spread of the simulated latency")
+    parser.add_argument("--distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--responses", help="JSON lines of recorded responses to replay")
+    parser.add_argument("--unique-prompts", type=int, default=20, help="Distinct prompts in cache mode")
+    parser.add_argument("--max-overhead-ms", type=float, default=5.0, help="Maximum median runner overhead per call")
+    args = parser.parse_args()
+
+    modes = ["runner", "cache", "orchestrator"] if args.mode == "all" else [args.mode]
+    failed = False
+    print(f"latency {args.distribution}({args.latency_ms:g}ms, {args.jitter_ms:g}ms), {args.requests} requests, concurrency {args.concurrency}")
+
+    if "runner" in modes:
+        result = asyncio.run(bench_runner(args))
+        print(
+            f"runner        wall {result['wall']:.3f}s (ideal {result['ideal']:.3f}s), "
+            f"peak in flight {result['peak']}/{result['limit']}, overhead/call {result['overhead_ms']:.3f} ms"
+        )
+        if result["peak"] > result["limit"]:
+            print(f"FAIL: {result['peak']} calls in flight exceeds the limit of {result['limit']}")
+            failed = True
+        if result["overhead_ms"] > args.max_overhead_ms:
+            print(f"FAIL: runner overhead {result['overhead_ms']:.3f} ms exceeds {args.max_overhead_ms:g} ms")
+            failed = True
+
+    if "cache" in modes:
+        if importlib.util.find_spec("langchain_core") is None:
+            print("cache         skipped (langchain-core not installed)")
+        else:
+            result = bench_cache(args)
+            print(
+                f"cache         hit rate {result['hit_rate']:.1%}, "
+                f"hit {result['hit_ms'] or 0:.3f} ms, miss {result['miss_ms'] or 0:.3f} ms"
+            )
+
+    if "orchestrator" in modes:
+        if importlib.util.find_spec("crewai") is None:
+            print("orchestrator  skipped (crewai not installed)")
+        else:
+            result = asyncio.run(bench_orchestrator(args))
+            print(
+                f"orchestrator  wall {result['wall']:.3f}s for {args.requests} flows, "
+                f"{result['calls']} LLM calls, overhead/call {result['overhead_ms']:.3f} ms"
+            )
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
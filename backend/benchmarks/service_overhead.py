@@ -0,0 +1,129 @@
+"""
+Per-request service overhead: constructing services in every route versus
+app-scoped singletons resolved through FastAPI dependencies
+
+The routes used to build a fresh ResumeProcessor, JobProcessor,
+ScoreCalculator, RecommendationEngine or ResumeGenerator per request, and the
+calculator and engine built nested processors and agents of their own; every
+JobDescriptionAgent searched the NLTK data path in its constructor. The
+"per-request" mode reproduces that (including the NLTK lookups), the
+"singleton" mode resolves the instances created once at startup.
+
+Two measurements are reported:
+    construction  mean cost of obtaining each service for one request
+    http          round trips through the ASGI app for GET /api/jobs/cache-stats
+
+Usage (from the backend directory):
+    python -m benchmarks.service_overhead --iterations 2000 --requests 1000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+import nltk
+from fastapi import FastAPI
+
+from app.agents import nltk_resources
+from app.api import dependencies
+from app.api.routes import router
+from app.services.resume_processor import ResumeProcessor
+from app.services.job_processor import JobProcessor
+from app.services.score_calculator import ScoreCalculator
+from app.services.recommendation_engine import RecommendationEngine
+from app.services.resume_generator import ResumeGenerator
+
+# Downloading missing NLTK data is a one-off cost, not part of this measurement
+nltk_resources._checked = True
+
+
+def legacy_nltk_check(agents: int = 1):
+    """The lookups each JobDescriptionAgent constructor used to run"""
+    for _ in range(agents):
+        for path in nltk_resources.NLTK_RESOURCES:
+            try:
+                nltk.data.find(path)
+            except LookupError:
+                pass
+
+
+def build_per_request(name: str):
+    """Construct a service the way the routes did before, nested objects included"""
+    if name == "resume_processor":
+        return ResumeProcessor()
+    if name == "job_processor":
+        legacy_nltk_check()
+        return JobProcessor()
+    if name == "score_calculator":
+        # ScoreCalculator built its own ResumeProcessor and JobProcessor
+        legacy_nltk_check()
+        ResumeProcessor()
+        return ScoreCalculator()
+    if name == "recommendation_engine":
+        # ...and RecommendationEngine built those plus a whole ScoreCalculator
+        legacy_nltk_check(agents=2)
+        ResumeProcessor()
+        ResumeProcessor()
+        return RecommendationEngine()
+    return ResumeGenerator()
+
+
+SERVICES = ["resume_processor", "job_processor", "score_calculator", "recommendation_engine", "resume_generator"]
+
+
+def time_construction(iterations: int) -> dict:
+    services = dependencies.Services()
+    results = {}
+    for name in SERVICES:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            build_per_request(name)
+        per_request = (time.perf_counter() - start) / iterations
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            getattr(services, name)
+        singleton = (time.perf_counter() - start) / iterations
+
+        results[name] = (per_request * 1e6, singleton * 1e6)
+    return results
+
+
+async def time_http(requests: int, per_request: bool) -> float:
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    dependencies.init_services(app)
+    if per_request:
+        app.dependency_overrides[dependencies.get_job_processor] = lambda: build_per_request("job_processor")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        # Warm up routing and serialization
+        for _ in range(20):
+            (await client.get("/api/jobs/cache-stats")).raise_for_status()
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/api/jobs/cache-stats")
+        return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000, help="Constructions timed per service")
+    parser.add_argument("--requests", type=int, default=1000, help="HTTP round trips timed per mode")
+    args = parser.parse_args()
+
+    print(f"{'service':>22} {'per-request us':>15} {'singleton us':>13}")
+    for name, (per_request, singleton) in time_construction(args.iterations).items():
+        print(f"{name:>22} {per_request:>15.2f} {singleton:>13.3f}")
+
+    print()
+    print(f"{'mode':>22} {'ms/request':>15} {'requests/s':>13}")
+    for mode, per_request in (("per-request", True), ("singleton", False)):
+        seconds = asyncio.run(time_http(args.requests, per_request))
+        print(f"{mode:>22} {seconds * 1000:>15.3f} {1 / seconds:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,13 @@ from datetime import datetime
 # Import our application modules
 from app.core.config import settings
 from app.api.routes import router as api_router
+from app.api.dependencies import init_services
 from app.core.logging import setup_logging
+from app.services.vector_index import save_indexes
+from app.services.job_repository import job_repository
+from app.services.job_dedup import job_deduplicator
+from app.agents.crew_runner import crew_runner
+from app.agents.llm_pool import llm_pool
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -41,6 +47,22 @@ app.include_router(api_router, prefix=settings.API_PREFIX)
 os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
 
+# Build the shared services, import jobs stored as JSON files by earlier versions and warm the duplicate detector
+@app.on_event("startup")
+async def startup():
+    """Create app-scoped services, migrate legacy on-disk state and load in-memory indexes"""
+    init_services(app)
+    await job_repository.import_legacy_files()
+    await job_deduplicator.warm()
+
+# Persist vector indexes, cancel queued LLM crews and release pooled LLM clients on shutdown
+@app.on_event("shutdown")
+async def shutdown():
+    """Flush in-memory state to disk and stop background workers"""
+    save_indexes()
+    crew_runner.shutdown()
+    llm_pool.clear()
+
 # Health check endpoint
 @app.get("/")
 async def root():
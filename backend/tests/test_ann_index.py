@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from app.core.ann_index import IVFIndex
+
+
+def _unit_vectors(count: int, dim: int, seed: int = 0) -> np.ndarray:
+    vectors = np.random.default_rng(seed).standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _filled_index(count: int = 300, dim: int = 16) -> IVFIndex:
+    index = IVFIndex(dim, n_lists=8, n_probe=8, train_threshold=200)
+    for i, vector in enumerate(_unit_vectors(count, dim)):
+        index.add(f"item-{i}", vector)
+    return index
+
+
+def test_exact_search_before_training():
+    index = IVFIndex(8, n_lists=4, train_threshold=100)
+    vectors = _unit_vectors(10, 8)
+    for i, vector in enumerate(vectors):
+        index.add(f"item-{i}", vector)
+
+    assert not index.trained
+    assert index.search(vectors[3], k=1)[0][0] == "item-3"
+
+
+def test_trains_at_threshold_and_probing_every_cell_is_exact():
+    index = _filled_index()
+    query = _unit_vectors(1, 16, seed=1)[0]
+
+    assert index.trained
+    assert [item_id for item_id, _ in index.search(query, k=5)] == [item_id for item_id, _ in index.exact_search(query, k=5)]
+
+
+def test_add_replaces_and_remove_hides_vectors():
+    index = _filled_index()
+    vectors = _unit_vectors(2, 16, seed=2)
+
+    index.add("item-0", vectors[0])
+    assert len(index) == 300
+    assert np.allclose(index.get_vector("item-0"), vectors[0])
+
+    assert index.remove("item-0")
+    assert not index.remove("item-0")
+    assert "item-0" not in index
+    assert all(item_id != "item-0" for item_id, _ in index.search(vectors[0], k=10))
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = _filled_index()
+    index.remove("item-1")
+    index.save(str(tmp_path))
+
+    loaded = IVFIndex.load(str(tmp_path))
+    query = _unit_vectors(1, 16, seed=3)[0]
+
+    assert len(loaded) == 299
+    assert loaded.trained
+    assert loaded.search(query, k=5) == pytest.approx(index.search(query, k=5))
@@ -0,0 +1,24 @@
+from app.core.dates import merge_intervals, month_ordinal, parse_date_range, total_experience_months
+
+
+def test_merge_intervals_joins_overlapping_and_touching_spans():
+    assert merge_intervals([(10, 20), (0, 5), (5, 8), (15, 25), (30, 31)]) == [(0, 8), (10, 25), (30, 31)]
+    assert merge_intervals([]) == []
+
+
+def test_parse_date_range_counts_both_end_months():
+    assert parse_date_range("Jan 2019", "Dec 2019") == (month_ordinal(2019, 1), month_ordinal(2020, 1))
+    assert parse_date_range("2018", "2020") == (month_ordinal(2018, 1), month_ordinal(2021, 1))
+    assert parse_date_range("2020", "2019") is None
+    assert parse_date_range("someday", "2019") is None
+
+
+def test_total_experience_months_counts_overlaps_once():
+    entries = [
+        {"start_date": "Jan 2018", "end_date": "Dec 2018"},
+        {"start_date": "Jun 2018", "end_date": "Jun 2019"},
+        {"start_date": "2015", "end_date": "2015"},
+        {"start_date": "unknown"}
+    ]
+
+    assert total_experience_months(entries) == 18 + 12
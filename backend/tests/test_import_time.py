@@ -0,0 +1,31 @@
+"""Cold-start import budget for the API, enforced in the test suite (see benchmarks/import_time.py)"""
+import statistics
+
+import pytest
+
+from benchmarks.import_time import run_once
+
+# Same defaults as the benchmark's CLI
+IMPORT_BUDGET_MS = 1500.0
+RUNS = 3
+
+# The app module only imports where its runtime dependencies are installed
+pytest.importorskip("fastapi")
+pytest.importorskip("uvicorn")
+
+
+@pytest.fixture(scope="module")
+def import_runs():
+    return [run_once("main") for _ in range(RUNS)]
+
+
+def test_no_heavy_modules_imported_eagerly(import_runs):
+    loaded = set()
+    for _, forbidden in import_runs:
+        loaded.update(forbidden)
+    assert not loaded, f"heavy modules imported eagerly: {', '.join(sorted(loaded))}"
+
+
+def test_median_import_time_within_budget(import_runs):
+    median = statistics.median(sum(packages.values()) / 1000 for packages, _ in import_runs)
+    assert median <= IMPORT_BUDGET_MS, f"median import time {median:.1f} ms exceeds the {IMPORT_BUDGET_MS:.0f} ms budget"
@@ -0,0 +1,44 @@
+import pytest
+
+from app.core.minhash import MinHasher, MinHashLSH, estimate_jaccard
+
+BASE = "senior python engineer building fastapi services with postgres redis and kubernetes on aws for a fintech team"
+
+
+def test_signatures_are_stable_and_estimate_similarity():
+    hasher = MinHasher(num_perm=128, shingle_size=3)
+    near = BASE + " remote"
+
+    assert (hasher.signature(BASE) == MinHasher(num_perm=128, shingle_size=3).signature(BASE)).all()
+    assert estimate_jaccard(hasher.signature(BASE), hasher.signature(near)) > 0.7
+    assert estimate_jaccard(hasher.signature(BASE), hasher.signature("gardener wanted for weekend lawn care and hedges")) < 0.2
+    assert hasher.signature("  ...  ") is None
+
+
+def test_lsh_finds_near_duplicates_only():
+    hasher = MinHasher(num_perm=128, shingle_size=3)
+    lsh = MinHashLSH(num_perm=128, bands=32)
+    lsh.add("original", hasher.signature(BASE))
+    lsh.add("other", hasher.signature("registered nurse for night shifts in a busy pediatric ward downtown"))
+
+    matches = lsh.query(hasher.signature(BASE + " remote"), threshold=0.7)
+
+    assert [item_id for item_id, _ in matches] == ["original"]
+
+
+def test_lsh_add_replaces_and_remove_forgets():
+    hasher = MinHasher(num_perm=64, shingle_size=3)
+    lsh = MinHashLSH(num_perm=64, bands=16)
+    lsh.add("job", hasher.signature(BASE))
+    lsh.add("job", hasher.signature("registered nurse for night shifts in a busy pediatric ward downtown"))
+
+    assert len(lsh) == 1
+    assert lsh.query(hasher.signature(BASE), threshold=0.5) == []
+    assert lsh.remove("job")
+    assert not lsh.remove("job")
+    assert "job" not in lsh
+
+
+def test_bands_must_divide_num_perm():
+    with pytest.raises(ValueError):
+        MinHashLSH(num_perm=100, bands=16)
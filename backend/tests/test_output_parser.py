@@ -0,0 +1,58 @@
+import asyncio
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+from app.agents.output_parser import IncrementalJSONParser, OutputParserError, StructuredOutputParser, extract_json, first_json
+
+
+class Analysis(BaseModel):
+    score: int
+    skills: List[str]
+
+
+def test_extract_json_prefers_the_object_matching_the_schema():
+    text = 'Thought: compare ["a", "b"] and {"example": 1}\nFinal Answer: ```json\n{"score": 80, "skills": ["python"]}\n```'
+
+    assert extract_json(text, Analysis) == {"score": 80, "skills": ["python"]}
+    with pytest.raises(OutputParserError):
+        extract_json("no json here")
+
+
+def test_incremental_parser_closes_values_across_chunks_and_skips_bracketed_prose():
+    parser = IncrementalJSONParser()
+
+    assert parser.feed('note [see above] {"score": ') is None
+    assert parser.feed('1, "skills": ["a}"]} trailing') == {"score": 1, "skills": ["a}"]}
+    assert first_json(['[1, 2] ', '{"a"', ': 1}', '{"b": 2}']) == {"a": 1}
+
+
+def test_parse_keeps_valid_fields_and_repairs_invalid_ones():
+    parser = StructuredOutputParser(Analysis)
+    prompts = []
+
+    async def repair(prompt):
+        prompts.append(prompt)
+        return {"score": 75, "skills": ["ignored"]}
+
+    model, data, errors, repairs = asyncio.run(parser.parse('{"score": "high", "skills": ["sql"]}', repair))
+
+    assert model == Analysis(score=75, skills=["sql"])
+    assert errors == {}
+    assert repairs == 1
+    assert '"score"' in prompts[0] and '"skills"' not in prompts[0].split("Analysis:")[0]
+
+
+def test_parse_gives_up_after_max_repairs():
+    parser = StructuredOutputParser(Analysis, max_repairs=1)
+
+    async def repair(prompt):
+        return None
+
+    model, data, errors, repairs = asyncio.run(parser.parse('{"skills": ["sql"]}', repair))
+
+    assert model is None
+    assert data == {"skills": ["sql"]}
+    assert set(errors) == {"score"}
+    assert repairs == 1
@@ -0,0 +1,49 @@
+from app.agents.prompt_builder import PromptBuilder, estimate_tokens
+
+
+def test_fit_cuts_the_overflowing_section_at_a_word_boundary():
+    builder = PromptBuilder("openai", budget=20)
+    candidates = [
+        ("Requirements", "python fastapi postgres redis docker kubernetes terraform aws gcp azure"),
+        ("Benefits", "health dental vision")
+    ]
+
+    context = builder._fit(candidates, 20, "", [])
+
+    assert context["sections"] == ["Requirements"]
+    assert context["truncated"] == ["Requirements"]
+    assert context["dropped"] == ["Benefits"]
+    assert context["text"].startswith("Requirements:\npython fastapi")
+    assert context["tokens"] <= 20
+
+
+def test_fit_skips_a_section_too_large_to_start_and_keeps_the_budget():
+    builder = PromptBuilder("openai", budget=12)
+    candidates = [
+        ("Responsibilities", "supercalifragilisticexpialidocious-multidisciplinary-responsibilities"),
+        ("Skills", "python sql")
+    ]
+
+    context = builder._fit(candidates, 12, "", [])
+
+    assert context["sections"] == ["Skills"]
+    assert context["dropped"] == ["Responsibilities"]
+
+
+def test_fit_deduplicates_lines_across_sections():
+    builder = PromptBuilder("openai", budget=500)
+    candidates = [("Requirements", "- Python\n- SQL"), ("Preferred", "• python\nGo")]
+
+    context = builder._fit(candidates, 500, "", [])
+
+    assert context["text"] == "Requirements:\n- Python\n- SQL\n\nPreferred:\nGo"
+    assert context["tokens"] == estimate_tokens(context["text"])
+
+
+def test_job_context_uses_structured_fields_without_a_section_index():
+    builder = PromptBuilder("openai", budget=500)
+
+    context = builder.job_context({"title": "Data Engineer", "required_skills": ["Python", "Airflow"]})
+
+    assert "Data Engineer" in context["text"]
+    assert "Airflow" in context["text"]
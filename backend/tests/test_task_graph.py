@@ -0,0 +1,68 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.agents.task_graph import TaskGraph
+
+
+def _task(*context):
+    """Stand-in for a crewai Task: the graph only reads its context"""
+    return SimpleNamespace(context=list(context))
+
+
+def _diamond():
+    job = _task()
+    resume = _task()
+    match = _task(job, resume)
+    report = _task(match)
+    return TaskGraph({"job": job, "resume": resume, "match": match, "report": report})
+
+
+def test_dependencies_follow_task_context():
+    graph = _diamond()
+
+    assert graph.dependencies == {"job": [], "resume": [], "match": ["job", "resume"], "report": ["match"]}
+    assert graph.order.index("match") > max(graph.order.index("job"), graph.order.index("resume"))
+
+
+def test_independent_tasks_run_concurrently():
+    graph = _diamond()
+    durations = {"job": 0.05, "resume": 0.05, "match": 0.01, "report": 0.01}
+
+    async def execute(name, task):
+        await asyncio.sleep(durations[name])
+        return name
+
+    run = asyncio.run(graph.run(execute))
+    timings = run.timings()
+
+    assert run.result == "report"
+    assert timings["total_seconds"] < timings["sequential_seconds"]
+    assert run.critical_path()[-2:] == ["match", "report"]
+
+
+def test_failure_cancels_running_branches():
+    graph = _diamond()
+    finished = []
+
+    async def execute(name, task):
+        if name == "job":
+            raise RuntimeError("job failed")
+        await asyncio.sleep(0.05)
+        finished.append(name)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(graph.run(execute))
+    assert finished == []
+
+
+def test_rejects_outside_dependencies_and_cycles():
+    with pytest.raises(ValueError):
+        TaskGraph({"match": _task(_task())})
+
+    first = _task()
+    second = _task(first)
+    first.context.append(second)
+    with pytest.raises(ValueError):
+        TaskGraph({"first": first, "second": second})